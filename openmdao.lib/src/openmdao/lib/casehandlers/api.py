@@ -8,6 +8,7 @@ iterators, and case filters in the standard library.
 
 from openmdao.lib.casehandlers.caseset import CaseArray, CaseSet, caseiter_to_caseset
 
+from openmdao.lib.casehandlers.asynccase import AsyncCaseRecorder
 from openmdao.lib.casehandlers.csvcase import CSVCaseIterator, CSVCaseRecorder
 from openmdao.lib.casehandlers.dbcase import DBCaseIterator, DBCaseRecorder, \
                                              case_db_to_dict
@@ -16,6 +17,8 @@ from openmdao.lib.casehandlers.dumpcase import DumpCaseRecorder
 from openmdao.lib.casehandlers.jsoncase import JSONCaseRecorder, \
                                                BSONCaseRecorder, verify_json
 
+from openmdao.lib.casehandlers.columnarcase import ColumnarCaseRecorder
+
 from openmdao.lib.casehandlers.listcase import ListCaseRecorder, \
                                                ListCaseIterator
 
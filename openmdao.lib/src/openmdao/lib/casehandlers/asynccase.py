@@ -0,0 +1,134 @@
+"""
+A CaseRecorder which passes cases to another recorder from a background
+thread, so the model doesn't wait on the other recorder's I/O.
+"""
+
+import copy
+import Queue
+import sys
+import threading
+
+from numpy import ndarray
+
+from openmdao.main.api import VariableTree
+from openmdao.main.interfaces import implements, ICaseRecorder
+
+_SIMPLE_TYPES = (int, long, float, complex, bool, basestring, type(None))
+
+
+def _snapshot(value):
+    """ Return a copy of `value` which won't change as the model runs. """
+    if isinstance(value, _SIMPLE_TYPES):
+        return value
+    elif isinstance(value, ndarray):
+        return value.copy()
+    elif isinstance(value, VariableTree):
+        return value.copy()
+    try:
+        return copy.deepcopy(value)
+    except Exception:
+        return value  # Best we can do.
+
+
+class AsyncCaseRecorder(object):
+    """
+    Wraps `recorder` (a :class:`JSONCaseRecorder`, :class:`DBCaseRecorder`,
+    etc.) so that :meth:`record` just copies the data and queues it. A
+    background thread passes queued cases on to `recorder`. If `maxsize`
+    cases are waiting, :meth:`record` blocks until there is room.
+
+    An exception raised by `recorder` in the background is re-raised by the
+    next call to :meth:`record`, :meth:`get_iterator` or :meth:`close`.
+    Cases queued between the exception and its report are discarded.
+    """
+
+    implements(ICaseRecorder)
+
+    def __init__(self, recorder, maxsize=100):
+        self.recorder = recorder
+        self.maxsize = maxsize
+        self._queue = None
+        self._thread = None
+        self._error = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_queue'] = None
+        state['_thread'] = None
+        state['_error'] = None
+        return state
+
+    def startup(self):
+        """ Prepare for new run. """
+        self.recorder.startup()
+        self._start()
+
+    def register(self, driver, inputs, outputs):
+        """ Register names for later record call from `driver`. """
+        self.recorder.register(driver, inputs, outputs)
+
+    def record_constants(self, constants):
+        """ Record constant data, after any queued cases. """
+        self._drain()
+        self.recorder.record_constants(constants)
+
+    def record(self, driver, inputs, outputs, exc, case_uuid, parent_uuid):
+        """ Queue the given run data for recording. """
+        self._check_error()
+        self._start()
+        self._queue.put((driver,
+                         [_snapshot(value) for value in inputs],
+                         [_snapshot(value) for value in outputs],
+                         exc, case_uuid, parent_uuid))
+
+    def close(self):
+        """ Wait for queued cases to be recorded, then close `recorder`. """
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+            self._queue = None
+        self.recorder.close()
+        self._check_error()
+
+    def get_iterator(self):
+        """ Return iterator of `recorder` once queued cases are recorded. """
+        self._drain()
+        return self.recorder.get_iterator()
+
+    def _start(self):
+        """ Start background thread if necessary. """
+        if self._thread is None:
+            self._queue = Queue.Queue(self.maxsize)
+            self._thread = threading.Thread(target=self._service_loop,
+                                            name='AsyncCaseRecorder')
+            self._thread.daemon = True
+            self._thread.start()
+
+    def _drain(self):
+        """ Wait for queued cases to be recorded. """
+        if self._queue is not None:
+            self._queue.join()
+        self._check_error()
+
+    def _check_error(self):
+        """ Re-raise any exception from the background thread. """
+        if self._error is not None:
+            info, self._error = self._error, None
+            raise info[0], info[1], info[2]
+
+    def _service_loop(self):
+        """ Pass queued cases to `recorder` until told to stop. """
+        queue = self._queue
+        while True:
+            args = queue.get()
+            try:
+                if args is None:
+                    return
+                if self._error is None:
+                    try:
+                        self.recorder.record(*args)
+                    except Exception:
+                        self._error = sys.exc_info()
+            finally:
+                queue.task_done()
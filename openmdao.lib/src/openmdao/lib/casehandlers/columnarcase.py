@@ -0,0 +1,437 @@
+"""
+Columnar binary Case Recording.
+
+A :class:`ColumnarCaseRecorder` file starts with :data:`_MAGIC` and is
+followed by blocks, each having a 12 byte header (4 character kind and
+payload length) and padded to a multiple of 8 bytes::
+
+    META  simulation_info, BSON.
+    DRVR  driver_info, BSON.
+    SCHM  column schema for a driver, BSON.
+    CHNK  a chunk of cases recorded with a schema.
+
+A chunk payload is the length of a BSON header followed by the header and
+the column data.  Cases from different drivers are in separate chunks, so
+each case has a sequence number giving its position in the run.  Each
+numeric column is the raw little-endian data of
+``(count,)+shape`` values, aligned to 8 bytes, so it can be used directly
+from a memory map of the file.  Other values are pickled, one pickle per
+column per chunk.
+"""
+
+import cPickle
+import cStringIO
+import mmap
+import StringIO
+import time
+from struct import pack, unpack_from, calcsize
+
+import bson
+import numpy
+
+from openmdao.main.api import VariableTree
+from openmdao.lib.casehandlers.jsoncase import _BaseRecorder, \
+                                               _fix_object_for_json_encoder
+
+_MAGIC = 'OMCOLS01'
+_BLOCK = '<4sQ'
+_BLOCK_SIZE = calcsize(_BLOCK)
+_OBJECT = 'O'
+
+
+def _column_type(value):
+    """
+    Return ``(dtype, shape)`` of the column `value` would be stored in.
+    Non-numeric values get an object column, ``('O', None)``.
+    """
+    if isinstance(value, (bool, numpy.bool_)):
+        return ('|b1', ())
+    elif isinstance(value, (int, long, numpy.integer)):
+        if -2**63 <= value < 2**63:
+            return ('<i8', ())
+    elif isinstance(value, (float, numpy.floating)):
+        return ('<f8', ())
+    elif isinstance(value, numpy.ndarray) and value.dtype.kind in 'biufc':
+        return (value.dtype.newbyteorder('<').str, value.shape)
+    return (_OBJECT, None)
+
+
+def _plain(value):
+    """ Return `value` as a picklable object, as reported by the JSON reader. """
+    if isinstance(value, dict):
+        return dict([(key, _plain(val)) for key, val in value.items()])
+    elif isinstance(value, (list, tuple)):
+        return [_plain(val) for val in value]
+    elif isinstance(value, VariableTree):
+        return dict([(name, _plain(getattr(value, name)))
+                     for name in value.list_vars()])
+    elif isinstance(value, numpy.ndarray):
+        return value
+    elif hasattr(value, 'json_encode') and callable(value.json_encode):
+        return value.json_encode()
+    elif hasattr(value, '__dict__'):
+        return _plain(value.__dict__)
+    return value
+
+
+class _Table(object):
+    """ Cases from one driver waiting to be written with one schema. """
+
+    def __init__(self, schema_id, driver_id, types):
+        self.schema_id = schema_id
+        self.driver_id = driver_id
+        self.types = types
+        self.columns = [[] for typ in types]
+        self.ids = []
+        self.parent_ids = []
+        self.messages = []
+        self.timestamps = []
+        self.seqs = []
+
+    def __len__(self):
+        return len(self.ids)
+
+    def clear(self):
+        """ Forget cases which have been written. """
+        for column in self.columns:
+            del column[:]
+        del self.ids[:]
+        del self.parent_ids[:]
+        del self.messages[:]
+        del self.timestamps[:]
+        del self.seqs[:]
+
+
+class ColumnarCaseRecorder(_BaseRecorder):
+    """
+    Records cases in columnar binary form to `out`, which may be a string or
+    a file-like object opened in binary mode. If `out` is a string, then a
+    file with that name will be opened in the current directory. If `out` is
+    None, cases will be ignored.
+
+    Each variable recorded by a driver becomes a typed column, and cases are
+    written in chunks of `chunk_size`. Numeric values and arrays take no more
+    space than their raw data. A change in the type or shape of a value
+    starts a new schema for that driver.
+
+    The file is read by :class:`CaseDataset` with format ``columnar``.
+    """
+
+    def __init__(self, out='cases.col', chunk_size=1000):
+        super(ColumnarCaseRecorder, self).__init__()
+        if isinstance(out, basestring):
+            out = open(out, 'wb')
+        self.out = out
+        self.chunk_size = chunk_size
+        self._tables = {}  # driver -> _Table
+        self._names = {}   # driver -> absolute names of recorded variables
+        self._schemas = 0
+        self._seq = 0
+
+    def startup(self):
+        """ Prepare for new run. """
+        self._tables = {}
+        self._names = {}
+        self._seq = 0
+
+    def record_constants(self, constants):
+        """ Record constant data. """
+        if not self.out:
+            return
+
+        self.out.write(_MAGIC)
+        self._write_block('META', self._dump(self.get_simulation_info(constants)))
+        for info in self.get_driver_info():
+            self._write_block('DRVR', self._dump(info))
+        self.out.flush()
+
+    def record(self, driver, inputs, outputs, exc, case_uuid, parent_uuid):
+        """ Buffer the given run data, writing a chunk if it's full. """
+        if not self.out:
+            return
+
+        values = list(inputs) + list(outputs)
+        types = [_column_type(value) for value in values]
+        table = self._tables.get(driver)
+        if table is None or table.types != types:
+            if table is not None:
+                self._write_chunk(table)
+            table = self._new_table(driver, types)
+
+        for column, value in zip(table.columns, values):
+            column.append(value)
+        table.ids.append(case_uuid)
+        table.parent_ids.append(parent_uuid or self._uuid)
+        table.messages.append(str(exc) if exc else '')
+        table.timestamps.append(time.time())
+        table.seqs.append(self._seq)
+        self._seq += 1
+
+        if len(table) >= self.chunk_size:
+            self._write_chunk(table)
+
+    def _new_table(self, driver, types):
+        """ Write a new schema for `driver` and return its table. """
+        if driver not in self._names:
+            in_names, out_names = self._cfg_map[driver]
+            prefix = driver.parent.get_pathname()
+            if prefix:
+                prefix += '.'
+            self._names[driver] = [prefix+name for name in in_names+out_names]
+
+        self._schemas += 1
+        table = _Table(self._schemas, id(driver), types)
+        self._tables[driver] = table
+        schema = dict(_id=table.schema_id, _driver_id=table.driver_id,
+                      names=self._names[driver],
+                      dtypes=[dtype for dtype, shape in types],
+                      shapes=[None if shape is None else list(shape)
+                              for dtype, shape in types])
+        self._write_block('SCHM', self._dump(schema))
+        return table
+
+    def _write_chunk(self, table):
+        """ Write the cases buffered in `table`. """
+        count = len(table)
+        if not count:
+            return
+
+        segments = []
+        offsets = []
+        size = 0
+        meta = cPickle.dumps((table.ids, table.parent_ids, table.messages),
+                             cPickle.HIGHEST_PROTOCOL)
+        columns = [numpy.array(table.seqs, dtype='<i8').tostring(),
+                   numpy.array(table.timestamps, dtype='<f8').tostring(), meta]
+        for (dtype, shape), values in zip(table.types, table.columns):
+            if dtype == _OBJECT:
+                try:
+                    data = cPickle.dumps([_plain(val) for val in values],
+                                         cPickle.HIGHEST_PROTOCOL)
+                except Exception:
+                    data = cPickle.dumps([_fix_object_for_json_encoder(val)
+                                          for val in values],
+                                         cPickle.HIGHEST_PROTOCOL)
+            else:
+                data = numpy.array(values, dtype=dtype).tostring()
+            columns.append(data)
+
+        for data in columns:
+            offsets.append([size, len(data)])
+            segments.append(data)
+            pad = -len(data) % 8
+            if pad:
+                segments.append('\0' * pad)
+            size += len(data) + pad
+
+        header = bson.dumps(dict(schema=table.schema_id, count=count,
+                                 columns=offsets))
+        # Pad header so column data is 8 byte aligned within the file.
+        pad = -(_BLOCK_SIZE + 4 + len(header)) % 8
+        prefix = pack('<L', len(header) + pad) + header + '\0' * pad
+        self._write_block('CHNK', prefix + ''.join(segments))
+        table.clear()
+
+    def _write_block(self, kind, payload):
+        """ Write `payload` as a block of type `kind`. """
+        self.out.write(pack(_BLOCK, kind, len(payload)))
+        self.out.write(payload)
+        pad = -(_BLOCK_SIZE + len(payload)) % 8
+        if pad:
+            self.out.write('\0' * pad)
+
+    def _dump(self, info):
+        """ Return BSON data for `info`. """
+        return bson.dumps(_fix_object_for_json_encoder(info))
+
+    def close(self):
+        """
+        Writes any buffered cases and closes `out`. Note that a closed
+        recorder will do nothing in :meth:`record`.
+        """
+        if self.out is not None:
+            for table in self._tables.values():
+                self._write_chunk(table)
+            self.out.flush()
+            if not isinstance(self.out,
+                              (StringIO.StringIO, cStringIO.OutputType)):
+                # Closing a StringIO deletes its contents.
+                self.out.close()
+            self.out = None
+
+        self._tables = {}
+        self._cases = None
+
+    def get_iterator(self):
+        """ Just returns None. """
+        return None
+
+
+class _ColumnarReader(object):
+    """
+    Reads a :class:`ColumnarCaseRecorder` file. Numeric columns are read
+    straight from a memory map of the file.
+    """
+
+    def __init__(self, filename):
+        self._filename = filename
+        self._buf = None
+        self._iterating = 0  # Number of unfinished cases() generators.
+        self._last = None    # (number, columns) of last case_at() chunk.
+        self._scan()
+
+    def _scan(self):
+        """ Map the file and locate its blocks. """
+        self._last = None  # May view the old map.
+        if hasattr(self._filename, 'getvalue'):
+            self._buf = self._filename.getvalue()
+        else:
+            # Arrays in an unfinished cases() may still view the old map.
+            if isinstance(self._buf, mmap.mmap) and not self._iterating:
+                self._buf.close()
+            self._buf = ''
+            with open(self._filename, 'rb') as inp:
+                try:
+                    self._buf = mmap.mmap(inp.fileno(), 0,
+                                          access=mmap.ACCESS_READ)
+                except ValueError:  # Empty file.
+                    pass
+
+        if self._buf[:len(_MAGIC)] != _MAGIC:
+            raise ValueError('%s is not a columnar case file' % self._filename)
+
+        self._simulation_info = None
+        self._drivers = []
+        self._schemas = {}
+        self._chunks = []  # (schema, count, [(offset, nbytes)])
+
+        offset = len(_MAGIC)
+        end = len(self._buf)
+        while offset + _BLOCK_SIZE <= end:
+            kind, length = unpack_from(_BLOCK, self._buf, offset)
+            offset += _BLOCK_SIZE
+            if offset + length > end:
+                break  # Truncated by an unfinished run.
+            if kind == 'CHNK':
+                hdrlen = unpack_from('<L', self._buf, offset)[0]
+                doclen = unpack_from('<l', self._buf, offset+4)[0]
+                header = bson.loads(self._buf[offset+4:offset+4+doclen])
+                start = offset + 4 + hdrlen
+                columns = [(start+pos, nbytes)
+                           for pos, nbytes in header['columns']]
+                self._chunks.append((self._schemas[header['schema']],
+                                     header['count'], columns))
+            else:
+                data = self._buf[offset:offset+length]
+                if kind == 'META':
+                    self._simulation_info = bson.loads(data)
+                elif kind == 'DRVR':
+                    self._drivers.append(data)
+                elif kind == 'SCHM':
+                    schema = bson.loads(data)
+                    self._schemas[schema['_id']] = schema
+            offset += length + (-(_BLOCK_SIZE + length) % 8)
+
+    @property
+    def simulation_info(self):
+        """ Simulation info dictionary. """
+        return self._simulation_info
+
+    def drivers(self):
+        """ Return list of 'driver_info' dictionaries. """
+        return [bson.loads(data) for data in self._drivers]
+
+    def cases(self):
+        """ Return sequence of 'iteration_case' dictionaries. """
+        for offset, case in self.indexed_cases():
+            yield case
+
+    def indexed_cases(self):
+        """
+        Return sequence of ``(offset, case)``, where `offset` may be passed
+        to :meth:`case_at` to read `case` again.
+        """
+        self._scan()  # Pick up cases recorded since the last scan.
+        self._iterating += 1
+        try:
+            for item in self._cases():
+                yield item
+        finally:
+            self._iterating -= 1
+
+    def case_at(self, offset):
+        """ Return the 'iteration_case' dictionary at `offset`. """
+        chunk, i = offset
+        if self._last is None or self._last[0] != chunk:
+            self._last = (chunk, self._chunk(chunk))
+        return self._case(self._last[1], i)
+
+    def _cases(self):
+        """ Generate indexed cases from the currently mapped chunks. """
+        chunks = []
+        seqs = []
+        for chunk in range(len(self._chunks)):
+            chunks.append(self._chunk(chunk))
+            seqs.append(chunks[-1][0])
+
+        if not chunks:
+            return
+
+        # Chunks are per-driver, restore the order cases were recorded in.
+        which = numpy.concatenate([numpy.zeros(len(seq), dtype=int) + i
+                                   for i, seq in enumerate(seqs)])
+        index = numpy.concatenate([numpy.arange(len(seq)) for seq in seqs])
+        order = numpy.concatenate(seqs).argsort(kind='mergesort')
+
+        for chunk, i in zip(which[order].tolist(), index[order].tolist()):
+            yield (chunk, i), self._case(chunks[chunk], i)
+
+    def _chunk(self, chunk):
+        """ Return the decoded columns of chunk number `chunk`. """
+        schema, count, columns = self._chunks[chunk]
+        seq = self._array(columns[0], '<i8', (), count)
+        timestamps = self._array(columns[1], '<f8', (), count).tolist()
+        ids, parent_ids, messages = self._object(columns[2])
+        data = []
+        for dtype, shape, column in zip(schema['dtypes'], schema['shapes'],
+                                        columns[3:]):
+            if dtype == _OBJECT:
+                data.append(self._object(column))
+            elif shape:
+                data.append(self._array(column, dtype, shape, count))
+            else:
+                data.append(self._array(column, dtype, (), count).tolist())
+        return (seq, schema, ids, parent_ids, messages, timestamps, data)
+
+    @staticmethod
+    def _case(chunk, i):
+        """ Return case `i` of decoded `chunk`. """
+        seq, schema, ids, parent_ids, messages, timestamps, data = chunk
+        values = {}
+        for name, column in zip(schema['names'], data):
+            value = column[i]
+            if isinstance(value, numpy.ndarray):
+                value = value.copy()  # Don't hand out the memory map.
+            values[name] = value
+        return dict(_id=ids[i],
+                    _parent_id=parent_ids[i],
+                    _driver_id=schema['_driver_id'],
+                    error_status=None,
+                    error_message=messages[i],
+                    timestamp=timestamps[i],
+                    data=values)
+
+    def _array(self, column, dtype, shape, count):
+        """ Return read-only array view of numeric `column`. """
+        offset, nbytes = column
+        shape = (count,) + tuple(shape)
+        if not nbytes:
+            return numpy.zeros(shape, dtype=dtype)
+        return numpy.frombuffer(self._buf, dtype=dtype, count=nbytes // \
+                                numpy.dtype(dtype).itemsize,
+                                offset=offset).reshape(shape)
+
+    def _object(self, column):
+        """ Return list of values in pickled `column`. """
+        offset, nbytes = column
+        return cPickle.loads(self._buf[offset:offset+nbytes])
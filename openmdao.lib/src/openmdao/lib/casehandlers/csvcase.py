@@ -4,11 +4,13 @@
 import csv, datetime, glob, os, shutil, time
 import cStringIO, StringIO
 
+import numpy
+
 # pylint: disable=E0611,F0401
 from openmdao.main.interfaces import implements, ICaseRecorder, ICaseIterator
 from openmdao.main.case import Case, flatten_obj
 
-from openmdao.lib.casehandlers.util import driver_map
+from openmdao.lib.casehandlers.util import csv_blocks, driver_map
 
 
 class CSVCaseIterator(object):
@@ -27,8 +29,8 @@ class CSVCaseIterator(object):
     implements(ICaseIterator)
 
     def __init__(self, filename='cases.csv', headers=None):
-        self.data = []
         self.headers = headers
+        self._dialect = None
         self.timestamp_field = None
         self._need_fieldnames = True
 
@@ -49,24 +51,18 @@ class CSVCaseIterator(object):
         with open(self.filename, 'r') as infile:
             # Sniff out the dialect
             #infile.seek(1)
-            dialect = csv.Sniffer().sniff(infile.readline())
-            infile.seek(0)
-            reader = csv.reader(infile, dialect, quoting=csv.QUOTE_NONNUMERIC)
-
-            self.data = []
-            for row in reader:
-                self.data.append(row)
+            self._dialect = csv.Sniffer().sniff(infile.readline())
 
-            if self.headers is None:
-                self._need_fieldnames = True
-            else:
-                self._need_fieldnames = False
-                if 'timestamp' in self.headers.values():
-                    for key, value in self.headers.iteritems():
-                        if value == 'timestamp':
-                            self.timestamp_field = key
-                            del self.headers[key]
-                            break
+        if self.headers is None:
+            self._need_fieldnames = True
+        else:
+            self._need_fieldnames = False
+            if 'timestamp' in self.headers.values():
+                for key, value in self.headers.iteritems():
+                    if value == 'timestamp':
+                        self.timestamp_field = key
+                        del self.headers[key]
+                        break
 
     def __iter__(self):
         return self._next_case()
@@ -81,10 +77,11 @@ class CSVCaseIterator(object):
             input_fields = self.headers
         output_fields = {}
 
-        for row in self.data:
+        with open(self.filename, 'r') as infile:
 
             # Get fieldnames from file
             if self._need_fieldnames:
+                row = self._read_header(infile)
 
                 # OpenMDAO-style CSV file
                 if '/INPUTS' in row:
@@ -104,34 +101,92 @@ class CSVCaseIterator(object):
                             input_fields[i] = field
 
                 self._need_fieldnames = False
-                continue
 
-            if uuid_field is not None:
-                uuid = row[uuid_field]
-                parent_uuid = row[parent_uuid_field]
-                msg = row[msg_field]
+            for lineno, rows in self._read_blocks(infile, 1000):
+                if isinstance(rows, numpy.ndarray):
+                    rows = rows.tolist()
+
+                for row in rows:
 
-            inputs = []
-            for i, field in input_fields.iteritems():
+                    if uuid_field is not None:
+                        uuid = row[uuid_field]
+                        parent_uuid = row[parent_uuid_field]
+                        msg = row[msg_field]
 
-                # Convert bools from string back into bools
-                # Note, only really need this for inputs.
-                if row[i] in ['True', 'False']:
-                    row[i] = bool(row[i])
+                    inputs = []
+                    for i, field in input_fields.iteritems():
 
-                inputs.append((field, row[i]))
+                        # Convert bools from string back into bools
+                        # Note, only really need this for inputs.
+                        if row[i] in ['True', 'False']:
+                            row[i] = bool(row[i])
 
-            outputs = []
-            for i, field in output_fields.iteritems():
-                outputs.append((field, row[i]))
+                        inputs.append((field, row[i]))
 
-            exc = None if not msg else Exception(msg)
+                    outputs = []
+                    for i, field in output_fields.iteritems():
+                        outputs.append((field, row[i]))
 
-            yield Case(inputs=inputs, outputs=outputs, exc=exc,
-                       parent_uuid=parent_uuid)
+                    exc = None if not msg else Exception(msg)
+
+                    yield Case(inputs=inputs, outputs=outputs, exc=exc,
+                               parent_uuid=parent_uuid)
 
         self._need_fieldnames = True
 
+    def blocks(self, block_size=1000):
+        """
+        Generator which returns ``(names, values)`` for blocks of up to
+        `block_size` cases, for drivers which can run a batch of cases at
+        once. `values` is a 2-D float array with a column for each of
+        `names`, the numeric input and output fields.
+        """
+        with open(self.filename, 'r') as infile:
+            if self.headers is None:
+                row = self._read_header(infile)
+                if '/INPUTS' in row:
+                    input_fields, output_fields = self._parse_fieldnames(row)
+                    fields = sorted(input_fields.items()) + \
+                             sorted(output_fields.items())
+                else:
+                    fields = [(i, field) for i, field in enumerate(row)
+                              if field != 'timestamp']
+            else:
+                fields = sorted(self.headers.items())
+
+            columns = None
+            for lineno, rows in self._read_blocks(infile, block_size):
+
+                # Fields quoted in the file were read as strings, others as
+                # floats, so the first case tells us which are numeric.
+                if columns is None:
+                    if not isinstance(rows, numpy.ndarray):
+                        fields = [(i, field) for i, field in fields
+                                  if isinstance(rows[0][i], float)]
+                    names = [field for i, field in fields]
+                    columns = [i for i, field in fields]
+
+                if isinstance(rows, numpy.ndarray):
+                    values = rows[:, columns]
+                else:
+                    values = numpy.array([[row[i] for i in columns]
+                                          for row in rows], dtype=float)
+                yield names, values.reshape((len(rows), len(columns)))
+
+    def _read_header(self, infile):
+        """ Return the header row from `infile`. """
+        reader = csv.reader([infile.readline()], self._dialect,
+                            quoting=csv.QUOTE_NONNUMERIC)
+        return next(reader, [])
+
+    def _read_blocks(self, infile, block_size):
+        """
+        Generate ``(lineno, rows)`` for blocks of up to `block_size` cases
+        from `infile`. Plain numeric blocks are converted together.
+        """
+        return csv_blocks(infile, block_size, self._dialect,
+                          quoting=csv.QUOTE_NONNUMERIC)
+
     def _parse_fieldnames(self, row):
         """Parse our input and output fieldname dictionaries."""
         input_fields = {}
@@ -159,21 +214,26 @@ class CSVCaseIterator(object):
         return input_fields, output_fields
 
 class CSVCaseRecorder(object):
-    """Stores cases in a csv file. Defaults to cases.csv."""
+    """Stores cases in a csv file. Defaults to cases.csv.
+    Rows are written in batches of `batch_size`.
+    """
 
     implements(ICaseRecorder)
 
     def __init__(self, filename='cases.csv', append=False, delimiter=',',
-                 quotechar='"'):
+                 quotechar='"', batch_size=100):
 
         self.delimiter = delimiter
         self.quotechar = quotechar
         self.append = append
+        self.batch_size = batch_size
         self.outfile = None
         self.csv_writer = None
         self.num_backups = 5
         self._header_size = 0
         self._cfg_map = {}
+        self._orders = {}  # Column names -> sorted order.
+        self._rows = []
 
         #Open output file
         self._write_headers = False
@@ -191,6 +251,9 @@ class CSVCaseRecorder(object):
 
     def __setstate__(self, state):
         """ Restore state from `state`. """
+        state.setdefault('batch_size', 1)
+        state.setdefault('_orders', {})
+        state.setdefault('_rows', [])
         self.__dict__.update(state)
 
     @property
@@ -246,11 +309,6 @@ class CSVCaseRecorder(object):
         Field i+j+7  - parent_uuid
         Field i+j+8  - msg
         """
-        sorted_input_keys = []
-        sorted_input_values = []
-        sorted_output_keys = []
-        sorted_output_values = []
-
         in_cfg, out_cfg = self._cfg_map[driver]
         input_keys = []
         input_values = []
@@ -266,27 +324,12 @@ class CSVCaseRecorder(object):
                 output_keys.append(key)
                 output_values.append(value)
 
-        # This should not be necessary, however python's csv writer
-        # is not writing boolean variables correctly as strings.
-
-        for index, item in enumerate(input_values):
-            if isinstance(item, bool):
-                input_values[index] = str(item)
-
-        for index, item in enumerate(output_values):
-            if isinstance(item, bool):
-                output_values[index] = str(item)
-
         # Sort the columns alphabetically.
+        sorted_input_keys, sorted_input_values = \
+            self._sort(input_keys, input_values)
+        sorted_output_keys, sorted_output_values = \
+            self._sort(output_keys, output_values)
 
-        if len(input_keys) > 0:
-            sorted_input_keys, sorted_input_values = \
-                (list(item) for item in zip(*sorted(zip(input_keys,
-                                                        input_values))))
-        if len(output_keys) > 0:
-            sorted_output_keys, sorted_output_values = \
-                (list(item) for item in zip(*sorted(zip(output_keys,
-                                                        output_values))))
         if self.outfile is None:
             raise RuntimeError('Attempt to record on closed recorder')
 
@@ -297,7 +340,7 @@ class CSVCaseRecorder(object):
             headers.extend(sorted_output_keys)
             headers.extend(['/METADATA', 'uuid', 'parent_uuid', 'msg'])
 
-            self.csv_writer.writerow(headers)
+            self._rows.append(headers)
             self._write_headers = False
             self._header_size = len(headers)
 
@@ -315,11 +358,34 @@ class CSVCaseRecorder(object):
                                " size (%d) in CSV recorder"
                                % (len(data), self._header_size))
 
-        self.csv_writer.writerow(data)
+        self._rows.append(data)
+        if len(self._rows) >= self.batch_size:
+            self._write_rows()
+
+    def _sort(self, keys, values):
+        """Return `keys` and `values` in key order. Bools are converted to
+        strings, since python's csv writer doesn't write them correctly.
+        """
+        keys = tuple(keys)
+        try:
+            order = self._orders[keys]
+        except KeyError:
+            order = sorted(range(len(keys)), key=keys.__getitem__)
+            self._orders[keys] = order
+        values = [str(values[i]) if isinstance(values[i], bool) else values[i]
+                  for i in order]
+        return [keys[i] for i in order], values
+
+    def _write_rows(self):
+        """Write buffered rows."""
+        if self._rows:
+            self.csv_writer.writerows(self._rows)
+            self._rows = []
 
     def close(self):
         """Closes the file."""
         if self.csv_writer is not None:
+            self._write_rows()
             if not isinstance(self.outfile,
                               (StringIO.StringIO, cStringIO.OutputType)):
                 # Closing a StringIO deletes its contents.
@@ -13,6 +13,9 @@ except ImportError:
 import time
 from cPickle import dumps, loads, HIGHEST_PROTOCOL, UnpicklingError
 from optparse import OptionParser
+from struct import pack, unpack_from, calcsize
+
+import numpy
 
 from traits.trait_handlers import TraitListObject, TraitDictObject
 
@@ -26,6 +29,42 @@ from openmdao.lib.casehandlers.util import driver_map
 _casetable_attrs = set(['id', 'uuid', 'parent', 'msg', 'model_id', 'timeEnter'])
 _vartable_attrs = set(['var_id', 'name', 'case_id', 'sense', 'value'])
 
+# Prefix of a blob holding a float array rather than a pickle (a pickle made
+# with protocol 2 starts with '\x80').
+_ARRAY_MAGIC = 'OMDAOF8'
+
+def _to_blob(value):
+    """Return `value` as a blob. Float arrays are stored as their raw
+    little-endian data following a header giving the shape; anything else
+    is pickled.
+    """
+    if isinstance(value, numpy.ndarray) and value.dtype.kind == 'f' \
+       and value.dtype.itemsize == 8:
+        header = pack('<%dsB%dq' % (len(_ARRAY_MAGIC), value.ndim),
+                      _ARRAY_MAGIC, value.ndim, *value.shape)
+        data = numpy.ascontiguousarray(value, dtype='<f8').tostring()
+        return sqlite3.Binary(header + data)
+    if isinstance(value, TraitDictObject):
+        value = dict(value)
+    elif isinstance(value, TraitListObject):
+        value = list(value)
+    return sqlite3.Binary(dumps(value, HIGHEST_PROTOCOL))
+
+def _from_blob(value, copy=False):
+    """Return the value stored in blob `value` by :func:`_to_blob`.
+    Arrays share the blob's memory (so are read-only) unless `copy` is set.
+    """
+    value = str(value)
+    if not value.startswith(_ARRAY_MAGIC):
+        return loads(value)
+    offset = len(_ARRAY_MAGIC)
+    ndim = unpack_from('<B', value, offset)[0]
+    offset += 1
+    shape = unpack_from('<%dq' % ndim, value, offset)
+    offset += calcsize('<%dq' % ndim)
+    array = numpy.frombuffer(value, dtype='<f8', offset=offset).reshape(shape)
+    return array.copy() if copy else array
+
 def _query_split(query):
     """Return a tuple of lhs, relation, rhs after splitting on
     a list of allowed operators.
@@ -110,7 +149,7 @@ class DBCaseIterator(object):
                     value = float('NaN')
                 else:
                     try:
-                        value = loads(str(value))
+                        value = _from_blob(value, copy=True)
                     except UnpicklingError as err:
                         print 'value', type(value), repr(value)
                         raise UnpicklingError("can't unpickle value '%s' for"
@@ -127,16 +166,29 @@ class DBCaseIterator(object):
 
 
 class DBCaseRecorder(object):
-    """Records Cases to a relational DB (sqlite). Values other than floats,
-    ints or strings are pickled and are opaque to SQL queries.
+    """Records Cases to a relational DB (sqlite). Float arrays are stored as
+    raw data and other values besides floats, ints or strings are pickled;
+    both are opaque to SQL queries.
+
+    By default each case is committed as it is recorded. If `flush_cases`
+    is greater than 1, cases are buffered and written together once that
+    many are waiting, or once `flush_interval` seconds (if nonzero) have
+    passed since the last write. A buffering file-based DB also uses
+    write-ahead logging to reduce the cost of each commit.
     """
 
     implements(ICaseRecorder)
 
-    def __init__(self, dbfile=':memory:', model_id='', append=False):
+    def __init__(self, dbfile=':memory:', model_id='', append=False,
+                 flush_cases=1, flush_interval=0.):
         self.dbfile = dbfile  # this creates the connection
         self.model_id = model_id
+        self.flush_cases = flush_cases
+        self.flush_interval = flush_interval
         self._cfg_map = {}
+        self._case_rows = []
+        self._var_rows = []
+        self._last_flush = time.time()
 
         if append:
             exstr = 'if not exists'
@@ -162,6 +214,14 @@ class DBCaseRecorder(object):
          value BLOB
          )""" % exstr)
 
+        if dbfile != ':memory:' and (flush_cases > 1 or flush_interval):
+            self._connection.execute('PRAGMA journal_mode=WAL')
+            self._connection.execute('PRAGMA synchronous=NORMAL')
+
+        # Case ids are assigned here so buffered variables can refer to them.
+        max_id = self._connection.execute('SELECT MAX(id) FROM cases')
+        self._next_id = (max_id.fetchone()[0] or 0) + 1
+
     @property
     def dbfile(self):
         """The name of the database. This can be a filename or :memory: for
@@ -173,8 +233,9 @@ class DBCaseRecorder(object):
     def dbfile(self, value):
         """Set the DB file and connect to it."""
         self._dbfile = value
-        self._connection = sqlite3.connect(value)
-        self._iter_conn = sqlite3.connect(value)
+        # Allow recording from the thread of an AsyncCaseRecorder.
+        self._connection = sqlite3.connect(value, check_same_thread=False)
+        self._iter_conn = sqlite3.connect(value, check_same_thread=False)
 
     def startup(self):
         """ Opens the database for recording."""
@@ -193,51 +254,52 @@ class DBCaseRecorder(object):
         if self._connection is None:
             raise RuntimeError('Attempt to record on closed recorder')
 
-        cur = self._connection.cursor()
-
         msg = '' if exc is None else str(exc)
-        cur.execute("""insert into cases(id,uuid,parent,msg,model_id,timeEnter)
-                           values (?,?,?,?,?,DATETIME('NOW'))""",
-                    (None, case_uuid, parent_uuid, msg, self.model_id))
-
-        case_id = cur.lastrowid
-        # insert the inputs and outputs into the vars table.  Pickle them if
-        # they're not one of the built-in types int, float, or str.
-
-        v = (None, 'timestamp', case_id, None, time.time())
-        cur.execute("insert into casevars(var_id,name,case_id,sense,value) values(?,?,?,?,?)",
-                    v)
+        case_id = self._next_id
+        self._next_id += 1
+        self._case_rows.append((case_id, case_uuid, parent_uuid, msg,
+                                self.model_id,
+                                time.strftime('%Y-%m-%d %H:%M:%S',
+                                              time.gmtime())))
+
+        # insert the inputs and outputs into the vars table.  Store them as
+        # blobs if they're not one of the built-in types int, float, or str.
+        rows = self._var_rows
+        rows.append((None, 'timestamp', case_id, None, time.time()))
 
         in_names, out_names = self._cfg_map[driver]
 
         for name, value in zip(in_names, inputs):
-            if isinstance(value, (float, int, str)):
-                v = (None, name, case_id, 'i', value)
-            else:
-                if isinstance(value, TraitDictObject):
-                    value = dict(value)
-                elif isinstance(value, TraitListObject):
-                    value = list(value)
-                v = (None, name, case_id, 'i',
-                     sqlite3.Binary(dumps(value, HIGHEST_PROTOCOL)))
-            cur.execute("insert into casevars(var_id,name,case_id,sense,value) values(?,?,?,?,?)",
-                        v)
+            if not isinstance(value, (float, int, str)):
+                value = _to_blob(value)
+            rows.append((None, name, case_id, 'i', value))
         for name, value in zip(out_names, outputs):
-            if isinstance(value, (float, int, str)):
-                v = (None, name, case_id, 'o', value)
-            else:
-                if isinstance(value, TraitDictObject):
-                    value = dict(value)
-                elif isinstance(value, TraitListObject):
-                    value = list(value)
-                v = (None, name, case_id, 'o',
-                     sqlite3.Binary(dumps(value, HIGHEST_PROTOCOL)))
-            cur.execute("insert into casevars(var_id,name,case_id,sense,value) values(?,?,?,?,?)",
-                        v)
-        self._connection.commit()
+            if not isinstance(value, (float, int, str)):
+                value = _to_blob(value)
+            rows.append((None, name, case_id, 'o', value))
+
+        if len(self._case_rows) >= self.flush_cases or \
+           (self.flush_interval and
+            time.time() - self._last_flush >= self.flush_interval):
+            self.flush()
+
+    def flush(self):
+        """Write any buffered cases to the DB and commit."""
+        if self._case_rows:
+            cur = self._connection.cursor()
+            cur.executemany("""insert into cases(id,uuid,parent,msg,model_id,timeEnter)
+                                   values (?,?,?,?,?,?)""", self._case_rows)
+            cur.executemany("insert into casevars(var_id,name,case_id,sense,value) values(?,?,?,?,?)",
+                            self._var_rows)
+            self._connection.commit()
+            self._case_rows = []
+            self._var_rows = []
+        self._last_flush = time.time()
 
     def close(self):
         """Commit and close DB connection if not using ``:memory:``."""
+        if self._connection is not None:
+            self.flush()
         if self._connection is not None and self._dbfile != ':memory:':
             self._connection.commit()
             self._connection.close()
@@ -245,6 +307,7 @@ class DBCaseRecorder(object):
 
     def get_iterator(self):
         """Return a DBCaseIterator that points to our current DB."""
+        self.flush()
         return DBCaseIterator(dbfile=self._dbfile, connection=self._connection)
 
 
@@ -334,7 +397,7 @@ def case_db_to_dict(dbname, varnames, case_sql='', var_sql='', include_errors=Fa
         for vname, value in varcur:
             if not isinstance(value, (float, int, str)):
                 try:
-                    value = loads(str(value))
+                    value = _from_blob(value)
                 except UnpicklingError as err:
                     raise UnpicklingError("can't unpickle value '%s' from"
                                           " database: %s" % (vname, str(err)))
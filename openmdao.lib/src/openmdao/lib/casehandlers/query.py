@@ -1,17 +1,21 @@
 import bson
 import json
 import logging
+import os.path
 import cPickle
 import StringIO
+from array import array
 from struct import pack, unpack
 from weakref import ref
 
+import numpy
 from numpy import ndarray
 
 from openmdao.main.api import Assembly, VariableTree
 from openmdao.lib.casehandlers.pymongo_bson.json_util import loads, dumps
 from openmdao.lib.casehandlers.pymongo_bson.binary import Binary
 from openmdao.lib.casehandlers.jsoncase import _Encoder
+from openmdao.lib.casehandlers.columnarcase import _ColumnarReader
 
 _GLOBAL_DICT = dict(__builtins__=None)
 
@@ -19,9 +23,9 @@ _GLOBAL_DICT = dict(__builtins__=None)
 class CaseDataset(object):
     """
     Reads case data from `filename` and allows queries on it.
-    `format` should be ``bson`` or ``json``, indicating a
-    :class:`BSONCaseRecorder` file or :class:`JSONCaseRecorder` file
-    respectively.
+    `format` should be ``bson``, ``json`` or ``columnar``, indicating a
+    :class:`BSONCaseRecorder`, :class:`JSONCaseRecorder` or
+    :class:`ColumnarCaseRecorder` file respectively.
 
     To get all case data::
 
@@ -54,20 +58,40 @@ class CaseDataset(object):
 
     Other possibilities exist, see :class:`Query`.
 
+    To get numeric variables as NumPy arrays, one per variable::
+
+        columns = cds.data.vars(names).by_variable(arrays=True).fetch()
+
     To restore from the last recorded case::
 
         cds.restore(assembly, cds.data.fetch()[-1]['_id'])
 
+    The file is read once, on the first query, into a columnar index which
+    serves all later queries. Numeric variables are kept in the index, other
+    values are read from the file as needed. If `index_file` is given, the
+    index is saved there (in NumPy ``.npz`` format) and reused by later
+    datasets on the same (unmodified) file.
     """
 
-    def __init__(self, filename, format):
+    def __init__(self, filename, format, index_file=None):
         format = format.lower()
         if format == 'bson':
             self._reader = _BSONReader(filename)
         elif format == 'json':
             self._reader = _JSONReader(filename)
+        elif format == 'columnar':
+            self._reader = _ColumnarReader(filename)
         else:
-            raise ValueError("dataset format must be 'json' or 'bson'")
+            raise ValueError("dataset format must be 'json', 'bson' or"
+                             " 'columnar'")
+
+        if isinstance(filename, basestring):
+            self._filename = filename
+        else:
+            self._filename = None
+            index_file = None
+        self._index_file = index_file
+        self._index = None
 
         self._query_id = self._parent_id = self._driver_id = None
         self._case_ids = self._drivers = None
@@ -87,6 +111,28 @@ class CaseDataset(object):
         """ Simulation info dictionary. """
         return self._reader.simulation_info
 
+    def _get_index(self):
+        """ Return current :class:`_CaseIndex`, (re)building it if needed. """
+        if self._filename is None:
+            if self._index is None:
+                self._index = _CaseIndex(self._reader)
+            return self._index
+
+        signature = _CaseIndex.signature(self._filename)
+        if self._index is not None and self._index.source == signature:
+            return self._index
+
+        if self._index_file:
+            self._index = _CaseIndex.load(self._index_file, signature,
+                                          self._reader)
+        else:
+            self._index = None
+        if self._index is None:
+            self._index = _CaseIndex(self._reader, signature)
+            if self._index_file:
+                self._index.save(self._index_file)
+        return self._index
+
     def _fetch(self, query):
         """ Return data based on `query`. """
         self._setup(query)
@@ -118,69 +164,28 @@ class CaseDataset(object):
             # Returning single row, not list of rows.
             return names
 
-        nan = float('NaN')
-        rows = ListResult()
-        state = {}  # Retains last seen values.
-        for case_data in self._reader.cases():
-            data = case_data['data']
-            case_id = case_data['_id']
-            case_driver_id = case_data['_driver_id']
-
-            prefix = self._drivers[case_driver_id]['prefix']
-            if prefix:
-                # Make names absolute.
-                pass
-                #data = dict([(prefix+name, value)
-                 #            for name, value in data.items()])
-            else:
-                data = data.copy()  # Don't modify reader version.
-
-            state.update(data)
+        index = self._get_index()
+        stop = self._query_id or self._parent_id
+        positions = index.select(self._driver_id, self._case_ids,
+                                 index.positions.get(stop))
 
-            # Filter on driver.
-            if self._driver_id is not None and \
-               case_driver_id != self._driver_id:
-                continue
-
-            # Filter on case.
-            if self._case_ids is None or case_id in self._case_ids:
-                for name in metadata_names:
-                    data[name] = case_data[name]
-
-                row = DictList(names)
-                for name in names:
-                    if query.local_only:
-                        if name in metadata_names:
-                            row.append(data[name])
-                        else:
-                            driver = self._drivers[case_driver_id]
-                            lnames = [prefix+rec for rec in driver['recording']]
-                            if name in lnames:
-                                row.append(data[name])
-                            else:
-                                row.append(nan)
-                    elif name in state:
-                        row.append(state[name])
-                    elif name in data:
-                        row.append(data[name])
-                    else:
-                        row.append(nan)
-                rows.append(row)
-
-            if case_id == self._query_id or case_id == self._parent_id:
-                break  # Parent is last case recorded.
-
-        if self._query_id and not rows:
+        if self._query_id and not len(positions):
             raise ValueError('No case with _id %s' % self._query_id)
 
+        arrays = query.transpose and query.arrays
+        cache = {}
+        columns = [index.column(name, positions, query.local_only, arrays,
+                                cache)
+                   for name in names]
+
         if query.transpose:
-            tmp = DictList(names)
-            for i in range(len(rows[0])):
-                tmp.append([row[i] for row in rows])
+            tmp = DictList(names, columns)
             # Keep CDS as attribute for post-processing
             tmp.cds = self
             return tmp
 
+        rows = ListResult([DictList(names, values)
+                           for values in zip(*columns)])
         # Keep CDS as attribute for post-processing
         rows.cds = self
         return rows
@@ -311,12 +316,11 @@ class CaseDataset(object):
             # Parent won't be seen until children are, so we have to pre-screen.
             # Collect tree of cases.
             self._parent_id = query.parent_id
+            index = self._get_index()
             cases = {}
-            for case_data in self._reader.cases():
-                _id = case_data['_id']
-                _driver_id = case_data['_driver_id']
-                _parent_id = case_data['_parent_id']
-
+            for _id, _driver_id, _parent_id in zip(index.ids,
+                                                   index.driver_ids,
+                                                   index.parent_ids):
                 if _id in cases:
                     node = cases[_id]
                     node.driver_id = _driver_id
@@ -441,6 +445,7 @@ class Query(object):
         self.local_only = False
         self.names = False
         self.transpose = False
+        self.arrays = False
 
     def fetch(self):
         """ Return a list of rows of data, one for each selected case. """
@@ -449,10 +454,12 @@ class Query(object):
     def write(self, out, format=None):
         """
         Write filtered :class:`CaseDataset` to `out`, a filename or file-like
-        object.  Default `format` is the format of the original data file.
+        object.  Default `format` is the format of the original data file,
+        or ``bson`` for a ``columnar`` file.
         """
         if format is None:
-            if isinstance(self._dataset._reader, _BSONReader):
+            if isinstance(self._dataset._reader,
+                          (_BSONReader, _ColumnarReader)):
                 format = 'bson'
             else:
                 format = 'json'
@@ -501,12 +508,15 @@ class Query(object):
         self.transpose = False
         return self
 
-    def by_variable(self):
+    def by_variable(self, arrays=False):
         """
         Have :meth:`fetch` return data as ``[var][case]`` rather than the
-        default of ``[case][var]``.
+        default of ``[case][var]``.  If `arrays` is True, the data for
+        numeric variables is returned as float arrays, with ``NaN`` for
+        cases where the variable has no value.
         """
         self.transpose = True
+        self.arrays = arrays
         return self
 
     def var_names(self):
@@ -551,6 +561,222 @@ class ListResult(list):
     pass
 
 
+class _CaseIndex(object):
+    """
+    Columnar index of the cases read by `reader`, built with one pass over
+    the file.  It keeps the offset of each case and, for each variable, the
+    positions of the cases which recorded it, so the value in effect at any
+    case is found by a binary search rather than a rescan of the file.
+    Variables recorded only as ints or only as floats get a numeric column;
+    any other value is read from the file when it's needed.
+    `source` identifies the file the index was built from.
+    If `npz` is given, the index is restored from that saved index, and its
+    columns are only loaded when used.
+    """
+
+    _METADATA = ('error_status', 'error_message', 'timestamp')
+
+    def __init__(self, reader, source=None, npz=None):
+        self._reader = reader
+        self._npz = npz
+        self._where = {}    # name -> positions where recorded.
+        self._numeric = {}  # name -> numeric values, or None.
+
+        if npz is None:
+            self.source = source
+            self._build()
+        else:
+            state = cPickle.loads(npz['state'].tostring())
+            self.__dict__.update(state)
+
+        self.positions = {}  # case id -> position of first occurrence.
+        for pos, case_id in enumerate(self.ids):
+            self.positions.setdefault(case_id, pos)
+
+    def _build(self):
+        """ Read all cases, keeping only numeric values. """
+        self.ids = []
+        self.parent_ids = []
+        self.driver_ids = []
+        self.offsets = []
+        self.metadata = dict([(name, []) for name in self._METADATA])
+        where = {}
+        numeric = {}
+
+        cases = self._reader.indexed_cases()
+        for pos, (offset, case_data) in enumerate(cases):
+            self.ids.append(case_data['_id'])
+            self.parent_ids.append(case_data['_parent_id'])
+            self.driver_ids.append(case_data['_driver_id'])
+            self.offsets.append(offset)
+            for name in self._METADATA:
+                self.metadata[name].append(case_data[name])
+            for name, value in case_data['data'].iteritems():
+                code = _typecode(value)
+                if name in where:
+                    where[name].append(pos)
+                    values = numeric[name]
+                    if values is not None:
+                        if code == values.typecode:
+                            values.append(value)
+                        else:
+                            numeric[name] = None
+                else:
+                    where[name] = array('l', (pos,))
+                    numeric[name] = None if code is None else \
+                                    array(code, (value,))
+
+        self._names = dict((name, i) for i, name in enumerate(sorted(where)))
+        for name in where:
+            self._where[name] = numpy.fromiter(where[name], int,
+                                               len(where[name]))
+            values = numeric[name]
+            if values is not None:
+                dtype = float if values.typecode == 'd' else int
+                values = numpy.fromiter(values, dtype, len(values))
+            self._numeric[name] = values
+
+    @staticmethod
+    def signature(filename):
+        """ Return ``(size, mtime)`` of `filename`. """
+        info = os.stat(filename)
+        return (info.st_size, info.st_mtime)
+
+    @staticmethod
+    def load(filename, source, reader):
+        """
+        Return index saved in `filename` if it was built from `source`,
+        else None.
+        """
+        try:
+            index = _CaseIndex(reader, npz=numpy.load(filename))
+        except Exception as exc:
+            logging.debug("Can't load case index %s: %s", filename, exc)
+            return None
+        if index.source != source:
+            return None
+        return index
+
+    def save(self, filename):
+        """
+        Save index to `filename` as a NumPy ``.npz`` file. Positions and
+        numeric columns are stored as arrays, everything else is pickled.
+        """
+        state = dict(source=self.source, ids=self.ids,
+                     parent_ids=self.parent_ids, driver_ids=self.driver_ids,
+                     offsets=self.offsets, metadata=self.metadata,
+                     _names=self._names)
+        state = cPickle.dumps(state, cPickle.HIGHEST_PROTOCOL)
+        arrays = dict(state=numpy.fromstring(state, dtype=numpy.uint8))
+        for name, i in self._names.items():
+            arrays['w%d' % i] = self._get_where(name)
+            values = self._get_numeric(name)
+            if values is not None:
+                arrays['v%d' % i] = values
+        with open(filename, 'wb') as out:
+            numpy.savez(out, **arrays)
+
+    def _get_where(self, name):
+        """ Return positions where `name` was recorded. """
+        if name not in self._where:
+            self._where[name] = self._npz['w%d' % self._names[name]]
+        return self._where[name]
+
+    def _get_numeric(self, name):
+        """ Return numeric values recorded for `name`, or None. """
+        if name not in self._numeric:
+            key = 'v%d' % self._names[name]
+            self._numeric[name] = self._npz[key] \
+                                  if key in self._npz.files else None
+        return self._numeric[name]
+
+    def select(self, driver_id=None, case_ids=None, stop=None):
+        """
+        Return array of positions of cases recorded by `driver_id` with an
+        id in `case_ids`, up to and including position `stop`.
+        """
+        count = len(self.ids) if stop is None else stop + 1
+        ids = self.ids
+        driver_ids = self.driver_ids
+        positions = [pos for pos in xrange(count)
+                     if (driver_id is None or driver_ids[pos] == driver_id)
+                     and (case_ids is None or ids[pos] in case_ids)]
+        return numpy.array(positions, dtype=int)
+
+    def column(self, name, positions, local_only=False, arrays=False,
+               cache=None):
+        """
+        Return values of `name` at `positions`.  Unless `local_only` is set,
+        a case which didn't record `name` gets the last value recorded
+        before it.  Missing values are ``NaN``.  If `arrays` is set and all
+        recorded values are numeric, a float array is returned.
+        Cases read from the file are kept in `cache`, a dictionary
+        shared by the columns of one query.
+        """
+        if name in self.metadata:
+            values = self.metadata[name]
+            return [values[pos] for pos in positions]
+        elif name == '_id':
+            return [self.ids[pos] for pos in positions]
+        elif name == '_parent_id':
+            return [self.parent_ids[pos] for pos in positions]
+        elif name == '_driver_id':
+            return [self.driver_ids[pos] for pos in positions]
+
+        nan = float('NaN')
+        if name not in self._names:
+            if arrays:
+                column = numpy.empty(len(positions))
+                column.fill(nan)
+                return column
+            return [nan] * len(positions)
+
+        where = self._get_where(name)
+        recorded = where.searchsorted(positions, side='right') - 1
+        valid = recorded >= 0
+        if local_only:
+            valid &= where[recorded] == positions
+
+        values = self._get_numeric(name)
+        if values is not None:
+            column = values[recorded]
+            if arrays:
+                column = column.astype(float)
+                column[~valid] = nan
+                return column
+            return [val if ok else nan
+                    for val, ok in zip(column.tolist(), valid.tolist())]
+
+        if cache is None:
+            cache = {}
+        column = []
+        for i, ok in zip(recorded.tolist(), valid.tolist()):
+            if ok:
+                pos = where[i]
+                if pos not in cache:
+                    offset = self.offsets[pos]
+                    cache[pos] = self._reader.case_at(offset)['data']
+                column.append(cache[pos][name])
+            else:
+                column.append(nan)
+
+        if arrays and all(isinstance(val, (int, long, float)) and
+                          not isinstance(val, bool) for val in column):
+            column = numpy.array(column, dtype=float)
+        return column
+
+
+def _typecode(value):
+    """
+    Return :mod:`array` typecode for a numeric column of `value`, or None.
+    """
+    if isinstance(value, float):
+        return 'd'
+    elif isinstance(value, int) and not isinstance(value, bool):
+        return 'l'
+    return None
+
+
 class _CaseNode(object):
     """ Represents a node in a tree of cases. """
 
@@ -612,20 +838,30 @@ class _Reader(object):
             self._next()  # Re-read 'simulation_info'.
 
         driver_info = []
+        offset = self._inp.tell()
         info = self._next()
         while info:
             if '_driver_id' not in info:
                 driver_info.append(info)
             else:
-                self._info = info
+                self._info = (offset, info)
                 self._state = 'cases'
                 return driver_info
+            offset = self._inp.tell()
             info = self._next()
         self._state = 'eof'
         return driver_info
 
     def cases(self):
         """ Return sequence of 'iteration_case' dictionaries. """
+        for offset, info in self.indexed_cases():
+            yield info
+
+    def indexed_cases(self):
+        """
+        Return sequence of ``(offset, case)``, where `offset` may be passed
+        to :meth:`case_at` to read `case` again.
+        """
         if self._state != 'cases' or self._info is None:
             self.drivers()  # Read up to first case.
             if self._state != 'cases':
@@ -634,12 +870,21 @@ class _Reader(object):
         yield self._info  # Read when looking for drivers.
         self._info = None
 
+        offset = self._inp.tell()
         info = self._next()
         while info:
-            yield info
+            yield offset, info
+            offset = self._inp.tell()
             info = self._next()
         self._state = 'eof'
 
+    def case_at(self, offset):
+        """ Return the 'iteration_case' dictionary at `offset`. """
+        self._inp.seek(offset)
+        self._state = 'seek'
+        self._info = None
+        return self._next()
+
 
 class _JSONReader(_Reader):
     """ Reads a :class:`JSONCaseRecorder` file. """
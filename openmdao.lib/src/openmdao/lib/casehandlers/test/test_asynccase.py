@@ -0,0 +1,75 @@
+"""
+Test of AsyncCaseRecorder.
+"""
+
+import unittest
+
+import numpy
+
+from openmdao.main.api import Assembly, set_as_top
+from openmdao.main.datatypes.api import Array
+from openmdao.test.execcomp import ExecComp
+from openmdao.lib.casehandlers.api import AsyncCaseRecorder, DBCaseRecorder, \
+                                          ListCaseRecorder
+from openmdao.lib.drivers.api import SimpleCaseIterDriver
+from openmdao.main.case import Case
+from openmdao.util.testutil import assert_raises
+
+
+class FailingRecorder(ListCaseRecorder):
+    """ Fails on the third case. """
+
+    def record(self, driver, inputs, outputs, exc, case_uuid, parent_uuid):
+        if len(self.cases) == 2:
+            raise IOError('disk full')
+        super(FailingRecorder, self).record(driver, inputs, outputs, exc,
+                                            case_uuid, parent_uuid)
+
+
+class TestCase(unittest.TestCase):
+
+    def test_snapshot(self):
+        recorder = AsyncCaseRecorder(ListCaseRecorder(), maxsize=2)
+        recorder.register(self, ['x', 'arr'], ['y'])
+        arr = numpy.zeros(3)
+        for i in range(10):
+            arr[:] = i
+            recorder.record(self, [float(i), arr], [i*2.], None, str(i), '')
+        recorder.close()
+
+        cases = list(recorder.get_iterator())
+        self.assertEqual(len(cases), 10)
+        for i, case in enumerate(cases):
+            self.assertEqual(case['x'], i)
+            self.assertEqual(case['arr'].tolist(), [i, i, i])
+            self.assertEqual(case['y'], i*2.)
+            self.assertEqual(case.uuid, str(i))
+
+    def test_error(self):
+        recorder = AsyncCaseRecorder(FailingRecorder())
+        recorder.register(self, ['x'], [])
+        for i in range(3):
+            recorder.record(self, [i], [], None, '', '')
+        assert_raises(self, 'recorder.close()', globals(), locals(),
+                      IOError, 'disk full')
+        self.assertEqual(len(recorder.recorder.cases), 2)
+
+    def test_model(self):
+        top = set_as_top(Assembly())
+        driver = top.add('driver', SimpleCaseIterDriver())
+        top.add('comp', ExecComp(exprs=['z=x+y']))
+        driver.workflow.add('comp')
+        cases = [Case(inputs=[('comp.x', float(i)), ('comp.y', 1.)])
+                 for i in range(20)]
+        Case.set_vartree_inputs(driver, cases)
+        driver.add_responses(['comp.z'])
+        top.recorders = [AsyncCaseRecorder(DBCaseRecorder(), maxsize=4)]
+        top.run()
+
+        results = sorted(case['comp.z'] for case in
+                         top.recorders[0].get_iterator())
+        self.assertEqual(results, [i+1. for i in range(20)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+"""
+Test of ColumnarCaseRecorder.
+"""
+
+import os.path
+import shutil
+import tempfile
+import unittest
+
+from math import isnan
+
+import numpy
+
+from openmdao.main.api import Assembly, Component, Case, set_as_top
+from openmdao.main.datatypes.api import Array, Float
+from openmdao.lib.casehandlers.api import CaseDataset, ColumnarCaseRecorder, \
+                                          JSONCaseRecorder
+from openmdao.lib.drivers.api import SimpleCaseIterDriver
+
+
+class ArrayComp(Component):
+
+    x = Float(0., iotype='in')
+    y = Array(numpy.zeros(1000), iotype='out')
+
+    def execute(self):
+        self.y = numpy.arange(1000.) * self.x
+
+
+class TestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.startdir = os.getcwd()
+        self.tempdir = tempfile.mkdtemp(prefix='test_columnarcase-')
+        os.chdir(self.tempdir)
+
+        self.top = top = set_as_top(Assembly())
+        driver = top.add('driver', SimpleCaseIterDriver())
+        top.add('comp', ArrayComp())
+        driver.workflow.add('comp')
+        cases = [Case(inputs=[('comp.x', float(i))]) for i in range(25)]
+        Case.set_vartree_inputs(driver, cases)
+
+    def tearDown(self):
+        self.top = None
+        os.chdir(self.startdir)
+        if not os.environ.get('OPENMDAO_KEEPDIRS', False):
+            try:
+                shutil.rmtree(self.tempdir)
+            except OSError:
+                pass
+
+    def test_query(self):
+        self.top.recorders = [JSONCaseRecorder('cases.json'),
+                              ColumnarCaseRecorder('cases.col', chunk_size=10)]
+        self.top.run()
+        self.assertTrue(os.path.getsize('cases.col') <
+                        os.path.getsize('cases.json'))
+
+        json_cds = CaseDataset('cases.json', 'json')
+        cds = CaseDataset('cases.col', 'columnar')
+        self.assertEqual(cds.data.var_names().fetch(),
+                         json_cds.data.var_names().fetch())
+
+        json_cases = json_cds.data.fetch()
+        cases = cds.data.fetch()
+        self.assertEqual(len(cases), 25)
+        for json_case, case in zip(json_cases, cases):
+            for name in json_case.keys():
+                if name in ('timestamp', '_driver_id', '_parent_id'):
+                    continue  # Differ between recorders.
+                expected = json_case[name]
+                if isinstance(expected, numpy.ndarray):
+                    self.assertEqual(case[name].tolist(), expected.tolist())
+                elif isinstance(expected, float) and isnan(expected):
+                    self.assertTrue(isnan(case[name]))
+                else:
+                    self.assertEqual(case[name], expected)
+
+        columns = cds.data.vars('comp.x').by_variable(arrays=True).fetch()
+        self.assertEqual(columns['comp.x'].tolist(), range(25))
+
+        # Rescanning replaces and closes the old memory map.
+        old_map = cds._reader._buf
+        list(cds._reader.cases())
+        self.assertFalse(cds._reader._buf is old_map)
+        self.assertRaises(ValueError, old_map.size)
+        old_map = None
+
+        # Restore into a model which has the recorded driver inputs.
+        top = set_as_top(Assembly())
+        driver = top.add('driver', SimpleCaseIterDriver())
+        top.add('comp', ArrayComp())
+        driver.workflow.add('comp')
+        Case.set_vartree_inputs(driver, [Case(inputs=[('comp.x', 0.)])])
+        top._setup()
+        cds.restore(top, cases[7]['_id'])
+        self.assertEqual(top.comp.x, 7.)
+        self.assertEqual(top.comp.y[10], 70.)
+
+    def test_bad_file(self):
+        with open('cases.json', 'w') as out:
+            out.write('{}')
+        try:
+            CaseDataset('cases.json', 'columnar')
+        except ValueError as exc:
+            self.assertEqual(str(exc),
+                             'cases.json is not a columnar case file')
+        else:
+            self.fail('Expected ValueError')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -296,6 +296,61 @@ class CSVCaseRecorderTestCase(unittest.TestCase):
         line = '"",2.0,4.3,1.9,"","","","",""\r\n'
         self.assertTrue(csv_data[1].endswith(line))
 
+    def test_blocks(self):
+        rec = CSVCaseRecorder(filename=self.filename, batch_size=3)
+        rec.num_backups = 0
+        rec.startup()
+        rec.register(self, ['comp1.y', 'comp1.x'], ['comp1.s'])
+        for i in range(10):
+            rec.record(self, [i*2., float(i)], ['s%d' % i], None, '', '')
+        rec.close()
+
+        blocks = list(CSVCaseIterator(filename=self.filename).blocks(4))
+        self.assertEqual([values.shape for names, values in blocks],
+                         [(4, 2), (4, 2), (2, 2)])
+        names, values = blocks[-1]
+        self.assertEqual(names, ['comp1.x', 'comp1.y'])
+        self.assertEqual(values.tolist(), [[8., 16.], [9., 18.]])
+
+        cases = list(CSVCaseIterator(filename=self.filename))
+        self.assertEqual(len(cases), 10)
+        self.assertEqual(cases[9]['comp1.s'], 's9')
+
+    def test_blocks_external(self):
+        csv_data = ['"comp1.x", "timestamp", "comp1.y"\n'] + \
+                   ['%d, 0, %d\n' % (i, i*2) for i in range(5)] + \
+                   ['5, 0, 10\n', '"6", 0, 12\n']
+
+        outfile = open(self.filename, 'w')
+        outfile.writelines(csv_data)
+        outfile.close()
+
+        blocks = list(CSVCaseIterator(filename=self.filename).blocks(3))
+        self.assertEqual([names for names, values in blocks],
+                         [['comp1.x', 'comp1.y']] * 3)
+        values = [values.tolist() for names, values in blocks]
+        self.assertEqual(values, [[[0., 0.], [1., 2.], [2., 4.]],
+                                  [[3., 6.], [4., 8.], [5., 10.]],
+                                  [[6., 12.]]])
+
+        # Quoted fields may span blocks.
+        rec = CSVCaseRecorder(filename=self.filename)
+        rec.num_backups = 0
+        rec.startup()
+        rec.register(self, ['comp1.x'], [])
+        rec.record(self, [1.], [], None, '', '')
+        rec.record(self, [2.], [], 'line 1\nline 2', '', '')
+        rec.record(self, [3.], [], None, '', '')
+        rec.close()
+
+        cases = list(CSVCaseIterator(filename=self.filename))
+        self.assertEqual([case['comp1.x'] for case in cases], [1., 2., 3.])
+        self.assertEqual(str(cases[1].exc), 'line 1\nline 2')
+
+        blocks = list(CSVCaseIterator(filename=self.filename).blocks(2))
+        self.assertEqual([values.tolist() for names, values in blocks],
+                         [[[1.], [2.]], [[3.]]])
+
     def test_CSVCaseRecorder_messages(self):
         rec = CSVCaseRecorder(filename=self.filename)
         rec.startup()
@@ -95,9 +95,12 @@ Constants:
    driver.directory:
    driver.force_fd: False
    driver.gradient_options.atol: 1e-09
+   driver.gradient_options.block_solve: False
    driver.gradient_options.derivative_direction: auto
    driver.gradient_options.directional_fd: False
+   driver.gradient_options.fd_coloring: False
    driver.gradient_options.fd_form: forward
+   driver.gradient_options.fd_processes: 1
    driver.gradient_options.fd_step: 1e-06
    driver.gradient_options.fd_step_type: absolute
    driver.gradient_options.force_fd: False
@@ -132,9 +135,12 @@ Constants:
    nested.doublenest.driver.directory:
    nested.doublenest.driver.force_fd: False
    nested.doublenest.driver.gradient_options.atol: 1e-09
+   nested.doublenest.driver.gradient_options.block_solve: False
    nested.doublenest.driver.gradient_options.derivative_direction: auto
    nested.doublenest.driver.gradient_options.directional_fd: False
+   nested.doublenest.driver.gradient_options.fd_coloring: False
    nested.doublenest.driver.gradient_options.fd_form: forward
+   nested.doublenest.driver.gradient_options.fd_processes: 1
    nested.doublenest.driver.gradient_options.fd_step: 1e-06
    nested.doublenest.driver.gradient_options.fd_step_type: absolute
    nested.doublenest.driver.gradient_options.force_fd: False
@@ -150,9 +156,12 @@ Constants:
    nested.driver.directory:
    nested.driver.force_fd: False
    nested.driver.gradient_options.atol: 1e-09
+   nested.driver.gradient_options.block_solve: False
    nested.driver.gradient_options.derivative_direction: auto
    nested.driver.gradient_options.directional_fd: False
+   nested.driver.gradient_options.fd_coloring: False
    nested.driver.gradient_options.fd_form: forward
+   nested.driver.gradient_options.fd_processes: 1
    nested.driver.gradient_options.fd_step: 1e-06
    nested.driver.gradient_options.fd_step_type: absolute
    nested.driver.gradient_options.force_fd: False
@@ -321,9 +330,12 @@ Constants:
    driver.directory:
    driver.force_fd: False
    driver.gradient_options.atol: 1e-09
+   driver.gradient_options.block_solve: False
    driver.gradient_options.derivative_direction: auto
    driver.gradient_options.directional_fd: False
+   driver.gradient_options.fd_coloring: False
    driver.gradient_options.fd_form: forward
+   driver.gradient_options.fd_processes: 1
    driver.gradient_options.fd_step: 1e-06
    driver.gradient_options.fd_step_type: absolute
    driver.gradient_options.force_fd: False
@@ -385,9 +397,12 @@ Constants:
    driver.directory:
    driver.force_fd: False
    driver.gradient_options.atol: 1e-09
+   driver.gradient_options.block_solve: False
    driver.gradient_options.derivative_direction: auto
    driver.gradient_options.directional_fd: False
+   driver.gradient_options.fd_coloring: False
    driver.gradient_options.fd_form: forward
+   driver.gradient_options.fd_processes: 1
    driver.gradient_options.fd_step: 1e-06
    driver.gradient_options.fd_step_type: absolute
    driver.gradient_options.force_fd: False
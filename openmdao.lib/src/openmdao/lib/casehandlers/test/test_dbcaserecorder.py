@@ -9,6 +9,8 @@ import os
 import logging
 import shutil
 
+import numpy
+
 from openmdao.main.api import Assembly, Case, set_as_top
 from openmdao.test.execcomp import ExecComp
 from openmdao.lib.casehandlers.api import DBCaseIterator, DBCaseRecorder, \
@@ -201,6 +203,38 @@ class DBCaseRecorderTestCase(unittest.TestCase):
         except OSError:
             logging.error("problem removing directory %s", tmpdir)
 
+    def test_buffered(self):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            dfile = os.path.join(tmpdir, 'junk.db')
+            recorder = DBCaseRecorder(dfile, flush_cases=5)
+            inputs = ['comp1.x', 'comp1.arr']
+            recorder.register(self, inputs, ['comp1.z'])
+            for i in range(12):
+                inputs = [float(i), numpy.arange(6.).reshape((2, 3))*i]
+                recorder.record(self, inputs, [i*2.], None, '', '')
+
+            # Only complete batches have been written.
+            varinfo = case_db_to_dict(dfile, ['comp1.x', 'comp1.arr'])
+            self.assertEqual(varinfo['comp1.x'], range(10))
+            self.assertEqual(varinfo['comp1.arr'][3].shape, (2, 3))
+            self.assertEqual(varinfo['comp1.arr'][3][1, 2], 15.)
+
+            for i, case in enumerate(recorder.get_iterator()):
+                arr = case['comp1.arr']
+                self.assertTrue(isinstance(arr, numpy.ndarray))
+                self.assertEqual(arr.tolist(),
+                                 (numpy.arange(6.).reshape((2, 3))*i).tolist())
+                arr[0, 0] = -1.  # Must be writable.
+                self.assertEqual(case['comp1.z'], i*2.)
+            self.assertEqual(i, 11)
+            recorder.close()
+        finally:
+            try:
+                shutil.rmtree(tmpdir, onerror=onerror)
+            except OSError:
+                logging.error("problem removing directory %s", tmpdir)
+
     def test_string(self):
         recorder = DBCaseRecorder()
         inputs = ['str', 'unicode', 'list']  # Check pickling.
@@ -82,9 +82,12 @@ Constants:
    driver.fdchm: 0.01
    driver.force_fd: False
    driver.gradient_options.atol: 1e-09
+   driver.gradient_options.block_solve: False
    driver.gradient_options.derivative_direction: auto
    driver.gradient_options.directional_fd: False
+   driver.gradient_options.fd_coloring: False
    driver.gradient_options.fd_form: forward
+   driver.gradient_options.fd_processes: 1
    driver.gradient_options.fd_step: 1e-06
    driver.gradient_options.fd_step_type: absolute
    driver.gradient_options.force_fd: False
@@ -205,9 +208,12 @@ Constants:
    driver.directory:
    driver.force_fd: False
    driver.gradient_options.atol: 1e-09
+   driver.gradient_options.block_solve: False
    driver.gradient_options.derivative_direction: auto
    driver.gradient_options.directional_fd: False
+   driver.gradient_options.fd_coloring: False
    driver.gradient_options.fd_form: forward
+   driver.gradient_options.fd_processes: 1
    driver.gradient_options.fd_step: 1e-06
    driver.gradient_options.fd_step_type: absolute
    driver.gradient_options.force_fd: False
@@ -347,6 +347,41 @@ class TestCase(unittest.TestCase):
         # Exact case counts are unreliable, just assure restore was quicker.
         self.assertTrue(len(cases) < n_orig/4)   # Typically 15
 
+    def test_index(self):
+        # Columnar results match row results, index file is reused.
+        names = ['half.z2a', 'sub.dis1.itername', 'sub.dis1.y1']
+        rows = self.cds.data.vars(names).fetch()
+        columns = self.cds.data.vars(names).by_variable(arrays=True).fetch()
+        self.assertTrue(isinstance(columns['half.z2a'], np.ndarray))
+        self.assertTrue(isinstance(columns['sub.dis1.itername'], list))
+        for i, row in enumerate(rows):
+            for name in names:
+                if isinstance(row[name], float) and isnan(row[name]):
+                    self.assertTrue(isnan(columns[name][i]))
+                else:
+                    self.assertEqual(columns[name][i], row[name])
+
+        local = self.cds.data.local().vars(names).by_variable(arrays=True)
+        local = local.fetch()
+        self.assertEqual(len(local['half.z2a']), 242)
+        self.assertEqual(np.isnan(local['half.z2a']).sum(), 184)
+
+        path = os.path.join(os.path.dirname(__file__), 'sellar.json')
+        cds = CaseDataset(path, 'json', index_file='sellar.idx')
+        cases = cds.data.vars(names).fetch()
+        self.assertTrue(os.path.exists('sellar.idx'))
+        cds = CaseDataset(path, 'json', index_file='sellar.idx')
+        self.assertEqual(cds.data.vars(names).fetch()[-1], cases[-1])
+
+        # Only numeric columns are saved, strings are read from the file.
+        index = cds._get_index()
+        self.assertTrue(index._npz is not None)
+        self.assertEqual(index._get_numeric('sub.dis1.itername'), None)
+        self.assertEqual(len(index._get_numeric('half.z2a')), 58)
+        reloaded = cds.data.vars(names).by_variable(arrays=True).fetch()
+        self.assertEqual(reloaded['sub.dis1.itername'],
+                         columns['sub.dis1.itername'])
+
     def test_write(self):
         # Read in a dataset and write out a selected portion of it.
         path = os.path.join(os.path.dirname(__file__), 'jsonrecorder.json')
@@ -1,3 +1,8 @@
+import csv
+from itertools import chain, islice
+
+import numpy
+
 
 def driver_map(driver, inputs, outputs):
     """ Return mapped names for `driver` as ``(inputs, outputs)``. """
@@ -31,3 +36,46 @@ def driver_map(driver, inputs, outputs):
     return ([prefix+name for name in inputs],
             [prefix+name for name in outputs])
 
+
+def csv_blocks(stream, block_size=1000, dialect='excel', **fmtparams):
+    """
+    Generate ``(lineno, rows)`` for blocks of up to `block_size` lines read
+    from `stream`, where the block starts after line `lineno`. A block of
+    plain numeric lines with the same number of fields is converted in one
+    :func:`numpy.fromstring` call and `rows` is a 2-D float array. Any other
+    block is read by :mod:`csv` with `dialect` and `fmtparams`, and `rows`
+    is the list of rows it returned.
+    """
+    fmt = csv.reader([], dialect, **fmtparams).dialect
+    lineno = 0
+    lines = list(islice(stream, block_size))
+    while lines:
+        values = _float_block(lines, fmt.delimiter, fmt.quotechar)
+        if values is None:
+            # A quoted field may continue past the end of the block.
+            reader = csv.reader(chain(lines, stream), dialect, **fmtparams)
+            rows = []
+            while reader.line_num < len(lines):
+                rows.append(reader.next())
+            yield lineno, rows
+            lineno += reader.line_num
+        else:
+            yield lineno, values
+            lineno += len(lines)
+        lines = list(islice(stream, block_size))
+
+
+def _float_block(lines, delimiter, quotechar):
+    """
+    Return 2-D float array of `lines` if they are all plain numbers with the
+    same number of fields, else None.
+    """
+    ncols = lines[0].count(delimiter) + 1
+    text = delimiter.join(line.strip() for line in lines)
+    if (quotechar and quotechar in text) or \
+       any(line.count(delimiter) != ncols-1 for line in lines):
+        return None
+    values = numpy.fromstring(text, sep=delimiter)
+    if values.size != len(lines) * ncols:
+        return None
+    return values.reshape((len(lines), ncols))
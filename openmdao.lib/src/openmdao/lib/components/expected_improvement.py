@@ -1,16 +1,38 @@
 """Expected Improvement calculation for single objective."""
 
-from numpy import exp, abs, pi, seterr
-
-try:
-    from math import erfc   # py27 and later has erfc in the math module
-except ImportError as err:
-    from scipy.special import erfc
+from numpy import exp, abs, pi, zeros, atleast_1d, array
+from scipy.special import erfc
 
 from openmdao.main.datatypes.api import Float, Instance
 from openmdao.main.api import Component
 from openmdao.main.uncertain_distributions import NormalDistribution
 
+
+def expected_improvement(target, mu, sigma):
+    """Returns arrays of the expected improvement and the probability of
+    improvement over target for predictions with the given arrays of means
+    and standard deviations. Both are zero wherever sigma is zero.
+    """
+
+    mu = atleast_1d(array(mu, dtype=float))
+    sigma = atleast_1d(array(sigma, dtype=float))
+
+    EI = zeros(mu.shape)
+    PI = zeros(mu.shape)
+
+    ok = sigma > 0
+    diff = target - mu[ok]
+    sig = sigma[ok]
+
+    PI[ok] = 0.5*erfc(-(1./2.**.5)*(diff/sig))
+
+    T1 = diff*.5*(erfc(-diff/(sig*2.**.5)))
+    T2 = sig*((1./((2.*pi)**.5))*exp(-0.5*(diff/sig)**2.))
+    EI[ok] = abs(T1+T2)
+
+    return EI, PI
+
+
 class ExpectedImprovement(Component):
     """Expected Improvement calculation for single objective."""
 
@@ -33,21 +55,17 @@ class ExpectedImprovement(Component):
         """ Calculates the expected improvement of the model at a given point.
         """
 
-        mu = self.current.mu
-        sigma = self.current.sigma
-        target = self.target
-
-        try:
-            seterr(divide='raise')
-            self.PI = 0.5*erfc(-(1./2.**.5)*((target-mu)/sigma))
-
-            T1 = (target-mu)*.5*(erfc(-(target-mu)/(sigma*2.**.5)))
-            T2 = sigma*((1./((2.*pi)**.5))*exp(-0.5*((target-mu)/sigma)**2.))
-            self.EI = abs(T1+T2)
-
-        except (ValueError, ZeroDivisionError, FloatingPointError):
-            self.EI = 0
-            self.PI = 0
-
+        EI, PI = expected_improvement(self.target, self.current.mu,
+                                      self.current.sigma)
+        self.EI = EI[0]
+        self.PI = PI[0]
 
+    def score_candidates(self, surrogate, X):
+        """ Calculates the expected improvement and probability of
+        improvement over target at many candidate points (the rows of X)
+        with a single batched prediction from the given KrigingSurrogate.
+        Returns a tuple of two arrays.
+        """
 
+        mu, sigma = surrogate.predict_many(X)
+        return expected_improvement(self.target, mu, sigma)
@@ -10,6 +10,7 @@ except ImportError as err:
 from openmdao.main.datatypes.api import Enum, Float, Array, Int
 from openmdao.main.component import Component
 from openmdao.main.uncertain_distributions import NormalDistribution
+from openmdao.lib.components.pareto_filter import dominated
 
 
 class MultiObjExpectedImprovement(Component):
@@ -108,24 +109,16 @@ class MultiObjExpectedImprovement(Component):
         """determines if a completely dominates b
        returns True is if does
     """
-        comp = [c1 < c2 for c1, c2 in zip(a, b)]
-        if sum(comp) == self.target.shape[1]:
-            return True
-        return False
+        return dominated([b], [a], strict=True)[0]
 
     def _nobj_PI(self, mu, sigma):
         ''' n-objective probability of improvement.'''
 
         cov = diag(array(sigma)**2)
         rands = random.multivariate_normal(mu, cov, self.n)
-        num = 0  # number of cases that dominate the current Pareto set
-
-        for random_sample in rands:
-            for par_point in self.y_star:
-                #par_point = [p[2] for p in par_point.outputs]
-                if self._dom(par_point, random_sample):
-                    num = num + 1
-                    break
+
+        # number of samples dominated by the current Pareto set
+        num = dominated(rands, self.y_star, strict=True).sum()
         pi = (self.n - num)/float(self.n)
         return pi
 
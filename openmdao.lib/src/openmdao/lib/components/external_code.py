@@ -3,6 +3,7 @@
 """
 
 import glob
+import hashlib
 import logging
 import os.path
 import shutil
@@ -24,6 +25,18 @@ from openmdao.util import shellproc
 from distutils.spawn import find_executable
 
 
+def _file_digest(path):
+    """ Return SHA1 digest of the contents of `path`, None if missing. """
+    try:
+        with open(path, 'rb') as inp:
+            sha = hashlib.sha1()
+            for data in iter(lambda: inp.read(1 << 20), ''):
+                sha.update(data)
+    except IOError:
+        return None
+    return sha.hexdigest()
+
+
 class ExternalCode(Component):
     """
     Run an external code as a component. The component can be configured to
@@ -63,6 +76,9 @@ class ExternalCode(Component):
         self._process = None
         self._server = None
 
+        self._cache_digests = None   # Input file digests in exec_cache key.
+        self._generated_inputs = set()  # Input files written by execute.
+
     # This gets used by remote server.
     def get_access_controller(self):  #pragma no cover
         """ Return :class:`AccessController` for this object. """
@@ -139,6 +155,8 @@ class ExternalCode(Component):
         self.return_code = -12345678
         self.timed_out = False
 
+        self._check_generated_inputs()
+
         if not self.command:
             self.raise_exception('Empty command list', ValueError)
 
@@ -179,6 +197,62 @@ class ExternalCode(Component):
         finally:
             self.return_code = -999999 if return_code is None else return_code
 
+    def _get_cache_inputs(self):
+        """
+        Adds the command, the environment and the contents of the input
+        files to the inputs that key the `exec_cache`, since the results
+        depend on them too. Input files found to be rewritten before the
+        code runs, typically by a wrapper's :meth:`execute` generating them
+        from its variables, are left out since their old contents don't
+        identify the run.
+        """
+        inputs = super(ExternalCode, self)._get_cache_inputs()
+        inputs.append(('command', self.command))
+        inputs.append(('env_vars', sorted(self.env_vars.items())))
+
+        self._cache_digests = {}
+        for path in self._cache_input_files():
+            if path not in self._generated_inputs:
+                digest = _file_digest(path)
+                self._cache_digests[path] = digest
+                inputs.append((path, digest))
+
+        return inputs
+
+    def _cache_input_files(self):
+        """ Return sorted paths of the input files, with patterns expanded. """
+        paths = set()
+        for metadata in self.external_files:
+            if metadata.get('input', False):
+                path = metadata.path
+                if any(ch in path for ch in '*?['):
+                    paths.update(glob.glob(path))
+                else:
+                    paths.add(path)
+        if self.stdin and self.stdin != self.DEV_NULL:
+            paths.add(self.stdin)
+        return sorted(paths)
+
+    def _check_generated_inputs(self):
+        """
+        Record input files which have changed since the `exec_cache` key was
+        computed. They were generated for this run, so the results are
+        stored under a key without them.
+        """
+        digests, self._cache_digests = self._cache_digests, None
+        if digests is None or self.exec_cache is None:
+            return
+
+        generated = [path for path in self._cache_input_files()
+                     if path not in self._generated_inputs and
+                        (path not in digests or
+                         _file_digest(path) != digests[path])]
+        if generated:
+            self._logger.debug('not caching on generated inputs %s',
+                               generated)
+            self._generated_inputs.update(generated)
+            self.exec_cache.discard_key()
+
     def check_files(self, inputs):
         """
         Check that all 'specific' input or output external files exist.
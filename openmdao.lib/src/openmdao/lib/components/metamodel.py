@@ -6,9 +6,11 @@
 
 from copy import deepcopy
 
+from numpy import array, empty, memmap
+
 from openmdao.main.api import Component
-from openmdao.main.datatypes.api import List, Bool, Dict, Float, Slot, Str, \
-                                        VarTree
+from openmdao.main.datatypes.api import List, Bool, Dict, Float, Int, Slot, \
+                                        Str, VarTree
 from openmdao.main.datatypes.uncertaindist import UncertainDistVar
 from openmdao.main.interfaces import ISurrogate, ICaseRecorder, \
                                      IUncertainVariable
@@ -16,6 +18,72 @@ from openmdao.main.mp_support import has_interface
 from openmdao.main.vartree import VariableTree
 from openmdao.util.typegroups import int_types, real_types
 
+class _TrainingData(object):
+    """A growable 2D float array with one row per training sample. Rows go
+    into a preallocated buffer whose capacity doubles whenever it fills up,
+    so appending costs amortized O(1) per row. If a filename is given, the
+    buffer is a memory map of that file instead of living in RAM.
+    """
+
+    def __init__(self, ncols, filename=None, capacity=16):
+        self.ncols = ncols
+        self.filename = filename
+        self._nrows = 0
+        self._buf = self._allocate(capacity)
+
+    def __len__(self):
+        return self._nrows
+
+    @property
+    def array(self):
+        """View of the rows stored so far."""
+        return self._buf[:self._nrows]
+
+    def clear(self):
+        """Forget all rows, keeping the allocated buffer."""
+        self._nrows = 0
+
+    def append(self, rows):
+        """Append a 2D array of rows."""
+        nrows = self._nrows + len(rows)
+        capacity = len(self._buf)
+        if nrows > capacity:
+            while capacity < nrows:
+                capacity *= 2
+            self._grow(capacity)
+
+        self._buf[self._nrows:nrows] = rows
+        self._nrows = nrows
+
+    def relocate(self, filename):
+        """Move the stored rows to a memory map of the given file, or back
+        into RAM if filename is None."""
+        rows = self.array.copy()
+        self.filename = filename
+        self._buf = self._allocate(len(self._buf))
+        self._buf[:self._nrows] = rows
+
+    def _allocate(self, capacity):
+        if self.filename:
+            return memmap(self.filename, dtype=float, mode='w+',
+                          shape=(capacity, self.ncols))
+        return empty((capacity, self.ncols))
+
+    def _grow(self, capacity):
+        if self.filename:
+            # Extend the file in place and map it again, so nothing needs
+            # to be copied.
+            self._buf.flush()
+            with open(self.filename, 'r+b') as out:
+                out.truncate(capacity*self.ncols*self._buf.itemsize)
+            self._buf = memmap(self.filename, dtype=float, mode='r+',
+                               shape=(capacity, self.ncols))
+        else:
+            buf = empty((capacity, self.ncols))
+            buf[:self._nrows] = self._buf[:self._nrows]
+            self._buf = buf
+
+
 class MetaModel(Component):
     """ Class that creates a reduced order model for a tuple of outputs from
     a tuple of inputs. Accepts surrogate models that adhere to ISurrogate.
@@ -48,6 +116,22 @@ class MetaModel(Component):
                              "True, the new data is appended to the old data "
                              "and all of the data is used to train.")
 
+    refit_interval = Int(1, low=0, iotype='in',
+                         desc="Number of warm restarts between full "
+                              "retrains. In between, surrogates that provide "
+                              "train_incremental are only updated with the "
+                              "new data and keep their fitted "
+                              "hyperparameters. The default of 1 retrains "
+                              "fully every time, and 0 never retrains once "
+                              "the first training is done.")
+
+    training_file = Str('', iotype='in',
+                        desc="If set, the training data is kept in "
+                             "memory-mapped files named <training_file>.params "
+                             "and <training_file>.responses instead of in "
+                             "RAM, for training sets too large to fit "
+                             "in memory.")
+
     def __init__(self, params=None, responses=None):
         super(MetaModel, self).__init__()
 
@@ -64,24 +148,31 @@ class MetaModel(Component):
         # Inputs and Outputs created immediately.
 
         input_tree = self.get('params')
-        self._param_data = []
         for name in params:
             self.add(name, Float(0.0, iotype='in', desc='metamodel param'))
             input_tree.add(name, List([], desc='training param'))
 
         output_tree = self.get('responses')
-        self._response_data = {}
         for name in responses:
             self.add(name, Float(0.0, iotype='out', desc='metamodel response'))
             output_tree.add(name, List([], desc='training response'))
-            self._response_data[name] = []
             self.surrogates[name] = None
 
+        # Training data, one row per sample and one column per param or
+        # response.
+        self._param_data = _TrainingData(len(params))
+        self._response_data = _TrainingData(len(responses))
+
         self._surrogate_input_names = params
         self._surrogate_output_names = responses
 
         self._train = True
 
+        # Set when the surrogates must be trained on all of the data, and
+        # how many incremental updates have been done since then.
+        self._refit = True
+        self._num_incremental = 0
+
         # keeps track of which sur_<name> slots are full
         self._surrogate_overrides = set()
 
@@ -134,42 +225,46 @@ class MetaModel(Component):
         # Train first
         if self._train:
 
-            input_data = self._param_data
-            if self.warm_restart is False:
-                input_data = []
-                base = 0
-            else:
-                base = len(input_data)
-
-            for name in self._surrogate_input_names:
-                train_name = "params.%s" % name
-                val = self.get(train_name)
-                num_sample = len(val)
-
-                for j in xrange(base, base + num_sample):
+            incremental = False
+            if self.warm_restart is False or self._refit:
+                self._refit = False
+                self._num_incremental = 0
+            elif self.refit_interval != 1:
+                self._num_incremental += 1
+                if self.refit_interval == 0 or \
+                   self._num_incremental < self.refit_interval:
+                    incremental = True
+                else:
+                    self._num_incremental = 0
 
-                    if j > len(input_data) - 1:
-                        input_data.append([])
-                    input_data[j].append(val[j-base])
+            if self.warm_restart is False:
+                self._param_data.clear()
+                self._response_data.clear()
+            base = len(self._param_data)
 
-            # Surrogate models take an (m, n) list of lists
+            # Surrogate models take an (m, n) array
             # m = number of training samples
             # n = number of inputs
-            #
-            # TODO - Why not numpy array instead?
-
-            for name in self._surrogate_output_names:
-
-                train_name = "responses.%s" % name
-                output_data = self._response_data[name]
+            new_params = [self.get("params.%s" % name)
+                          for name in self._surrogate_input_names]
+            new_responses = [self.get("responses.%s" % name)
+                             for name in self._surrogate_output_names]
+            self._param_data.append(array(new_params, dtype=float).T)
+            self._response_data.append(array(new_responses, dtype=float).T)
 
-                if self.warm_restart is False:
-                    output_data = []
+            input_data = self._param_data.array
+            for i, name in enumerate(self._surrogate_output_names):
 
-                output_data.extend(self.get(train_name))
+                output_data = self._response_data.array[:, i]
                 surrogate = self._get_surrogate(name)
 
-                if surrogate is not None:
+                if surrogate is None:
+                    continue
+
+                if incremental and hasattr(surrogate, 'train_incremental'):
+                    surrogate.train_incremental(input_data[base:],
+                                                output_data[base:])
+                else:
                     surrogate.train(input_data, output_data)
 
             self._train = False
@@ -186,6 +281,16 @@ class MetaModel(Component):
             if surrogate is not None:
                 setattr(self, name, surrogate.predict(inputs))
 
+    def _training_file_changed(self, old, new):
+        """Move the training data to (or from) memory-mapped files."""
+
+        if new:
+            self._param_data.relocate(new + '.params')
+            self._response_data.relocate(new + '.responses')
+        else:
+            self._param_data.relocate(None)
+            self._response_data.relocate(None)
+
     def _get_surrogate(self, name):
         """Return the designated surrogate for the given output."""
 
@@ -217,6 +322,7 @@ class MetaModel(Component):
 
         self.config_changed()
         self._train = True
+        self._refit = True
 
     def _def_surrogate_trait_modified(self, surrogate, name, old, new):
         # a trait inside of the default_surrogate was changed, so we need to
@@ -226,6 +332,8 @@ class MetaModel(Component):
             surr_copy = deepcopy(self.default_surrogate)
             self._default_surrogate_copies[name] = surr_copy
 
+        self._refit = True
+
     def _surrogate_updated(self, obj, name, old, new):
         """Called when self.surrogates Dict is updated."""
 
@@ -250,6 +358,7 @@ class MetaModel(Component):
 
         self.config_changed()
         self._train = True
+        self._refit = True
 
     def _update_var_for_surrogate(self, surrogate, varname):
         """Different surrogates have different types of output values, so create
@@ -1,12 +1,121 @@
 """ Pareto Filter -- finds non-dominated cases. """
 
 # pylint: disable-msg=E0611,F0401
-from numpy import array, zeros
+from numpy import array, zeros, ones, empty, atleast_2d, isnan, inf, \
+                  lexsort, where, hstack
 
-from openmdao.main.datatypes.api import Array, List, VarTree
+from openmdao.main.datatypes.api import Array, Bool, List, VarTree
 from openmdao.main.api import Component
 from openmdao.main.vartree import VariableTree
 
+
+def _as_points(values):
+    """Returns values as a 2D float array with one point per row. Missing
+    (None or NaN) values are treated as infinitely bad."""
+
+    values = atleast_2d(array(values, dtype=float))
+    values[isnan(values)] = inf
+    return values
+
+
+def dominated(points, front, strict=False):
+    """Returns a boolean array that is True for each row of points that is
+    dominated by at least one row of front. Smaller values are better. A
+    point dominates another if it is no worse in every response and better
+    in at least one, or if strict is True, better in every response.
+    """
+    points = _as_points(points)
+    front = _as_points(front)
+
+    result = zeros(len(points), dtype=bool)
+    for point in front:
+        if strict:
+            result |= (point < points).all(1)
+        else:
+            result |= (point <= points).all(1) & (point < points).any(1)
+
+    return result
+
+
+def nondominated(points, constraints=None):
+    """Returns a boolean array that is True for each row of points that is
+    not dominated by any other row. Smaller values are better.
+
+    If constraints is given, it holds one row of constraint values per
+    point, where <= 0 means satisfied. A feasible point then dominates every
+    infeasible one, and an infeasible point dominates another if its
+    constraint violations are no greater and not all equal. Points with
+    equal violations are compared by their responses.
+    """
+    points = _as_points(points)
+    n_points = len(points)
+
+    if constraints is None:
+        violation = zeros((n_points, 0))
+    else:
+        violation = _as_points(constraints).reshape(n_points, -1)
+        violation[violation <= 0] = 0.
+    feasible = (violation == 0).all(1)
+
+    # After sorting by (infeasible, violations, responses), no point can be
+    # dominated by one that comes after it. So each point only needs to be
+    # compared with the front found so far, which only ever grows.
+    keys = hstack([points, violation, (~feasible)[:, None]])
+    order = lexsort(keys.T)
+
+    front_points = empty(points.shape)
+    front_violation = empty(violation.shape)
+    front_feasible = empty(n_points, dtype=bool)
+    n_front = 0
+
+    result = zeros(n_points, dtype=bool)
+    for i in order:
+        point = points[i]
+        fpoints = front_points[:n_front]
+        better = (fpoints <= point).all(1) & (fpoints < point).any(1)
+
+        if feasible[i]:
+            is_dominated = (better & front_feasible[:n_front]).any()
+        elif front_feasible[:n_front].any():
+            is_dominated = True
+        else:
+            fviol = front_violation[:n_front]
+            less = (fviol <= violation[i]).all(1)
+            same = (fviol == violation[i]).all(1)
+            is_dominated = ((less & ~same) | (same & better)).any()
+
+        if not is_dominated:
+            front_points[n_front] = point
+            front_violation[n_front] = violation[i]
+            front_feasible[n_front] = feasible[i]
+            n_front += 1
+            result[i] = True
+
+    return result
+
+
+def pareto_ranks(points, constraints=None):
+    """Returns the non-domination rank of each row of points. Rank 0 is the
+    Pareto frontier, rank 1 is the frontier of the points left once rank 0
+    is removed, and so on. See nondominated for how constraints are used.
+    """
+    points = _as_points(points)
+    if constraints is not None:
+        constraints = _as_points(constraints).reshape(len(points), -1)
+
+    ranks = -ones(len(points), dtype=int)
+    remaining = where(ranks < 0)[0]
+    rank = 0
+    while len(remaining):
+        cons = None if constraints is None else constraints[remaining]
+        front = nondominated(points[remaining], cons)
+        ranks[remaining[front]] = rank
+        remaining = remaining[~front]
+        rank += 1
+
+    return ranks
+
+
 class ParetoFilter(Component):
     """Takes a set of cases and filters out the subset of cases which are
     pareto optimal. Assumes that smaller values for model responses are
@@ -40,6 +149,14 @@ class ParetoFilter(Component):
     pareto_outcons = Array(
         iotype='out', desc='Array of constraints values in the Pareto frontier')
 
+    rank_cases = Bool(False, iotype='in',
+                      desc='If True, sort all of the cases into successive '
+                      'non-dominated fronts and report them in pareto_ranks.')
+
+    pareto_ranks = Array(iotype='out', dtype=int,
+                         desc='Non-domination rank of every case, where 0 is '
+                         'the Pareto frontier. Only set if rank_cases is True.')
+
     def __init__(self, params=None, responses=None, constraints=None):
         super(ParetoFilter, self).__init__()
 
@@ -92,145 +209,31 @@ class ParetoFilter(Component):
         self.pareto_outputs = zeros((1, len(responses)))
         self.pareto_outcons = zeros((1, len(constraints)))
 
-    def _is_dominated(self, y1, y2):
-        """Tests to see if the point y1 is dominated by the point y2.
-        True if y1 is dominated by y2, False otherwise.
-        """
-        if y1 == y2:
-            return False
-        for a, b in zip(y1, y2):
-            if a is None:
-                return True
-            if b is None:
-                return False
-            if a < b:
-                return False
-
-        return True
-
-    def _is_constrained(self, c1, c2):
-        """ Tests to see if the point c1 is more or less constrained than
-        the point c2.
-        Constrained means value <= 0.0
-        return:
-            isLessConstrained,
-                True if some constraint values are more than c2
-                while the other same, False Otherwise
-            NeedCompareDominating
-                True if need furthermore comparison of dominating
-                False otherwise
-        """
-        c1 = array(c1)
-        c2 = array(c2)
-        b1 = (c1 <= 0).all()
-        b2 = (c2 <= 0).all()
-
-        if b1 and b2:
-            return False, True
-        if b1 and not b2:
-            return False, False
-        if not b1 and b2:
-            return True, False
-        if not b2 and not b1:
-            c1[c1<=0] = 0
-            c2[c2<=0] = 0
-            if (c1 == c2).all():
-                return False, True
-
-            if (c1 >= c2).all():
-                return True, False
-            else:
-                return False, False
-
     def execute(self):
         """Returns an araray of pareto optimal points and their response values.
         """
 
-        first_name = "responses.%s" % self._response_names[0]
-        n_param = len(self._param_names)
-        n_response = len(self._response_names)
-        n_constraint = len(self._constraint_names)
-        n_points = len(self.get(first_name))
-
-        # Get our output data once, then rearrange it after.
-        data = []
-        for varname in self._response_names:
-            name = "responses.%s" % varname
-            val = self.get(name)
-            data.append(val)
-
-        all_points = []
-        for j in xrange(0, n_points):
-            point = []
-            for i in xrange(0, n_response):
-                point.append(data[i][j])
-            all_points.append(point)
-
-        nondominated_output = list(all_points)
-
-        # Optionally, get our inputs data once, then rearrange it after.
-        if n_param > 0:
-
-            data = []
-            for varname in self._param_names:
-                name = "params.%s" % varname
-                val = self.get(name)
-                data.append(val)
-
-            nondominated_input = []
-            for j in xrange(0, n_points):
-                point = []
-                for i in xrange(0, n_param):
-                    point.append(data[i][j])
-                nondominated_input.append(point)
-
-        # Optionally, get our constraint data once, then rearrange it after.
-        if n_constraint > 0:
-
-            data = []
-            for varname in self._constraint_names:
-                name = "constraints.%s" % varname
-                val = self.get(name)
-                data.append(val)
-
-            all_cons = []
-            for j in xrange(0, n_points):
-                point = []
-                for i in xrange(0, n_constraint):
-                    point.append(data[i][j])
-                all_cons.append(point)
-            nondominated_constraint = list(all_cons)
-
-
-            # Find non-dominated points with constraint filtering
-            nd_input_list = []
-            for j, (point1, cons1) in enumerate(zip(all_points, all_cons)):
-                for point2, cons2 in zip(nondominated_output,
-                                  nondominated_constraint):
-                    is_less_cons, need_comp = self._is_constrained(cons1, cons2)
-                    if is_less_cons or \
-                       (need_comp and self._is_dominated(point1, point2)):
-                        nondominated_output.remove(point1)
-                        nondominated_constraint.remove(cons1)
-                        nd_input_list.append(j)
-                        break
+        outputs = [self.get("responses.%s" % name)
+                   for name in self._response_names]
+        outputs = array(outputs).T
+
+        if self._constraint_names:
+            cons = [self.get("constraints.%s" % name)
+                    for name in self._constraint_names]
+            cons = array(cons).T
+            front = nondominated(outputs, cons)
+            self.pareto_outcons = cons[front]
         else:
-            # Find non-dominated points directly
-            nd_input_list = []
-            for j, point1 in enumerate(all_points):
-                for point2 in nondominated_output:
-                    if self._is_dominated(point1, point2):
-                        nondominated_output.remove(point1)
-                        nd_input_list.append(j)
-                        break
-
-        self.pareto_outputs = array(nondominated_output)
-
-        if n_param > 0:
-            data = [nondominated_input[j] for j in xrange(0, n_points) \
-                    if j not in nd_input_list]
-            self.pareto_inputs = array(data)
-        if n_constraint > 0:
-            self.pareto_outcons = array(nondominated_constraint)
+            cons = None
+            front = nondominated(outputs)
+
+        self.pareto_outputs = outputs[front]
+
+        if self._param_names:
+            inputs = [self.get("params.%s" % name)
+                      for name in self._param_names]
+            self.pareto_inputs = array(inputs).T[front]
 
+        if self.rank_cases:
+            self.pareto_ranks = pareto_ranks(outputs, cons)
 
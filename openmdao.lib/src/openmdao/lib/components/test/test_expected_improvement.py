@@ -2,7 +2,10 @@
 
 import unittest
 
+from numpy import array
+
 from openmdao.lib.components.expected_improvement import ExpectedImprovement
+from openmdao.lib.surrogatemodels.kriging_surrogate import KrigingSurrogate
 from openmdao.lib.casehandlers.api import CaseSet, ListCaseIterator
 from openmdao.main.uncertain_distributions import NormalDistribution
 from openmdao.main.case import Case
@@ -25,6 +28,26 @@ class ExpectedImprovementTests(unittest.TestCase):
         self.assertEqual(0,ei.EI)
         self.assertEqual(0,ei.PI)
 
+    def test_score_candidates(self):
+        x = array([[0.05], [.25], [0.61], [0.95]])
+        y = array([0.738513784857542, -0.210367746201974, -0.489015457891476,
+                   12.3033138316612])
+        krig = KrigingSurrogate()
+        krig.train(x, y)
+
+        ei = ExpectedImprovement()
+        ei.target = -0.5
+
+        candidates = array([[0.1], [0.4], [0.5], [0.61], [0.8]])
+        EI, PI = ei.score_candidates(krig, candidates)
+
+        for i, case in enumerate(candidates):
+            ei.current = krig.predict(case)
+            ei.execute()
+            self.assertAlmostEqual(ei.EI, EI[i], 8)
+            self.assertAlmostEqual(ei.PI, PI[i], 8)
+
+
 if __name__ == "__main__":
     unittest.main()
 
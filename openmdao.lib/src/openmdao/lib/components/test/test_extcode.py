@@ -16,6 +16,7 @@ from multiprocessing.managers import RemoteError
 
 from openmdao.main.api import Assembly, FileMetadata, SimulationRoot, set_as_top
 from openmdao.main.eggchecker import check_save_load
+from openmdao.main.exec_cache import ExecCache
 from openmdao.main.exceptions import RunInterrupted
 from openmdao.main.objserverfactory import ObjServerFactory
 from openmdao.main.rbac import Credentials, get_credentials
@@ -65,6 +66,25 @@ class Sleeper(ExternalCode):
         super(Sleeper, self).execute()
 
 
+class Generator(ExternalCode):
+    """ Writes its input file from `x` before running the code. """
+
+    x = Int(1, iotype='in')
+
+    def __init__(self):
+        super(Generator, self).__init__()
+        self.command = ['python', 'sleep.py', '0']
+        self.external_files = [
+            FileMetadata(path='input', input=True),
+        ]
+
+    def execute(self):
+        """ Generate input file and run code. """
+        with open('input', 'w') as out:
+            out.write('%d\n' % self.x)
+        super(Generator, self).execute()
+
+
 class Unique(Sleeper):
     """ Used to test `create_instance_dir` functionality. """
 
@@ -345,6 +365,68 @@ class TestCase(unittest.TestCase):
             if os.path.exists(extcode.stdout):
                 os.remove(extcode.stdout)
 
+    def test_exec_cache(self):
+        logging.debug('')
+        logging.debug('test_exec_cache')
+
+        with open('input', 'w') as out:
+            out.write(INP_DATA)
+
+        extcode = set_as_top(ExternalCode())
+        extcode.command = ['python', 'sleep.py', '0']
+        extcode.exec_cache = ExecCache()
+
+        extcode.run()
+        extcode.run()
+        self.assertEqual(extcode.exec_count, 1)
+        self.assertEqual(extcode.exec_cache.hits, 1)
+        self.assertEqual(extcode.return_code, 0)
+
+        # The command is part of the cache key.
+        extcode.command = ['python', 'sleep.py', '1']
+        extcode.run()
+        self.assertEqual(extcode.exec_count, 2)
+        self.assertEqual(extcode.exec_cache.misses, 2)
+
+        # So is the environment.
+        extcode.env_vars = {'SLEEP_DATA': 'Hello world!'}
+        extcode.run()
+        self.assertEqual(extcode.exec_count, 3)
+        self.assertEqual(extcode.exec_cache.misses, 3)
+        extcode.run()
+        self.assertEqual(extcode.exec_count, 3)
+        self.assertEqual(extcode.exec_cache.hits, 2)
+
+        # And the contents of input files, including pattern matches.
+        extcode.external_files = [FileMetadata(path='*.dat', input=True)]
+        with open('a.dat', 'w') as out:
+            out.write('1\n')
+        extcode.run()
+        extcode.run()
+        self.assertEqual(extcode.exec_count, 4)
+        with open('a.dat', 'w') as out:
+            out.write('2\n')
+        extcode.run()
+        self.assertEqual(extcode.exec_count, 5)
+        with open('b.dat', 'w') as out:
+            out.write('1\n')
+        extcode.run()
+        self.assertEqual(extcode.exec_count, 6)
+
+    def test_exec_cache_generated(self):
+        logging.debug('')
+        logging.debug('test_exec_cache_generated')
+
+        # Input files written by execute() don't defeat the cache.
+        generator = set_as_top(Generator())
+        generator.exec_cache = ExecCache()
+        for x in (1, 2, 1, 2, 1):
+            generator.x = x
+            generator.run()
+        self.assertEqual(generator.exec_count, 2)
+        self.assertEqual(generator.exec_cache.misses, 2)
+        self.assertEqual(generator.exec_cache.hits, 3)
+
     def test_unique(self):
         logging.debug('')
         logging.debug('test_unique')
@@ -1,13 +1,18 @@
 # pylint: disable-msg=C0111,C0103
 
+import os.path
+import shutil
+import tempfile
 import unittest
 
+from numpy import arange
+
 # pylint: disable-msg=F0401,E0611
 from openmdao.main.api import Assembly, set_as_top
 
 from openmdao.main.uncertain_distributions import NormalDistribution
 
-from openmdao.lib.components.metamodel import MetaModel
+from openmdao.lib.components.metamodel import MetaModel, _TrainingData
 from openmdao.lib.surrogatemodels.api import ResponseSurface, \
                   KrigingSurrogate, FloatKrigingSurrogate, LogisticRegression
 
@@ -118,6 +123,100 @@ class MetaModelTestCase(unittest.TestCase):
         assert_rel_error(self, model.meta.y1, 2.0, .00001)
         assert_rel_error(self, model.meta.y2, 4.0, .00001)
 
+    def test_warm_start_incremental(self):
+
+        model = set_as_top(Assembly())
+        model.add('meta', MetaModel(params=('x1', 'x2'),
+                                    responses=('y1', 'y2')))
+        model.driver.workflow.add('meta')
+        model.meta.default_surrogate = FloatKrigingSurrogate()
+        model.meta.warm_restart = True
+        model.meta.refit_interval = 0
+
+        model.meta.params.x1 = [1.0, 3.0, 4.0]
+        model.meta.params.x2 = [1.0, 4.0, 2.0]
+        model.meta.responses.y1 = [3.0, 1.0, 0.5]
+        model.meta.responses.y2 = [1.0, 7.0, 6.0]
+
+        model.meta.x1 = 2.0
+        model.meta.x2 = 3.0
+        model.meta.run()
+        thetas = model.meta._get_surrogate('y1').thetas.copy()
+
+        # The new point is added without refitting thetas, and the
+        # surrogate still interpolates all of the training data.
+
+        model.meta.params.x1 = [2.0]
+        model.meta.params.x2 = [3.0]
+        model.meta.responses.y1 = [2.0]
+        model.meta.responses.y2 = [4.0]
+
+        model.meta.run()
+        surrogate = model.meta._get_surrogate('y1')
+        self.assertEqual(surrogate.n, 4)
+        self.assertTrue((surrogate.thetas == thetas).all())
+        assert_rel_error(self, model.meta.y1, 2.0, .00001)
+        assert_rel_error(self, model.meta.y2, 4.0, .00001)
+
+        model.meta.x1 = 1.0
+        model.meta.x2 = 1.0
+        model.meta.run()
+        assert_rel_error(self, model.meta.y1, 3.0, .00001)
+        assert_rel_error(self, model.meta.y2, 1.0, .00001)
+
+    def test_training_data(self):
+
+        data = _TrainingData(2, capacity=2)
+        data.append(arange(6.).reshape(3, 2))
+        data.append(arange(6., 20.).reshape(7, 2))
+
+        self.assertEqual(len(data), 10)
+        self.assertEqual(len(data._buf), 16)
+        self.assertEqual(data.array.shape, (10, 2))
+        self.assertTrue((data.array.ravel() == arange(20.)).all())
+
+        data.clear()
+        data.append([[1., 2.]])
+        self.assertEqual(data.array.tolist(), [[1., 2.]])
+
+    def test_training_file(self):
+
+        tmpdir = tempfile.mkdtemp()
+        try:
+            model = set_as_top(Assembly())
+            model.add('meta', MetaModel(params=('x1', 'x2'),
+                                        responses=('y1', 'y2')))
+            model.driver.workflow.add('meta')
+            model.meta.default_surrogate = ResponseSurface()
+            model.meta.warm_restart = True
+            model.meta.training_file = os.path.join(tmpdir, 'train')
+
+            model.meta.params.x1 = [1.0, 3.0]
+            model.meta.params.x2 = [1.0, 4.0]
+            model.meta.responses.y1 = [3.0, 1.0]
+            model.meta.responses.y2 = [1.0, 7.0]
+            model.meta.run()
+
+            self.assertTrue(os.path.exists(os.path.join(tmpdir,
+                                                        'train.params')))
+            self.assertTrue(os.path.exists(os.path.join(tmpdir,
+                                                        'train.responses')))
+
+            model.meta.params.x1 = [2.0]
+            model.meta.params.x2 = [3.0]
+            model.meta.responses.y1 = [2.0]
+            model.meta.responses.y2 = [4.0]
+
+            model.meta.x1 = 2.0
+            model.meta.x2 = 3.0
+            model.meta.run()
+            assert_rel_error(self, model.meta.y1, 2.0, .00001)
+            assert_rel_error(self, model.meta.y2, 4.0, .00001)
+            self.assertEqual(model.meta._param_data.array.tolist(),
+                             [[1.0, 1.0], [3.0, 4.0], [2.0, 3.0]])
+        finally:
+            shutil.rmtree(tmpdir, ignore_errors=True)
+
     def test_multi_surrogate_models_bad_surrogate_dict(self):
 
         model = set_as_top(Assembly())
@@ -65,7 +65,11 @@ class MultiFiMetaModelTestCase(unittest.TestCase):
                 
         expected_xtrain=[ [0.0], [0.4], [1.0] ]
         expected_ytrain=[ 3.02720998, 0.11477697, 15.82973195 ]               
-        mock_surr.train.assert_called_with(expected_xtrain, expected_ytrain)        
+        # MetaModel trains on float arrays.
+        self.assertEqual(mock_surr.train.call_count, 1)
+        xtrain, ytrain = mock_surr.train.call_args[0]
+        self.assertEqual(xtrain.tolist(), expected_xtrain)
+        self.assertEqual(ytrain.tolist(), expected_ytrain)
 
         model.meta.x = 0.5
         model.meta.run()
@@ -2,7 +2,8 @@
 
 import unittest
 
-from openmdao.lib.components.pareto_filter import ParetoFilter
+from openmdao.lib.components.pareto_filter import ParetoFilter, \
+                                                  nondominated, dominated
 
 
 class ParetoFilterTests(unittest.TestCase):
@@ -59,7 +60,36 @@ class ParetoFilterTests(unittest.TestCase):
         self.assertEqual(1, pf.pareto_outcons[0, 0])
         self.assertTrue(pf.pareto_outcons.shape == (1, 1))
 
+    def test_ranks(self):
+        pf = ParetoFilter(responses=('x', 'y'))
+        pf.responses.x = [1,1,2,2,2,3,3,3,]
+        pf.responses.y = [2,3,1,2,3,1,2,3]
+        pf.rank_cases = True
+        pf.execute()
 
+        self.assertEqual([0, 1, 0, 1, 2, 1, 2, 3], list(pf.pareto_ranks))
+
+    def test_nondominated(self):
+        points = [[1, 2], [2, 1], [2, 2], [1, 2], [0, 3]]
+        self.assertEqual([True, True, False, True, True],
+                         list(nondominated(points)))
+
+        # Feasible points dominate infeasible ones, and smaller violations
+        # dominate larger ones.
+        cons = [[1], [-1], [-1], [0.5], [0.5]]
+        self.assertEqual([False, True, False, False, False],
+                         list(nondominated(points, cons)))
+        cons = [[1], [2], [1], [0.5], [0.5]]
+        self.assertEqual([False, False, False, True, True],
+                         list(nondominated(points, cons)))
+
+    def test_dominated(self):
+        front = [[1, 1], [0, 2]]
+        points = [[2, 2], [1, 3], [1, 1], [0, 1], [1, 2]]
+        self.assertEqual([True, True, False, False, True],
+                         list(dominated(points, front)))
+        self.assertEqual([True, True, False, False, False],
+                         list(dominated(points, front, strict=True)))
 
 
 if __name__ == "__main__":
@@ -8,6 +8,8 @@ import tempfile
 import shutil
 import unittest
 
+import numpy
+
 from openmdao.lib.datatypes.domain import read_plot3d_q, write_plot3d_q, \
                                           read_plot3d_f, write_plot3d_f, \
                                           read_plot3d_shape, write_plot3d_grid
@@ -111,6 +113,42 @@ class TestCase(unittest.TestCase):
                       globals(), locals(), AttributeError,
                       "zone xyzzy flow_solution is missing ['froboz']")
 
+    def test_memmap(self):
+        logging.debug('')
+        logging.debug('test_memmap')
+
+        logger = logging.getLogger()
+        domain = create_wedge_3d((30, 20, 10), 5., 0.5, 2., 30.)
+        wedge2 = create_wedge_3d((29, 19, 9), 5., 2.5, 4., 30.)
+        domain.add_domain(wedge2)
+        write_plot3d_q(domain, 'unformatted.xyz', 'unformatted.q',
+                       logger=logger)
+        expected = read_plot3d_q('unformatted.xyz', 'unformatted.q',
+                                 logger=logger)
+
+        mapped = read_plot3d_q('unformatted.xyz', 'unformatted.q',
+                               logger=logger, memmap=True)
+        zone = mapped.zone_2
+        self.assertTrue(isinstance(zone.grid_coordinates.z, numpy.memmap))
+        self.assertTrue(isinstance(zone.flow_solution.momentum.y,
+                                   numpy.memmap))
+        self.assertTrue(zone.grid_coordinates.x.flags['F_CONTIGUOUS'])
+        self.assertEqual(zone.shape, (29, 19, 9))
+        self.assertTrue(mapped.is_equivalent(expected, logger=logger))
+
+        # Big-endian binary.
+        write_plot3d_q(domain, 'be-binary.xyz', 'be-binary.q', logger=logger,
+                       big_endian=True, unformatted=False)
+        mapped = read_plot3d_q('be-binary.xyz', 'be-binary.q', logger=logger,
+                               big_endian=True, unformatted=False,
+                               memmap=True)
+        self.assertTrue(mapped.is_equivalent(expected, logger=logger))
+
+        assert_raises(self, "read_plot3d_q('unformatted.xyz', 'unformatted.q',"
+                            " binary=False, memmap=True)",
+                      globals(), locals(), ValueError,
+                      'memmap requires binary data')
+
     def test_q_2d(self):
         logging.debug('')
         logging.debug('test_q_2d')
@@ -1,9 +1,11 @@
-import csv
+import numpy
 
 from openmdao.main.datatypes.api import Int, Str
 from openmdao.main.interfaces import implements, IDOEgenerator
 from openmdao.main.api import Container
 
+from openmdao.lib.casehandlers.util import csv_blocks
+
 
 class CSVFile(Container):
     """
@@ -28,11 +30,35 @@ class CSVFile(Container):
 
     def _next_row(self):
         """ Generate float values from CSV file. """
-        inp = open(self.doe_filename, 'rb')
+        for values in self.blocks():
+            for row in values.tolist():
+                yield row
+
+    def blocks(self, block_size=1000):
+        """
+        Generate 2-D float arrays of up to `block_size` rows from the CSV
+        file, for drivers which can run a batch of cases at once.
+        """
+        with open(self.doe_filename, 'rb') as inp:
+            for lineno, rows in csv_blocks(inp, block_size):
+                yield self._check(rows, lineno)
+
+    def _check(self, rows, lineno):
+        """
+        Return array of values in `rows`, which start after line `lineno`.
+        """
         num_params = self.num_parameters
-        for i, row in enumerate(csv.reader(inp)):
+        if isinstance(rows, numpy.ndarray):
+            if num_params and rows.shape[1] == num_params:
+                return rows
+            rows = rows.tolist()
+
+        values = []
+        for i, row in enumerate(rows):
             if len(row) != num_params:
                 raise RuntimeError('%s line %d: expected %d parameters, got %d'
-                                   % (self.doe_filename, i + 1,
+                                   % (self.doe_filename, lineno + i + 1,
                                       num_params, len(row)))
-            yield [float(val) for val in row]
+            values.append([float(val) for val in row])
+        return numpy.array(values, dtype=float).reshape((len(values),
+                                                         num_params))
@@ -18,18 +18,20 @@
 # <http://www.gnu.org/licenses/>.
 
 import logging
-from random import randint, shuffle, seed
+import os
+import random
+import time
+from multiprocessing import Pool
 
 # pylint: disable-msg=E0611,F0401
-from numpy import array, size, sum, floor, zeros
-from numpy.linalg import norm
+from numpy import array, arange, floor, zeros, inf, ix_
 
-from openmdao.main.datatypes.api import Int, Enum
+from openmdao.main.datatypes.api import Int, Enum, Float
 from openmdao.main.interfaces import implements, IDOEgenerator
 from openmdao.main.api import Container
 
 
-def rand_latin_hypercube(n, k, edges=False):
+def rand_latin_hypercube(n, k, edges=False, rand=None):
     """
     Calculates a random Latin hypercube set of n points in k
     dimensions within [0,1]^k hypercube.
@@ -42,14 +44,19 @@ def rand_latin_hypercube(n, k, edges=False):
        If Edges=True, the extreme bins will have their centres on the
        edges of the domain; otherwise the bins will be entirely
        contained within the domain (default setting).
+    rand: random.Random (optional)
+       Random number generator to use. The global one from the random
+       module is used by default.
 
     Returns an n by k numpy array.
     """
+    rand = rand or random
+
     #generate nxk array of random numbers from the list of range(n) choices
     X = zeros((n, k))
     row = range(1, n+1)
     for i in range(k):
-        shuffle(row)
+        rand.shuffle(row)
         X[:,i] = row
 
     if edges:
@@ -71,6 +78,19 @@ def is_latin_hypercube(lh):
     return True
 
 
+def _distances(doe, rows, p):
+    """Returns the p-norm distances from each of the given rows of the DOE
+    to every row, with inf for the distance from a row to itself."""
+
+    dist = zeros((len(rows), doe.shape[0]))
+    for col in doe.T:
+        dist += abs(col[rows, None] - col)**p
+    dist **= 1.0/p
+    dist[arange(len(rows)), rows] = inf
+
+    return dist
+
+
 class LHC_indivudal(object):
 
     def __init__(self, doe, q=2, p=1):
@@ -79,6 +99,15 @@ class LHC_indivudal(object):
         self.doe = doe
         self.phi = None # Morris-Mitchell sampling criterion
 
+        # Matrix of distance**-q between every pair of points, the sum of
+        # its upper triangle, and for an individual made by perturb, the
+        # parent and changed rows it can be updated from.
+        self._psi = None
+        self._phi_q = None
+        self._parent = None
+        self._rows = None
+        self._psi_rows = None
+
     @property
     def shape(self):
         """Size of the LatinHypercube DOE (rows,cols)."""
@@ -88,47 +117,68 @@ class LHC_indivudal(object):
         """Returns the Morris-Mitchell sampling criterion for this Latin hypercube."""
 
         if self.phi is None:
-            n,m = self.doe.shape
-            distdict = {}
+            if self._parent is None:
+                n = self.doe.shape[0]
+                self._psi = _distances(self.doe, arange(n), self.p)**(-self.q)
+                self._phi_q = self._psi.sum()/2.
+            else:
+                # Only the rows swapped by perturb moved, so just replace
+                # the terms for the pairs that include one of them.
+                rows = self._rows
+                psi = self._parent._get_psi()
+                old = psi[rows].sum() - psi[ix_(rows, rows)].sum()/2.
 
-            #calculate the norm between each pair of points in the DOE
-            # TODO: This norm takes up the majority of the computation time. It
-            # should be converted to C or ShedSkin.
-            arr = self.doe
-            for i in range(n):
-                for j in range(i+1, n):
-                    nrm = norm(arr[i]-arr[j], ord=self.p)
-                    distdict[nrm] = distdict.get(nrm, 0) + 1
+                self._psi_rows = _distances(self.doe, rows, self.p)**(-self.q)
+                new = self._psi_rows.sum() - \
+                      self._psi_rows[:, rows].sum()/2.
 
-            distinct_d = array(distdict.keys())
+                self._phi_q = self._parent._phi_q - old + new
 
-            #mutltiplicity array with a count of how many pairs of points have a given distance
-            J = array(distdict.values())
-
-            self.phi = sum(J*(distinct_d**(-self.q)))**(1.0/self.q)
+            self.phi = self._phi_q**(1.0/self.q)
 
         return self.phi
 
-    def perturb(self, mutation_count):
+    def _get_psi(self):
+        """Returns the distance**-q matrix, building it from the parent's
+        if this individual was made by perturb."""
+
+        self.mmphi()
+        if self._psi is None:
+            rows = self._rows
+            self._psi = self._parent._get_psi().copy()
+            self._psi[rows] = self._psi_rows
+            self._psi[:, rows] = self._psi_rows.T
+            self._parent = self._psi_rows = None
+
+        return self._psi
+
+    def perturb(self, mutation_count, rand=None):
         """ Interchanges pairs of randomly chosen elements within randomly chosen
         columns of a DOE a number of times. The result of this operation will also
         be a Latin hypercube.
         """
+        rand = rand or random
+
         new_doe = self.doe.copy()
         n,k = self.doe.shape
+        rows = set()
         for count in range(mutation_count):
-            col = randint(0, k-1)
+            col = rand.randint(0, k-1)
 
             #choosing two distinct random points
-            el1 = randint(0, n-1)
-            el2 = randint(0, n-1)
+            el1 = rand.randint(0, n-1)
+            el2 = rand.randint(0, n-1)
             while el1==el2:
-                el2 = randint(0, n-1)
+                el2 = rand.randint(0, n-1)
 
-            new_doe[el1, col] = self.doe[el2, col]
-            new_doe[el2, col] = self.doe[el1, col]
+            new_doe[el1, col], new_doe[el2, col] = \
+                new_doe[el2, col], new_doe[el1, col]
+            rows.update((el1, el2))
 
-        return LHC_indivudal(new_doe, self.q, self.p)
+        child = LHC_indivudal(new_doe, self.q, self.p)
+        child._parent = self
+        child._rows = array(sorted(rows))
+        return child
 
     def __iter__(self):
         return self._get_rows()
@@ -174,13 +224,12 @@ class LatinHypercube(Container):
 
     def __iter__(self):
         """Return an iterator over our sets of input values."""
-        if self.seed is not None:
-            seed(self.seed)
-
         return self._get_input_values()
 
     def _get_input_values(self):
-        rand_doe = rand_latin_hypercube(self.num_samples, self.num_parameters)
+        rand = random.Random(self.seed) if self.seed is not None else random
+        rand_doe = rand_latin_hypercube(self.num_samples, self.num_parameters,
+                                        rand=rand)
 
         for row in rand_doe:
             yield row
@@ -208,6 +257,16 @@ class OptLatinHypercube(Container):
                     "for repeatable results; otherwise leave as None for truly "
                     "random seeding.")
 
+    num_procs = Int(1, low=1,
+        desc="Number of processes used to run the optimizations for each "
+             "value of q in parallel.")
+    max_time = Float(0.0, low=0.0, units='s',
+        desc="Time limit for the whole optimization. The best DOE found so "
+             "far is used when it runs out. 0 means no limit.")
+    max_evals = Int(0, low=0,
+        desc="Maximum number of candidate DOEs evaluated in the "
+             "optimization for each value of q. 0 means no limit.")
+
 
     def __init__(self, num_samples=None, population=None,generations=None):
         super(OptLatinHypercube,self).__init__()
@@ -222,17 +281,40 @@ class OptLatinHypercube(Container):
 
     def __iter__(self):
         """Return an iterator over our sets of input values."""
-        if self.seed is not None:
-            seed(self.seed)
         return self._get_input_values()
 
     def _get_input_values(self):
-        rand_doe = rand_latin_hypercube(self.num_samples, self.num_parameters)
-        best_lhc = LHC_indivudal(rand_doe, q=1, p=_norm_map[self.norm_method])
+        rand = random.Random(self.seed) if self.seed is not None else random
+        rand_doe = rand_latin_hypercube(self.num_samples, self.num_parameters,
+                                        rand=rand)
+        p = _norm_map[self.norm_method]
+        best_lhc = LHC_indivudal(rand_doe, q=1, p=p)
+
+        # Each q gets its own seed, so the result doesn't depend on how many
+        # processes run the optimizations.
+        num_procs = min(self.num_procs, len(self.qs))
+        if self.max_time:
+            rounds = -(-len(self.qs) // num_procs)
+            time_limit = self.max_time/rounds
+        else:
+            time_limit = None
+
+        args = [(rand_doe, q, p, self.population, self.generations,
+                 rand.randint(0, 2**31), time_limit, self.max_evals or None)
+                for q in self.qs]
+
+        if num_procs > 1 and hasattr(os, 'fork'):
+            pool = Pool(num_procs)
+            try:
+                does = pool.map(_optimize_q, args)
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            does = [_optimize_q(arg) for arg in args]
 
-        for q in self.qs:
-            lh = LHC_indivudal(rand_doe, q, _norm_map[self.norm_method])
-            lh_opt = _mmlhs(lh, self.population, self.generations)
+        for q, doe in zip(self.qs, does):
+            lh_opt = LHC_indivudal(doe, q, p)
             if lh_opt.mmphi() < best_lhc.mmphi():
                 best_lhc = lh_opt
 
@@ -240,13 +322,31 @@ class OptLatinHypercube(Container):
             yield row
 
 
-def _mmlhs(x_start, population, generations):
+def _optimize_q(args):
+    """Runs _mmlhs for one value of q and returns the optimized DOE array.
+    Called in a worker process when the optimizations run in parallel."""
+
+    doe, q, p, population, generations, seed, time_limit, max_evals = args
+
+    deadline = None if time_limit is None else time.time() + time_limit
+    lh = LHC_indivudal(doe, q, p)
+    lh_opt = _mmlhs(lh, population, generations, random.Random(seed),
+                    deadline, max_evals)
+
+    return lh_opt.doe
+
+
+def _mmlhs(x_start, population, generations, rand=None, deadline=None,
+           max_evals=None):
     """Evolutionary search for most space filling Latin-Hypercube.
     Returns a new LatinHypercube instance with an optimized set of points.
+    The search stops early once time.time() passes the deadline or max_evals
+    candidates have been evaluated.
     """
     x_best = x_start
     phi_best = x_start.mmphi()
     n = x_start.shape[1]
+    evals = 0
 
     level_off = floor(0.85*generations)
     for it in range(generations):
@@ -260,8 +360,13 @@ def _mmlhs(x_start, population, generations):
         phi_improved = phi_best
 
         for offspring in range(population):
-            x_try = x_best.perturb(mutations)
+            if (deadline is not None and time.time() > deadline) or \
+               (max_evals is not None and evals >= max_evals):
+                break
+
+            x_try = x_best.perturb(mutations, rand)
             phi_try = x_try.mmphi()
+            evals += 1
 
             if phi_try < phi_improved:
                 x_improved = x_try
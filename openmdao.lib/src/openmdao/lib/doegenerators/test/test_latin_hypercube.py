@@ -7,6 +7,7 @@ import unittest
 import random
 
 from numpy import array, zeros
+from numpy.linalg import norm
 
 from openmdao.main.api import Assembly, Component, Case, set_as_top
 from openmdao.lib.doegenerators.optlh import LHC_indivudal, OptLatinHypercube, _mmlhs, \
@@ -24,6 +25,34 @@ class TestCase(unittest.TestCase):
         self.assertTrue(is_latin_hypercube(lh_opt))
         self.assertTrue(opt_phi < phi1)
         
+    def test_mmphi_perturb(self):
+        rand = random.Random(3)
+        for p in (1, 2):
+            lh = LHC_indivudal(rand_latin_hypercube(12, 3, rand=rand), 5, p)
+            child = lh.perturb(3, rand).perturb(2, rand)
+
+            phi = 0.
+            for i in range(12):
+                for j in range(i+1, 12):
+                    phi += norm(child[i]-child[j], ord=p)**-5
+            self.assertAlmostEqual(child.mmphi(), phi**(1./5), places=10)
+            self.assertTrue(is_latin_hypercube(child))
+
+    def test_max_evals(self):
+        lh = LHC_indivudal(rand_latin_hypercube(10,2), 2, 1)
+        lh_opt = _mmlhs(lh, 20, 20, max_evals=0)
+        self.assertTrue(lh_opt is lh)
+
+    def test_seed(self):
+        olh = OptLatinHypercube(num_samples=10)
+        olh.num_parameters = 3
+        olh.seed = 5
+        doe1 = array(list(olh))
+        olh.num_procs = 2
+        doe2 = array(list(olh))
+        self.assertTrue((doe1 == doe2).all())
+        self.assertTrue(is_latin_hypercube(doe1))
+
     def test_OptLatinHypercube(self):
         olh = OptLatinHypercube()
         olh.num_samples = 10
@@ -3,26 +3,31 @@
 
 """
 
+import copy
+import cPickle
 from cStringIO import StringIO
 import gc
+import hashlib
 import logging
 import os.path
 import Queue
 import sys
 import thread
 import threading
+import time
 from uuid import uuid1, getnode
+import zipfile
 
 from numpy import array
 
-from openmdao.main.api import Driver, VariableTree
+from openmdao.main.api import Assembly, Container, Driver, VariableTree
 from openmdao.main.datatypes.api import Bool, Dict, Enum, Int
 from openmdao.main.exceptions import traceback_str, exception_str
 from openmdao.main.expreval import ExprEvaluator
 from openmdao.main.hasparameters import HasVarTreeParameters
 from openmdao.main.hasresponses import HasVarTreeResponses
 from openmdao.main.interfaces import IHasParameters, IHasResponses, implements
-from openmdao.main.rbac import get_credentials, set_credentials
+from openmdao.main.rbac import get_credentials, set_credentials, rbac
 from openmdao.main.resource import ResourceAllocationManager as RAM
 from openmdao.main.resource import LocalAllocator
 from openmdao.main.variable import is_legal_name, make_legal_path
@@ -79,6 +84,13 @@ class _Case(object):
         else:
             self.uuid = _Case.next_uuid()
         self.parent_uuid = str(parent_uuid)  # identifier of parent case, if any
+        self.start_time = None  # Set by CaseScheduler.
+
+    def clone(self):
+        """ Return a copy of this case for speculative re-execution. """
+        case = copy.copy(self)
+        case.exc = None
+        return case
 
     def _register_expr(self, name):
         """
@@ -91,10 +103,11 @@ class _Case(object):
                 self._exprs = {}
             self._exprs[name] = expr
 
-    def apply_inputs(self, scope, parent):
+    def apply_inputs(self, scope, parent=None):
         """
         Take the values of all of the inputs in this case and apply them
-        to the specified scope.
+        to the specified scope. If `parent` is given, its vectors are
+        updated from `scope`.
         """
         for name, value in self._inputs.items():
             if self._exprs is None:
@@ -106,7 +119,8 @@ class _Case(object):
             else:
                 scope.set(name, value)
 
-        parent._system.vec.get('u').set_from_scope(scope)
+        if parent is not None:
+            parent._system.vec.get('u').set_from_scope(scope)
 
 
     def fetch_outputs(self, scope, extra=False, itername=''):
@@ -183,6 +197,278 @@ class _ServerData(object):
         self.queue = None       # Queue to put requests.
         self.in_use = False     # True if being used.
         self.load_failures = 0  # Load failure count.
+        self.cases = None       # Current batch of cases being evaluated.
+        self.results = None     # Results from the current batch.
+
+
+class CaseScheduler(object):
+    """
+    Orders the cases of a :class:`CaseIteratorDriver` and tracks how long
+    they take. Cases expected to take longest are started first, using the
+    times of cases with the same index in earlier executions. A remote case
+    running for more than `straggler_factor` times its expected time is
+    duplicated on an idle server and the first result is used. Times
+    are also passed to the :class:`ResourceAllocationManager` per host,
+    so later allocations favor faster hosts.
+
+    Override :meth:`expected_time` to supply other estimates.
+
+    straggler_factor: float
+        Ratio of elapsed to expected time at which a case is duplicated.
+
+    poll_interval: float
+        Seconds between checks for stragglers once all cases have started.
+
+    smoothing: float
+        Weight given to earlier times when updating the history.
+    """
+
+    def __init__(self, straggler_factor=2., poll_interval=1., smoothing=0.5):
+        self.straggler_factor = straggler_factor
+        self.poll_interval = poll_interval
+        self.smoothing = smoothing
+        self.stats = {}
+        self._history = {}  # Smoothed times keyed by case index.
+        self.reset()
+
+    def reset(self):
+        """ Prepare for a new set of cases. """
+        self._running = {}  # [case, copies, speculated] keyed by case index.
+        self._done = set()
+        self._times = []
+        self._hosts = {}    # [count, total time] keyed by host.
+        self._speculative = 0
+        self._speculative_used = 0
+        self._start_time = time.time()
+
+    def expected_time(self, case):
+        """ Return the expected time for `case`, or None if unknown. """
+        return self._history.get(case.index)
+
+    def order(self, cases):
+        """ Return `cases` sorted by decreasing expected time. """
+        known = [t for t in (self.expected_time(case) for case in cases)
+                 if t is not None]
+        default = sum(known) / len(known) if known else 0.
+        def _key(case):
+            expected = self.expected_time(case)
+            return -(default if expected is None else expected)
+        return sorted(cases, key=_key)
+
+    def started(self, case):
+        """ Note that `case` (or a copy of it) has been started. """
+        case.start_time = time.time()
+        entry = self._running.get(case.index)
+        if entry is None:
+            self._running[case.index] = [case, 1, False]
+        else:
+            entry[1] += 1
+            self._speculative += 1
+
+    def finished(self, case, host, ok, share=1):
+        """
+        Note that `case` has finished on `host`, successfully if `ok`.
+        `share` is the number of cases run in the same request.
+        Returns False if the result should be ignored because it is from
+        a copy of a case which finished elsewhere, or is a failure while
+        other copies are still running.
+        """
+        entry = self._running.get(case.index)
+        if entry is None or case.index in self._done:
+            return False
+        entry[1] -= 1
+        if not ok:
+            if entry[1] > 0:
+                return False
+            del self._running[case.index]
+            return True
+
+        del self._running[case.index]
+        self._done.add(case.index)
+        if entry[0] is not case:
+            self._speculative_used += 1
+
+        elapsed = (time.time() - case.start_time) / share
+        self._times.append(elapsed)
+        old = self._history.get(case.index)
+        if old is not None:
+            elapsed_avg = self.smoothing * old + (1. - self.smoothing) * elapsed
+        else:
+            elapsed_avg = elapsed
+        self._history[case.index] = elapsed_avg
+
+        counts = self._hosts.setdefault(host or 'local', [0, 0.])
+        counts[0] += 1
+        counts[1] += elapsed
+        if host:
+            RAM.record_time(host, elapsed, self.smoothing)
+        return True
+
+    def has_straggler(self):
+        """ Return True if some running case is worth duplicating. """
+        return self._find_straggler() is not None
+
+    def claim_straggler(self):
+        """
+        Return the running case which is most overdue, or None.
+        A case is only returned once, since a copy of it is assumed to
+        be started.
+        """
+        entry = self._find_straggler()
+        if entry is None:
+            return None
+        entry[2] = True
+        return entry[0]
+
+    def _find_straggler(self):
+        """ Return the entry of the most overdue running case, or None. """
+        if self._times:
+            times = sorted(self._times)
+            median = times[len(times) // 2]
+        else:
+            median = None
+
+        now = time.time()
+        worst = None
+        for entry in self._running.values():
+            case, copies, speculated = entry
+            if speculated:
+                continue
+            expected = self.expected_time(case) or median
+            if not expected:
+                continue
+            overdue = (now - case.start_time) / expected
+            if overdue > self.straggler_factor and \
+               (worst is None or overdue > worst[0]):
+                worst = (overdue, entry)
+        return None if worst is None else worst[1]
+
+    def report(self):
+        """ Update :attr:`stats` and return them as a printable summary. """
+        hosts = {}
+        for host, (count, total) in self._hosts.items():
+            hosts[host] = count / total if total else 0.
+        times = sorted(self._times)
+        self.stats = {
+            'cases': len(self._done),
+            'elapsed': time.time() - self._start_time,
+            'min_time': times[0] if times else 0.,
+            'median_time': times[len(times) // 2] if times else 0.,
+            'max_time': times[-1] if times else 0.,
+            'speculative': self._speculative,
+            'speculative_used': self._speculative_used,
+            'throughput': hosts,
+        }
+
+        stats = self.stats
+        lines = ['%d cases in %.2f sec' % (stats['cases'], stats['elapsed']),
+                 '    case time min %.3g, median %.3g, max %.3g'
+                 % (stats['min_time'], stats['median_time'],
+                    stats['max_time']),
+                 '    speculative runs %d, used %d'
+                 % (stats['speculative'], stats['speculative_used'])]
+        for host in sorted(hosts):
+            lines.append('    %s: %.3g cases/sec' % (host, hosts[host]))
+        return '\n'.join(lines)
+
+
+def _model_checksum(egg_file, model, skip, targets):
+    """
+    Return a checksum identifying the model saved in `egg_file`, based on
+    the egg's modules, the structure of `model` (components, connections,
+    and workflow order), and the input values of `model`, excluding those
+    whose path starts with `skip` and the parameter `targets` which are set
+    by each case. The egg's metadata and saved state differ between
+    otherwise identical models, so they are not used.
+    """
+    md5 = hashlib.md5()
+    egg = zipfile.ZipFile(egg_file)
+    try:
+        for name in sorted(egg.namelist()):
+            if name.startswith('EGG-INFO/') or name.endswith('.pickle'):
+                continue
+            md5.update(name)
+            md5.update(egg.read(name))
+    finally:
+        egg.close()
+
+    md5.update(repr(_model_structure(model)))
+
+    for name, value in sorted(model.items(recurse=True, iotype='in')):
+        if name.startswith(skip) or name in targets or \
+           isinstance(value, Container):
+            continue
+        md5.update(name)
+        try:
+            md5.update(cPickle.dumps(value, 2))
+        except Exception:
+            md5.update(repr(value))
+    return md5.hexdigest()
+
+
+def _model_structure(asm):
+    """
+    Return the component types, connections, and workflow order of `asm`
+    and its sub-assemblies.
+    """
+    structure = [sorted(asm.list_connections())]
+    for name in sorted(asm.list_containers()):
+        obj = asm.get(name)
+        structure.append((name, '%s.%s' % (type(obj).__module__,
+                                           type(obj).__name__)))
+        if isinstance(obj, Driver):
+            structure.append(list(obj.workflow._explicit_names))
+        elif isinstance(obj, Assembly):
+            structure.append(_model_structure(obj))
+    return structure
+
+
+def _remote_exc(msg):
+    """ Return a sys.exc_info() tuple for an error message from a server. """
+    if not msg:
+        return None
+    try:
+        raise RuntimeError(msg)
+    except RuntimeError:
+        return sys.exc_info()
+
+
+class _CaseRunner(Driver):
+    """
+    Driver for replicated models which can run a batch of cases per request,
+    avoiding a round trip per input set and output fetch.
+    """
+
+    @rbac(('owner', 'user'))
+    def run_cases(self, indices, uuids, inputs, outputs, extra_outputs,
+                  itername, rec_itername):
+        """
+        Run the cases described by `indices`, `uuids` and `inputs` and
+        return a list of ``(run_msg, data, data_msg, extra, extra_msg)``,
+        one per case, where the messages are empty unless there was an error.
+        """
+        top = self.parent
+        results = []
+        for i, index in enumerate(indices):
+            case = _Case(index, inputs[i], outputs, extra_outputs,
+                         case_uuid=uuids[i])
+            # Vectors only exist once the model has been run.
+            parent = self if getattr(self, '_system', None) is not None \
+                          else None
+            try:
+                case.apply_inputs(top, parent)
+                top.set_itername(itername, index+1)
+                top.run(case_uuid=case.uuid)
+            except Exception as exc:
+                results.append((str(exc) or repr(exc), [], '', [], ''))
+                continue
+
+            data, exc = case.fetch_outputs(top)
+            extra, extra_exc = case.fetch_outputs(top, extra=True,
+                                                  itername=rec_itername)
+            results.append(('', data, exc and str(exc[1]) or '',
+                            extra, extra_exc and str(extra_exc[1]) or ''))
+        return results
 
 
 
@@ -238,6 +524,22 @@ class CaseIteratorDriver(Driver):
         self._rerun = []  # Cases that failed and should be retried.
         self._generation = 0  # Used to keep worker names unique.
 
+        # Number of cases sent to a remote server per request.
+        self.batch_size = 1
+
+        # Optional CaseScheduler for ordering and speculative execution.
+        self.scheduler = None
+
+        # If True, servers are returned to the ResourceAllocationManager's
+        # pool after execution, so later executions can reuse them and any
+        # model they have loaded. A loaded model is reused only if its
+        # modules, structure, and non-parameter inputs are unchanged.
+        self.keep_servers = False
+        self._egg_checksum = None
+
+        # Response values, copied to ``case_outputs`` after the run.
+        self._case_values = {}
+
         # var wasn't showing up in parent depgraph without this
         self.error_policy = 'ABORT'
 
@@ -288,6 +590,10 @@ class CaseIteratorDriver(Driver):
                 self._logger.info('Start concurrent evaluation.')
                 self._start()
         finally:
+            self._store_outputs()
+            if self.scheduler is not None:
+                self._logger.info('Case statistics: %s',
+                                  self.scheduler.report())
             self._cleanup()
 
         if self._abort_exc is not None:
@@ -325,12 +631,23 @@ class CaseIteratorDriver(Driver):
             # various workflow quantities.
             replicant = self.parent.copy()
             workflow = replicant.get(self.name+'.workflow')
-            driver = replicant.add('driver', Driver())
+            driver = replicant.add('driver', _CaseRunner())
             workflow.parent = driver
             workflow.scope = None
             replicant.driver.workflow = workflow
             egg_info = replicant.save_to_egg(self.name, version,
                                              need_requirements=need_reqs)
+            if self.keep_servers:
+                targets = set()
+                for path in self.get_parameters():
+                    if isinstance(path, tuple):
+                        targets.update(path)
+                    else:
+                        targets.add(path)
+                self._egg_checksum = _model_checksum(egg_info[0], replicant,
+                                                     self.name+'.', targets)
+            else:
+                self._egg_checksum = None
             replicant = workflow = driver = None  # Release objects.
             gc.collect()  # Collect/compact before possible fork.
 
@@ -360,7 +677,13 @@ class CaseIteratorDriver(Driver):
                 inputs.append((inp_paths[j], inp_values[j][i]))
             cases.append(_Case(i, inputs, outputs, extra_outputs,
                                parent_uuid=self._case_uuid))
+        if self.scheduler is not None:
+            self.scheduler.reset()
+            cases = self.scheduler.order(cases)
         self.init_responses(length)
+        self._case_values = dict((make_legal_path(path),
+                                  [float('NaN')] * length)
+                                 for path in outputs)
 
         self._iter = iter(cases)
         self._abort_exc = None
@@ -453,6 +776,7 @@ class CaseIteratorDriver(Driver):
                     server.in_use = self._server_ready(server)
 
         # Continue until no servers are busy.
+        waited = 0.
         while self._busy():
             if self._more_to_go():
                 timeout = None
@@ -461,10 +785,20 @@ class CaseIteratorDriver(Driver):
                 # This has happened with a server that got 'lost'
                 # in RAM.allocate()
                 timeout = 60
+            poll = None
+            if timeout and self.scheduler is not None:
+                # Wake up periodically to look for stragglers.
+                poll = min(self.scheduler.poll_interval, timeout - waited)
             try:
-                name, result, exc = self._reply_q.get(timeout=timeout)
+                name, result, exc = self._reply_q.get(timeout=poll or timeout)
             # Hard to force worker to hang, which is handled here.
             except Queue.Empty:  # pragma no cover
+                if poll:
+                    waited += poll
+                    if waited < timeout:
+                        self._revive_idle()
+                        continue
+                waited = 0.
                 msgs = []
                 for name, server in self._servers.items():
                     if server.in_use:
@@ -483,6 +817,7 @@ class CaseIteratorDriver(Driver):
                     for msg in msgs:
                         self._logger.error('    %s', msg)
             else:
+                waited = 0.
                 server = self._servers[name]
                 server.in_use = self._server_ready(server)
 
@@ -507,6 +842,13 @@ class CaseIteratorDriver(Driver):
                 self._logger.warning('Timeout waiting for %r to shut-down.',
                                      server.name)
 
+    def _revive_idle(self):
+        """ Restart idle servers to duplicate any straggling cases. """
+        for server in self._servers.values():
+            if not server.in_use and server.state == _EMPTY and \
+               server.queue is not None and self._has_straggler(server):
+                server.in_use = self._server_ready(server)
+
     def _busy(self):
         """ Return True while at least one server is in use. """
         for server in self._servers.values():
@@ -514,6 +856,13 @@ class CaseIteratorDriver(Driver):
                 return True
         return False
 
+    def _store_outputs(self):
+        """ Copy the response values collected during the run to
+        ``case_outputs``. """
+        for path, values in self._case_values.items():
+            self.set('case_outputs.'+path, values)
+        self._case_values = {}
+
     def _cleanup(self):
         """
         Cleanup internal state, and egg file if necessary.
@@ -564,39 +913,32 @@ class CaseIteratorDriver(Driver):
                         in_use = False
 
         elif state == _EXECUTING:
-            case = server.case
-            server.case = None
-            if server.exception is None:
-                # Grab the results from the model and record.
-                try:
-                    self._record_case(server.top, case)
-                except Exception as exc:
-                    msg = 'Exception recording case: %s' % exc
-                    self._logger.debug('    %s', msg)
-                    self._logger.debug('%s', case)
-                    case.msg = '%s: %s' % (self.get_pathname(), msg)
+            if server.cases is not None:
+                self._batch_done(server)
             else:
-                self._logger.debug('    exception while executing: %r', server.exception[1])
-                case.exc = server.exception
-
-            if case.exc is not None:
-                if self.error_policy == 'ABORT':
-                    if self._abort_exc is None:
-                        self._abort_exc = case.exc
-                    self._stop = True
-                elif case.retries < self.max_retries:
-                    case.exc = None
-                    case.retries += 1
-                    self._rerun.append(case)
+                case = server.case
+                server.case = None
+                if self.scheduler is None or \
+                   self.scheduler.finished(case, self._host(server),
+                                           server.exception is None):
+                    if server.exception is None:
+                        # Grab the results from the model and record.
+                        self._save_case(server.top, case)
+                    else:
+                        self._logger.debug('    exception while executing: %r',
+                                           server.exception[1])
+                        case.exc = server.exception
+                    self._check_case(case)
                 else:
-                    self._logger.error('Too many retries for %s', case)
+                    self._logger.debug('    ignoring result of case %d',
+                                       case.index)
 
             # Set up for next case.
             in_use = self._start_processing(server, reload=True)
 
         elif state == _EMPTY:
             if server.name is None or server.queue is not None:
-                if self._more_to_go():
+                if self._more_to_go() or self._has_straggler(server):
                     if server.queue is not None:
                         self._logger.debug('    load_model')
                         server.load_failures = 0
@@ -624,6 +966,54 @@ class CaseIteratorDriver(Driver):
 
         return in_use
 
+    def _batch_done(self, server):
+        """ Record the results of the batch of cases run by `server`. """
+        cases = server.cases
+        results = server.results
+        server.cases = server.results = None
+        for i, case in enumerate(cases):
+            if self.scheduler is not None:
+                ok = server.exception is None and not results[i][0]
+                self.scheduler.finished(case, self._host(server), ok,
+                                        len(cases))
+            if server.exception is not None:
+                case.exc = server.exception
+            else:
+                run_msg, data, data_msg, extra, extra_msg = results[i]
+                if run_msg:
+                    self._logger.debug('    exception while executing: %s',
+                                       run_msg)
+                    case.exc = _remote_exc(run_msg)
+                else:
+                    fetched = (data, _remote_exc(data_msg),
+                               extra, _remote_exc(extra_msg))
+                    self._save_case(server.top, case, fetched)
+            self._check_case(case)
+
+    def _save_case(self, scope, case, fetched=None):
+        """ Record `case`, logging any problem. """
+        try:
+            self._record_case(scope, case, fetched)
+        except Exception as exc:
+            msg = 'Exception recording case: %s' % exc
+            self._logger.debug('    %s', msg)
+            self._logger.debug('%s', case)
+            case.msg = '%s: %s' % (self.get_pathname(), msg)
+
+    def _check_case(self, case):
+        """ Apply the error policy if `case` failed. """
+        if case.exc is not None:
+            if self.error_policy == 'ABORT':
+                if self._abort_exc is None:
+                    self._abort_exc = case.exc
+                self._stop = True
+            elif case.retries < self.max_retries:
+                case.exc = None
+                case.retries += 1
+                self._rerun.append(case)
+            else:
+                self._logger.error('Too many retries for %s', case)
+
     def _more_to_go(self):
         """ Return True if there's more work to do. """
         if self._stop:
@@ -639,7 +1029,7 @@ class CaseIteratorDriver(Driver):
         If there's something to do, start processing by either loading
         the model, or going straight to running it.
         """
-        if self._more_to_go():
+        if self._more_to_go() or self._has_straggler(server):
             if server.name is None:
                 in_use = self._start_next_case(server)
             elif reload:
@@ -664,6 +1054,13 @@ class CaseIteratorDriver(Driver):
     def _start_next_case(self, server):
         """ Look for the next case and start it. """
 
+        if self.batch_size > 1 and server.queue is not None:
+            cases = self._next_cases(self.batch_size)
+            if cases:
+                return self._run_batch(cases, server)
+            self._logger.debug('    no more cases')
+            return False
+
         if self._todo:
             self._logger.debug('    run startup case')
             case = self._todo.pop(0)
@@ -673,21 +1070,79 @@ class CaseIteratorDriver(Driver):
             case = self._rerun.pop(0)
             in_use = self._run_case(case, server)
         elif self._iter is None:
-            self._logger.debug('    no more cases')
-            in_use = False
+            in_use = self._run_straggler(server)
         else:
             try:
                 case = self._iter.next()
             except StopIteration:
-                self._logger.debug('    no more cases')
                 self._iter = None
-                in_use = False
+                in_use = self._run_straggler(server)
             else:
                 self._logger.debug('    run next case')
                 in_use = self._run_case(case, server)
 
         return in_use
 
+    def _has_straggler(self, server):
+        """ Return True if a running case is worth duplicating on `server`. """
+        if self.scheduler is None or server.queue is None or \
+           self.batch_size > 1 or self._stop:
+            return False
+        return self.scheduler.has_straggler()
+
+    def _run_straggler(self, server):
+        """ Start a copy of an overdue case. Returns True if started. """
+        case = None
+        if self._has_straggler(server):
+            case = self.scheduler.claim_straggler()
+        if case is None:
+            # Leave the server where _revive_idle can find it.
+            self._logger.debug('    no more cases')
+            server.state = _EMPTY
+            return False
+        self._logger.debug('    speculative rerun of case %d', case.index)
+        return self._run_case(case.clone(), server)
+
+    @staticmethod
+    def _host(server):
+        """ Return host name for `server`, None if local. """
+        if server.info is None:
+            return None
+        return server.info.get('host')
+
+    def _next_cases(self, count):
+        """ Return up to `count` cases from startup, retry and new cases. """
+        cases = []
+        while len(cases) < count:
+            if self._todo:
+                cases.append(self._todo.pop(0))
+            elif self._rerun:
+                cases.append(self._rerun.pop(0))
+            elif self._iter is None:
+                break
+            else:
+                try:
+                    cases.append(self._iter.next())
+                except StopIteration:
+                    self._iter = None
+        return cases
+
+    def _run_batch(self, cases, server):
+        """ Start a batch of cases in a remote server. Returns True. """
+        self._logger.debug('    run %d cases', len(cases))
+        for case in cases:
+            case.exc = None
+            case.uuid = _Case.next_uuid()
+            case.parent_uuid = self._case_uuid
+            if self.scheduler is not None:
+                self.scheduler.started(case)
+
+        server.cases = cases
+        server.exception = None
+        server.queue.put((self._remote_batch_execute, server))
+        server.state = _EXECUTING
+        return True
+
     def _run_case(self, case, server):
         """ Setup and start a case. Returns True if started. """
         case.exc = None
@@ -707,24 +1162,31 @@ class CaseIteratorDriver(Driver):
                 self._rerun.append(case)
             return self._start_processing(server)
 
+        if self.scheduler is not None:
+            self.scheduler.started(case)
         server.case = case
         self._model_execute(server)
         server.state = _EXECUTING
         return True
 
-    def _record_case(self, scope, case):
+    def _record_case(self, scope, case, fetched=None):
         """
         Record case data from `scope` in ``case_outputs``.
         Also sends case data to recorders.
+        `fetched` is an optional ``(outputs, exc, extra, extra_exc)``
+        tuple of data already fetched from `scope`.
         """
-        case_outputs, exc = case.fetch_outputs(scope)
+        if fetched is None:
+            case_outputs, exc = case.fetch_outputs(scope)
+        else:
+            case_outputs, exc, extra, extra_exc = fetched
         if exc is None and case.exc is None:
             index = case.index
             for path, value in case_outputs:
                 path = make_legal_path(path)
                 if self.sequential and isinstance(value, VariableTree):
                     value = value.copy()
-                self.set('case_outputs.%s[%d]'%(path,index), value)
+                self._case_values[path][index] = value
 
         # Record workflow data in recorders.
         workflow = self.workflow
@@ -746,8 +1208,9 @@ class CaseIteratorDriver(Driver):
                     outputs.append(value)
 
             itername = '%s.workflow.itername' % self.name
-            extra, extra_exc = case.fetch_outputs(scope, extra=True,
-                                                  itername=itername)
+            if fetched is None:
+                extra, extra_exc = case.fetch_outputs(scope, extra=True,
+                                                      itername=itername)
             for path, value in extra:
                 if self.sequential and isinstance(value, VariableTree):
                     value = value.copy()
@@ -771,15 +1234,20 @@ class CaseIteratorDriver(Driver):
         """ Each server has an associated thread executing this. """
         set_credentials(credentials)
 
-        server, server_info = RAM.allocate(resource_desc)
+        keep_server = self.keep_servers
+        if keep_server:
+            server, server_info = RAM.allocate_pooled(resource_desc)
+        else:
+            server, server_info = RAM.allocate(resource_desc)
         # Just being defensive, this should never happen.
         if server is None:  # pragma no cover
             self._logger.error('Server allocation for %r failed :-(', name)
             reply_q.put((name, False, None))
             return
         else:
-            # Clear egg re-use indicator.
-            server_info['egg_file'] = None
+            if not keep_server:
+                # Clear egg re-use indicator.
+                server_info['egg_file'] = None
             self._logger.debug('%r using %r', name, server_info['name'])
             if self._logger.level == logging.NOTSET:
                 # By default avoid lots of protocol messages.
@@ -818,7 +1286,10 @@ class CaseIteratorDriver(Driver):
                 self._logger.error('%r: %r', name, exc)
         finally:
             self._logger.debug('%r releasing server', name)
-            RAM.release(server)
+            if keep_server:
+                RAM.release_pooled(server)
+            else:
+                RAM.release(server)
             reply_q.put((name, True, None))  # ACK shutdown.
 
     def _load_model(self, server):
@@ -829,8 +1300,17 @@ class CaseIteratorDriver(Driver):
 
     def _remote_load_model(self, server):
         """ Load model into remote server. """
-        egg_file = server.info.get('egg_file', None)
-        if egg_file is None or egg_file is not self._egg_file:
+        info = server.info
+        checksum = self._egg_checksum
+        if checksum is not None and info.get('egg_checksum') == checksum:
+            # A pooled server which already has this model.
+            if server.top is None and not self.reload_model and \
+               info.get('model') is not None:
+                self._logger.debug('server %r reusing loaded model',
+                                   server.name)
+                server.top = info['model']
+                return
+        elif info.get('egg_file', None) is not self._egg_file:
             # Only transfer if changed.
             try:
                 filexfer(None, self._egg_file,
@@ -843,17 +1323,21 @@ class CaseIteratorDriver(Driver):
                 server.exception = sys.exc_info()
                 return
             else:
-                server.info['egg_file'] = self._egg_file
+                info['egg_file'] = self._egg_file
+                info['egg_checksum'] = checksum
+        egg_file = info['egg_file']
         try:
-            tlo = server.server.load_model(self._egg_file)
+            tlo = server.server.load_model(egg_file)
         # Difficult to force load error.
         except Exception as exc:  # pragma nocover
             self._logger.error('server.load_model of %r failed: %r',
-                               self._egg_file, exc)
+                               egg_file, exc)
             server.top = None
             server.exception = sys.exc_info()
+            info['egg_checksum'] = info['model'] = None
         else:
             server.top = tlo
+            info['model'] = tlo
 
     def _model_execute(self, server):
         """ Execute model in server. """
@@ -879,3 +1363,20 @@ class CaseIteratorDriver(Driver):
                                ' PID %d on %s: %r',
                                server.info['name'], server.info['pid'],
                                server.info['host'], exc)
+
+    def _remote_batch_execute(self, server):
+        """ Execute a batch of cases in remote server. """
+        cases = server.cases
+        try:
+            server.results = server.top.driver.run_cases(
+                [case.index for case in cases],
+                [case.uuid for case in cases],
+                [case._inputs.items() for case in cases],
+                cases[0]._outputs, cases[0]._extra_outputs,
+                self.get_itername(), '%s.workflow.itername' % self.name)
+        except Exception as exc:
+            server.exception = sys.exc_info()
+            self._logger.error('Caught exception from server %r,'
+                               ' PID %d on %s: %r',
+                               server.info['name'], server.info['pid'],
+                               server.info['host'], exc)
@@ -24,12 +24,15 @@ from numpy import asarray, linspace, mean
 from openmdao.main.api import Assembly, Component, VariableTree, set_as_top, \
                               SimulationRoot
 from openmdao.main.eggchecker import check_save_load
+from openmdao.main.resource import ResourceAllocationManager as RAM
 
 from openmdao.main.datatypes.api import Float, Bool, Array, Int, Str, \
                                         List, VarTree
 from openmdao.lib.casehandlers.api import ListCaseRecorder
 from openmdao.lib.drivers.api import CaseIteratorDriver, SimpleCaseIterDriver, \
                                      SLSQPdriver
+from openmdao.lib.drivers.caseiterdriver import CaseScheduler, _Case, \
+                                            _model_structure
 
 from openmdao.main.case import Case, CaseTreeNode
 
@@ -132,6 +135,20 @@ class TracedComponent(Component):
         self.itername = self.get_itername()
 
 
+class SlowOnce(Component):
+    """ Slow the first time case 0 is run, fast for any copy of it. """
+
+    x = Float(iotype='in')
+    marker = Str(iotype='in')
+    y = Float(iotype='out')
+
+    def execute(self):
+        if self.x == 0 and not os.path.exists(self.marker):
+            open(self.marker, 'w').close()
+            time.sleep(5)
+        self.y = 2. * self.x
+
+
 class CIDriver(CaseIteratorDriver):
 
     def __init__(self, max_iterations, comp_name):
@@ -241,6 +258,143 @@ class TestCase(unittest.TestCase):
         self.run_cases(sequential=False, forced_errors=True, retry=False)
         self.run_cases(sequential=False, forced_errors=True, retry=True)
 
+    def test_concurrent_batch(self):
+        logging.debug('')
+        logging.debug('test_concurrent_batch')
+        init_cluster(encrypted=True, allow_shell=True)
+        self.model.driver.batch_size = 3
+        self.run_cases(sequential=False)
+
+    def test_concurrent_batch_errors(self):
+        logging.debug('')
+        logging.debug('test_concurrent_batch_errors')
+        init_cluster(encrypted=True, allow_shell=True)
+        self.model.driver.batch_size = 3
+        self.generate_cases(force_errors=True)
+        self.run_cases(sequential=False, forced_errors=True, retry=True)
+
+    def test_keep_servers(self):
+        logging.debug('')
+        logging.debug('test_keep_servers')
+        init_cluster(encrypted=True, allow_shell=True)
+        driver = self.model.driver
+        driver.keep_servers = True
+        driver.reload_model = False
+        try:
+            self.run_cases(sequential=False)
+            self.assertTrue(RAM.pooled_servers() > 0)
+            checksum = driver._egg_checksum
+            self.assertTrue(checksum)
+
+            # Second run reuses the pooled servers.
+            self.generate_cases()
+            self.run_cases(sequential=False)
+            self.assertTrue(RAM.pooled_servers() > 0)
+            self.assertEqual(driver._egg_checksum, checksum)
+        finally:
+            RAM.drain_pool()
+        self.assertEqual(RAM.pooled_servers(), 0)
+
+        # Structural changes alter the checksum.
+        structure = _model_structure(self.model)
+        self.model.add('driven2', DrivenComponent())
+        driver.workflow.add('driven2')
+        structure2 = _model_structure(self.model)
+        self.assertNotEqual(structure2, structure)
+        self.model.connect('driven.sum_y', 'driven2.sleep')
+        self.assertNotEqual(_model_structure(self.model), structure2)
+
+    def test_scheduler(self):
+        logging.debug('')
+        logging.debug('test_scheduler')
+        scheduler = CaseScheduler()
+        self.model.driver.scheduler = scheduler
+        self.run_cases(sequential=True)
+        self.assertEqual(scheduler.stats['cases'], 10)
+        self.assertEqual(scheduler.stats['speculative'], 0)
+        self.assertEqual(scheduler.stats['throughput'].keys(), ['local'])
+
+        # Case 7 is now known to be slow, so it's run first.
+        scheduler._history[7] = 10.
+        cases = [_Case(i, [], [], []) for i in range(10)]
+        self.assertEqual(scheduler.order(cases)[0].index, 7)
+
+        # Results are the same when run in a different order.
+        self.run_cases(sequential=True)
+
+    def test_straggler(self):
+        logging.debug('')
+        logging.debug('test_straggler')
+        scheduler = CaseScheduler(straggler_factor=2.)
+        scheduler.reset()
+        cases = [_Case(i, [], [], []) for i in range(3)]
+        for case in cases:
+            scheduler.started(case)
+        self.assertFalse(scheduler.has_straggler())
+        self.assertEqual(scheduler.claim_straggler(), None)
+
+        cases[0].start_time -= 1.
+        self.assertTrue(scheduler.finished(cases[0], None, True))
+        scheduler._times = [1.]
+        cases[1].start_time -= 3.
+        self.assertTrue(scheduler.has_straggler())
+        self.assertTrue(scheduler.has_straggler())  # Checking doesn't claim.
+        self.assertTrue(scheduler.claim_straggler() is cases[1])
+        self.assertFalse(scheduler.has_straggler())  # Only once.
+        self.assertEqual(scheduler.claim_straggler(), None)
+
+        # First copy to finish is used.
+        copy = cases[1].clone()
+        scheduler.started(copy)
+        self.assertTrue(scheduler.finished(copy, 'host', True))
+        self.assertFalse(scheduler.finished(cases[1], 'host', True))
+
+        # A failure is ignored while another copy is running.
+        copy = cases[2].clone()
+        scheduler.started(copy)
+        self.assertFalse(scheduler.finished(copy, 'host', False))
+        self.assertTrue(scheduler.finished(cases[2], 'host', False))
+
+        scheduler.report()
+        self.assertEqual(scheduler.stats['cases'], 2)
+        self.assertEqual(scheduler.stats['speculative'], 2)
+        self.assertEqual(scheduler.stats['speculative_used'], 1)
+
+    def test_speculative(self):
+        logging.debug('')
+        logging.debug('test_speculative')
+        init_cluster(encrypted=True, allow_shell=True)
+
+        # Need two servers, so one can run a copy of the slow case.
+        local = RAM.get_allocator('LocalHost')
+        total_cpus = local.total_cpus
+        local.total_cpus = max(total_cpus, 2)
+        try:
+            model = set_as_top(Assembly())
+            model.add('comp', SlowOnce())
+            driver = model.add('driver', CaseIteratorDriver())
+            driver.workflow.add('comp')
+            driver.add_parameter('comp.x')
+            driver.add_parameter('comp.marker')
+            driver.add_response('comp.y')
+            driver.sequential = False
+            driver.scheduler = CaseScheduler(straggler_factor=2.,
+                                             poll_interval=0.1)
+
+            marker = os.path.join(self.tempdir, 'marker')
+            driver.case_inputs.comp.x = range(4)
+            driver.case_inputs.comp.marker = [marker] * 4
+            model.run()
+        finally:
+            local.total_cpus = total_cpus
+
+        # The copy of case 0 finished first, and its result was used.
+        stats = driver.scheduler.stats
+        self.assertEqual(stats['cases'], 4)
+        self.assertEqual(stats['speculative'], 1)
+        self.assertEqual(stats['speculative_used'], 1)
+        self.assertEqual(driver.case_outputs.comp.y, [0., 2., 4., 6.])
+
     def test_unencrypted(self):
         logging.debug('')
         logging.debug('test_unencrypted')
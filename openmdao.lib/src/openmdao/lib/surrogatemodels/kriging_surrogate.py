@@ -1,11 +1,15 @@
 """ Surrogate model based on Kriging. """
-from math import log, e, sqrt
+import os
+from math import log
+from multiprocessing import Pool
 
 # pylint: disable-msg=E0611,F0401
-from numpy import array, zeros, dot, ones, eye, abs, vstack, exp, \
-                  sum, log10
-from numpy.linalg import det, linalg, lstsq
-from scipy.linalg import cho_factor, cho_solve
+from numpy import array, zeros, dot, ones, eye, abs, vstack, hstack, exp, \
+                  sum, log10, sqrt, atleast_2d, triu_indices, diag, triu
+from numpy import log as nplog
+from numpy.linalg import det, linalg, lstsq, pinv
+from numpy.random import RandomState
+from scipy.linalg import cho_factor, cho_solve, solve_triangular, cholesky
 from scipy.optimize import minimize
 
 from openmdao.main.api import Container
@@ -13,6 +17,67 @@ from openmdao.main.interfaces import implements, ISurrogate
 from openmdao.main.uncertain_distributions import NormalDistribution
 
 
+def _correlation(thetas, dist, n, nugget):
+    """Returns the correlation matrix R of n training points for the given
+    thetas, along with the off-diagonal correlation of each pair of points
+    in the upper triangle. Each row of dist holds the squared distances
+    between one pair of points along every input dimension."""
+
+    r = exp(-dot(dist, thetas))*(1.0 - nugget)
+
+    i, j = triu_indices(n, 1)
+    R = eye(n)
+    R[i, j] = r
+    R[j, i] = r
+
+    return R, r
+
+
+def _neg_log_likelihood(log10t, dist, Y, nugget):
+    """Returns the negative concentrated log likelihood of the Kriging model
+    for the given log10 thetas, along with its analytic gradient."""
+
+    n = len(Y)
+    thetas = 10.**log10t
+    R, r = _correlation(thetas, dist, n, nugget)
+
+    try:
+        R_fact = cho_factor(R)
+        Rinv = cho_solve(R_fact, eye(n))
+        detR = exp(2.*sum(nplog(diag(R_fact[0]))))
+    except (linalg.LinAlgError, ValueError):
+        Rinv = pinv(R)
+        detR = det(R)
+
+    one = ones(n)
+    Rinv_one = dot(Rinv, one)
+    mu = dot(Rinv_one, Y)/dot(one, Rinv_one)
+    alpha = dot(Rinv, Y - mu)
+    sig2 = dot(Y - mu, alpha)/n
+
+    nll = n/2.*log(sig2) + 1./2.*log(abs(detR + 1.e-16))
+
+    # dR/dtheta_k is -dist_k*r for each pair, so only the upper triangle of
+    # Rinv and alpha*alpha' is needed.
+    i, j = triu_indices(n, 1)
+    W = (alpha[i]*alpha[j]/sig2 - detR/(detR + 1.e-16)*Rinv[i, j])*r
+    grad = log(10.)*thetas*dot(W, dist)
+
+    return nll, grad
+
+
+def _fit_thetas(args):
+    """Returns the negative log likelihood and the log10 thetas found by
+    L-BFGS-B from one starting point. Called in a worker process when fits
+    from several starting points run in parallel."""
+
+    x0, dist, Y, nugget, bounds = args
+    result = minimize(_neg_log_likelihood, x0, args=(dist, Y, nugget),
+                      jac=True, method='L-BFGS-B', bounds=bounds)
+
+    return result.fun, result.x
+
+
 class KrigingSurrogate(Container):
     """Surrogate Modeling method based on the simple Kriging interpolation.
     Predictions are returned as a NormalDistribution instance."""
@@ -26,12 +91,18 @@ class KrigingSurrogate(Container):
         self.n = None       # number of training points
         self.thetas = None
         self.nugget = 0     # nugget smoothing parameter from [Sasena, 2002]
+        self.n_start = 1    # number of starting points for fitting thetas
+        self.n_procs = 1    # number of processes used for those fits
 
         self.R = None
         self.R_fact = None
         self.mu = None
         self.log_likelihood = None
 
+        self.alpha = None           # R^-1 (Y - mu)
+        self.Rinv_one = None        # R^-1 one
+        self.one_Rinv_one = None
+
     def get_uncertain_value(self, value):
         """Returns a NormalDistribution centered around the value, with a
         standard deviation of 0."""
@@ -41,55 +112,52 @@ class KrigingSurrogate(Container):
         """Calculates a predicted value of the response based on the current
         trained model for the supplied list of inputs.
         """
+        f, RMSE = KrigingSurrogate.predict_many(self, [new_x])
+
+        dist = NormalDistribution(f[0], RMSE[0])
+        return dist
+
+    def predict_many(self, X_new):
+        """Calculates predicted values of the response for many points at
+        once. Each row of the 2D array X_new is one set of inputs.
+
+        Returns a tuple containing an array of the predicted means and an
+        array of their root mean squared errors.
+        """
         if self.m is None:  # untrained surrogate
             raise RuntimeError("KrigingSurrogate has not been trained, so no "
                                "prediction can be made")
-        r = zeros(self.n)
-        X, Y = self.X, self.Y
+
+        X_new = atleast_2d(array(X_new, dtype=float))
+        XX = array(self.X, dtype=float)
         thetas = 10.**self.thetas
-        XX = array(X)
-        new_x = array(new_x)
-        for i in range(self.n):
-            r[i] = sum(thetas*(XX[i] - new_x)**2.)
+
+        # Correlation between every new point and every training point.
+        r = zeros((X_new.shape[0], self.n))
+        for k in range(self.m):
+            r += thetas[k]*(X_new[:, k:k+1] - XX[:, k])**2.
         r = exp(-r)
 
-        one = ones(self.n)
+        f = self.mu + dot(r, self.alpha)
+
         if self.R_fact is not None:
             #---CHOLESKY DECOMPOSTION ---
-            #f = self.mu+dot(r,cho_solve(self.R_fact,Y-dot(one,self.mu)))
-            #term1 = dot(r,cho_solve(self.R_fact,r))
-            #term2 = (1.0-dot(one,cho_solve(self.R_fact,r)))**2./dot(one,cho_solve(self.R_fact,one))
-
-            rhs = vstack([(Y-dot(one, self.mu)), r, one]).T
-            R_fact = (self.R_fact[0].T, not self.R_fact[1])
-            cho = cho_solve(R_fact, rhs).T
-
-            f = self.mu + dot(r, cho[0])
-            term1 = dot(r, cho[1])
-            term2 = (1.0 - dot(one, cho[1]))**2./dot(one, cho[2])
-
+            # r' R^-1 r is the squared norm of r with one triangular factor
+            # of R solved out.
+            c, lower = self.R_fact
+            z = solve_triangular(c, r.T, trans=0 if lower else 1, lower=lower,
+                                 check_finite=False)
+            term1 = sum(z**2., 0)
         else:
             #-----LSTSQ-------
-            rhs = vstack([(Y-dot(one, self.mu)), r, one]).T
-            lsq = lstsq(self.R.T, rhs)[0].T
+            term1 = sum(r.T*lstsq(self.R, r.T)[0], 0)
+
+        term2 = (1.0 - dot(r, self.Rinv_one))**2./self.one_Rinv_one
 
-            f = self.mu + dot(r, lsq[0])
-            term1 = dot(r, lsq[1])
-            term2 = (1.0 - dot(one, lsq[1]))**2./dot(one, lsq[2])
-            """
-      #-----LSTSQ-------
-      rhs = vstack([(Y-dot(one, self.mu)), r, one]).T
-      lsq = lstsq(self.R.T, rhs)[0].T
-
-      f = self.mu + dot(r, lsq[0])
-      term1 = dot(r, lsq[1])
-      term2 = (1.0 - dot(one, lsq[1]))**2./dot(one, lsq[2])
-      """
         MSE = self.sig2*(1.0 - term1 + term2)
         RMSE = sqrt(abs(MSE))
 
-        dist = NormalDistribution(f, RMSE)
-        return dist
+        return f, RMSE
 
     def train(self, X, Y):
         """Train the surrogate model with the given set of inputs and outputs."""
@@ -108,45 +176,127 @@ class KrigingSurrogate(Container):
         self.m = len(X[0])
         self.n = len(X)
 
-        thetas = zeros(self.m)
-        #print "initial guess", thetas
+        # Squared distances between every pair of training points along
+        # each dimension. These don't change while fitting thetas.
+        XX = array(X, dtype=float)
+        i, j = triu_indices(self.n, 1)
+        self._dist = (XX[i] - XX[j])**2.
+
+        YY = array(Y, dtype=float)
+        bounds = [(log10(1e-2), log10(3))]*self.m
+
+        # The first fit always starts from thetas of 1.0. Any others start
+        # from reproducible random points inside the bounds.
+        starts = [zeros(self.m)]
+        rand = RandomState(0)
+        for _ in xrange(self.n_start - 1):
+            starts.append(rand.uniform(bounds[0][0], bounds[0][1], self.m))
+
+        args = [(x0, self._dist, YY, self.nugget, bounds) for x0 in starts]
+        if self.n_procs > 1 and len(args) > 1 and hasattr(os, 'fork'):
+            pool = Pool(min(self.n_procs, len(args)))
+            try:
+                fits = pool.map(_fit_thetas, args)
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            fits = [_fit_thetas(arg) for arg in args]
+
+        self.thetas = min(fits, key=lambda fit: fit[0])[1]
+        #print self.thetas
+        self._calculate_log_likelihood()
+        self._calculate_predictor()
+
+    def train_incremental(self, X_new, Y_new):
+        """Add new training points to an already trained model without
+        refitting thetas. The Cholesky factor of R is extended with the rows
+        for the new points, so the update costs O(n^2) per point rather than
+        the O(n^3) of a full factorization. Call train to refit thetas."""
+
+        if self.m is None:
+            self.train(X_new, Y_new)
+            return
+
+        # Callers may have kept appending to the training data they gave us,
+        # so only the first n rows are the old data.
+        XX = array(self.X[:self.n], dtype=float)
+        X_new = atleast_2d(array(X_new, dtype=float))
+        n_old = self.n
+
+        self.X = vstack([XX, X_new])
+        self.Y = hstack([array(self.Y[:n_old], dtype=float),
+                         array(Y_new, dtype=float)])
+        self.n = len(self.X)
+
+        i, j = triu_indices(self.n, 1)
+        self._dist = (self.X[i] - self.X[j])**2.
+
+        thetas = 10.**self.thetas
+        R, r = _correlation(thetas, self._dist, self.n, self.nugget)
+
+        if self.R_fact is None:
+            self._calculate_log_likelihood()
+            self._calculate_predictor()
+            return
+
+        # Upper triangular U with R = U'U. cho_factor leaves garbage in the
+        # other triangle, so clear it before extending.
+        c, lower = self.R_fact
+        U = c.T if lower else c
+        U = triu(U)
 
-        def _calcll(thetas):
-            ''' Callback function'''
-            self.thetas = thetas
+        try:
+            W = solve_triangular(U, R[:n_old, n_old:], trans=1)
+            U22 = cholesky(R[n_old:, n_old:] - dot(W.T, W))
+        except (linalg.LinAlgError, ValueError):
             self._calculate_log_likelihood()
-            return -self.log_likelihood
+            self._calculate_predictor()
+            return
+
+        U_new = zeros((self.n, self.n))
+        U_new[:n_old, :n_old] = U
+        U_new[:n_old, n_old:] = W
+        U_new[n_old:, n_old:] = U22
 
-        #if self.thetas == None:
-        #self.thetas = fmin(_calcll, thetas, disp=False, ftol=0.0001)
-        def lowerBound(log10t):
-            return log10t - log10(self.thetas)
+        self.R = R
+        self.R_fact = (U_new, False)
 
-        def upperBound(log10t):
-            return log10(self.thetas) - log10t
+        Y = self.Y
+        one = ones(self.n)
+        cho = cho_solve(self.R_fact, vstack([Y, one]).T).T
+        self.mu = dot(one, cho[0])/dot(one, cho[1])
+        ymdotone = Y - dot(one, self.mu)
+        self.sig2 = dot(ymdotone, cho_solve(self.R_fact, ymdotone))/self.n
+        self.log_likelihood = -self.n/2.*log(self.sig2) - \
+                              sum(nplog(diag(U_new)))
 
-        cons = []
-        for i in xrange(self.m):
-            cons.append({'type': 'ineq', 'fun': lambda log10t: log10t[i] - log10(1e-2)})  # min
-            cons.append({'type': 'ineq', 'fun': lambda log10t: log10(3) - log10t[i]})     # max
+        self._calculate_predictor()
 
-        self.thetas = minimize(_calcll, thetas, method='COBYLA', constraints=cons, tol=1e-8).x
-        #print self.thetas
-        self._calculate_log_likelihood()
+    def _calculate_predictor(self):
+        """Caches the solves against R that every prediction needs, so that
+        the predicted mean costs O(n) per point."""
+
+        one = ones(self.n)
+        rhs = vstack([array(self.Y) - dot(one, self.mu), one]).T
+
+        if self.R_fact is not None:
+            sol = cho_solve(self.R_fact, rhs).T
+        else:
+            sol = lstsq(self.R, rhs)[0].T
+
+        self.alpha = sol[0]
+        self.Rinv_one = sol[1]
+        self.one_Rinv_one = dot(one, sol[1])
 
     def _calculate_log_likelihood(self):
         #if self.m == None:
         #    Give error message
-        R = zeros((self.n, self.n))
-        X, Y = array(self.X), array(self.Y)
+        Y = array(self.Y)
         thetas = 10.**self.thetas
 
         #weighted distance formula
-        for i in range(self.n):
-            R[i, i+1:self.n] = e**(-sum(thetas*(X[i] - X[i+1:self.n])**2., 1))
-
-        R = R*(1.0 - self.nugget)
-        R = R + R.T + eye(self.n)
+        R, r = _correlation(thetas, self._dist, self.n, self.nugget)
         self.R = R
 
         one = ones(self.n)
@@ -186,6 +336,12 @@ class FloatKrigingSurrogate(KrigingSurrogate):
         dist = super(FloatKrigingSurrogate, self).predict(new_x)
         return dist.mu
 
+    def predict_many(self, X_new):
+        """Returns an array of the predicted means for every point (row)
+        in X_new."""
+        f, RMSE = super(FloatKrigingSurrogate, self).predict_many(X_new)
+        return f
+
     def get_uncertain_value(self, value):
         """Returns a float"""
         return float(value)
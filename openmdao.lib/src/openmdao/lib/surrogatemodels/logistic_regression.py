@@ -30,6 +30,9 @@ class LogisticRegression(Container):
         
         self.degenerate = False
         
+        self._X_train = None #unscaled training data, kept for train_incremental
+        self._Y_train = None
+        
         if X is not None and Y is not None: 
             self.train(X,Y)
             
@@ -57,6 +60,9 @@ class LogisticRegression(Container):
         """ Define the gradient and hand it off to a scipy gradient-based
         optimizer. """
         
+        self._X_train = np.array(X, dtype=float)
+        self._Y_train = np.array(Y, dtype=float)
+        
         #normalize all Y data to be between -1 and 1
         low = min(Y)
         high = max(Y)
@@ -77,7 +83,40 @@ class LogisticRegression(Container):
         self.X = np.array(X)
         self.Y = self.m*np.array(Y)+self.b
         self.n = len(X)
-        self.betas = np.zeros(len(X[0]))
+        
+        self._optimize(np.zeros(len(X[0])))
+        
+    def train_incremental(self,X_new,Y_new):
+        """ Add new training points, restarting the optimizer from the
+        current betas instead of from zero. A full train is done if the new
+        outputs fall outside the range used to scale the old ones. """
+        
+        if self._X_train is None:
+            self.train(X_new,Y_new)
+            return
+        
+        X = np.vstack([self._X_train, np.array(X_new, dtype=float)])
+        Y = np.hstack([self._Y_train, np.array(Y_new, dtype=float)])
+        
+        if self.degenerate is not False or \
+           min(Y_new) < self.w or max(Y_new) > self.w+self.z:
+            self.train(X,Y)
+            return
+        
+        self._X_train = X
+        self._Y_train = Y
+        
+        self.X = X
+        self.Y = self.m*Y+self.b
+        self.n = len(X)
+        
+        self._optimize(self.betas)
+        
+    def _optimize(self, betas):
+        """ Fit betas to the scaled training data, starting from the given
+        betas. """
+        
+        self.betas = betas
         
         # Define the derivative of the likelihood with respect to beta_k.
         # Need to multiply by -1 because we will be minimizing.
@@ -16,6 +16,8 @@ class ResponseSurface(Container):
         self.m = None #number of training points 
         self.n = None #number of independents
         self.betas = None #vector of response surface equation coefficients
+        self._XtX = None #normal equation matrix X'X of the training data
+        self._XtY = None #normal equation right hand side X'Y
         
         if X is not None and Y is not None: 
             self.train(X,Y)
@@ -34,32 +36,53 @@ class ResponseSurface(Container):
         self.n = X.shape[1]
         
         # Modify X to include constant, squared terms and cross terms
-        X = concatenate((matrix(ones((self.m,1))),X),1) 
-        for i in range(1,self.n+1):
-            X = concatenate((X,power(X[:,i],2)),1)
-        for i in range(1,self.n):
-            for j in range(i+1,self.n+1):
-                X = concatenate((X,multiply(X[:,i],X[:,j])),1)
+        X = self._expand(X)
         
         # Determine response surface equation coefficients (betas) using least squares
         self.betas, rs, r, s = linalg.lstsq(X,Y)
         
+        # Keep the normal equations so new points can be added cheaply
+        self._XtX = X.T*X
+        self._XtY = X.T*Y
+        
+    def train_incremental(self,X_new,Y_new): 
+        """ Add new training points by updating the normal equations, which
+        costs O(p^2) per point for p coefficients instead of refitting all
+        of the data. """ 
+        
+        if self.betas is None: 
+            self.train(X_new,Y_new)
+            return
+        
+        X = self._expand(matrix(X_new))
+        Y = matrix(Y_new).T
+        
+        self.m += X.shape[0]
+        self._XtX = self._XtX + X.T*X
+        self._XtY = self._XtY + X.T*Y
+        
+        self.betas, rs, r, s = linalg.lstsq(self._XtX,self._XtY)
+        
     def predict(self,new_x): 
         """Calculates a predicted value of the response based on the current response surface model for the supplied list of inputs. """ 
         
-        new_x = matrix(new_x)
-        
-        # Modify new_x to include constant, squared terms and cross terms
-        new_x = concatenate((matrix(ones((1,1))),new_x),1) 
-        for i in range(1,self.n+1):
-            new_x = concatenate((new_x,power(new_x[:,i],2)),1)
-        for i in range(1,self.n):
-            for j in range(i+1,self.n+1):
-                new_x = concatenate((new_x,multiply(new_x[:,i],new_x[:,j])),1)
+        new_x = self._expand(matrix(new_x))
         
         # Predict new_y using new_x and betas
         new_y = new_x*self.betas
         return new_y[0,0]
+        
+    def _expand(self,X): 
+        """ Returns X with columns added for the constant, squared and cross
+        terms of the response surface equation. """ 
+        
+        X = concatenate((matrix(ones((X.shape[0],1))),X),1) 
+        for i in range(1,self.n+1):
+            X = concatenate((X,power(X[:,i],2)),1)
+        for i in range(1,self.n):
+            for j in range(i+1,self.n+1):
+                X = concatenate((X,multiply(X[:,i],X[:,j])),1)
+        return X
 
 
 if __name__ == "__main__":
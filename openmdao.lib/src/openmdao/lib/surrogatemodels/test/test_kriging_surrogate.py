@@ -3,10 +3,12 @@
 import unittest
 import random
 
-from numpy import array, linspace, sin, cos, pi
+from numpy import array, linspace, sin, cos, pi, triu_indices, zeros
 from scipy.optimize import minimize
 
-from openmdao.lib.surrogatemodels.kriging_surrogate import KrigingSurrogate
+from openmdao.lib.surrogatemodels.kriging_surrogate import KrigingSurrogate, \
+                                                       FloatKrigingSurrogate, \
+                                                       _neg_log_likelihood
 from openmdao.main.uncertain_distributions import NormalDistribution
 
 
@@ -63,10 +65,97 @@ class KrigingSurrogateTests(unittest.TestCase):
         pred = krig1.predict([-2., 0.])
         self.assertAlmostEqual(bran(x[0]), pred.mu, places=5)
 
+        # Thetas (in log10) are the maximum likelihood fit inside the
+        # [0.01, 3] bounds.
+        self.assertAlmostEqual(-1.597, krig1.thetas[0], places=3)
+        self.assertAlmostEqual(-1.866, krig1.thetas[1], places=3)
+        self.assertAlmostEqual(-39.313, krig1.log_likelihood, places=3)
+
         pred = krig1.predict([5., 5.])
 
-        self.assertAlmostEqual(5.79, pred.sigma, places=0)
-        self.assertAlmostEqual(25.34, pred.mu, places=1)
+        self.assertAlmostEqual(14.51, pred.sigma, places=1)
+        self.assertAlmostEqual(18.76, pred.mu, places=1)
+
+    def test_predict_many(self):
+        x = array([[-2., 0.], [-0.5, 1.5], [1., 3.], [8.5, 4.5], [-3.5, 6.],
+                   [4., 7.5], [-5., 9.], [5.5, 10.5]])
+        y = array([sin(case[0]) + cos(case[1]) for case in x])
+
+        krig1 = KrigingSurrogate()
+        krig1.train(x, y)
+
+        new_x = array([[-2., 0.], [5., 5.], [0.3, 12.], [1.5, 2.5]])
+        mu, sigma = krig1.predict_many(new_x)
+
+        self.assertEqual(mu.shape, (4,))
+        self.assertEqual(sigma.shape, (4,))
+        for i, case in enumerate(new_x):
+            pred = krig1.predict(case)
+            self.assertAlmostEqual(pred.mu, mu[i], places=8)
+            self.assertAlmostEqual(pred.sigma, sigma[i], places=8)
+
+        krig2 = FloatKrigingSurrogate()
+        krig2.train(x, y)
+        mu2 = krig2.predict_many(new_x)
+        for i in range(4):
+            self.assertAlmostEqual(mu2[i], mu[i], places=8)
+
+    def test_log_likelihood_gradient(self):
+        x = array([[0.05, 0.3], [.25, 0.1], [0.61, 0.8], [0.95, 0.5],
+                   [0.4, 0.45]])
+        y = array([sin(3.0*case[0]) + case[1] for case in x])
+        i, j = triu_indices(5, 1)
+        dist = (x[i] - x[j])**2
+
+        log10t = array([-0.3, 0.2])
+        nll, grad = _neg_log_likelihood(log10t, dist, y, 0.0)
+        for k in range(2):
+            step = zeros(2)
+            step[k] = 1e-7
+            nll2, _ = _neg_log_likelihood(log10t + step, dist, y, 0.0)
+            self.assertAlmostEqual((nll2 - nll)/1e-7, grad[k], places=4)
+
+    def test_multistart(self):
+        x = array([[0.05], [.25], [0.61], [0.95]])
+        y = array([0.738513784857542, -0.210367746201974, -0.489015457891476, 12.3033138316612])
+
+        krig1 = KrigingSurrogate()
+        krig1.n_start = 3
+        krig1.n_procs = 2
+        krig1.train(x, y)
+
+        self.assertAlmostEqual(.4771, krig1.thetas[0], places=4)
+        pred = krig1.predict(array([0.5]))
+        self.assertAlmostEqual(.41552, pred.sigma, places=3)
+        self.assertAlmostEqual( -1.725, pred.mu, places=3)
+
+    def test_train_incremental(self):
+        x = [[0.05, 0.3], [.25, 0.1], [0.61, 0.8], [0.95, 0.5],
+             [0.4, 0.45], [0.7, 0.2], [0.15, 0.9]]
+        y = [sin(3.0*case[0]) + case[1] for case in x]
+
+        krig1 = KrigingSurrogate()
+        krig1.train(x[:5], y[:5])
+        thetas = krig1.thetas.copy()
+        krig1.train_incremental(x[5:], y[5:])
+
+        self.assertEqual(krig1.n, 7)
+        self.assertTrue((krig1.thetas == thetas).all())
+
+        # Same thetas, but factored from scratch with all of the points.
+        krig2 = KrigingSurrogate()
+        krig2.train(x, y)
+        krig2.thetas = thetas
+        krig2._calculate_log_likelihood()
+        krig2._calculate_predictor()
+
+        self.assertAlmostEqual(krig1.log_likelihood, krig2.log_likelihood,
+                               places=6)
+        for case in ([0.5, 0.5], [0.7, 0.2], [0.2, 0.6]):
+            pred1 = krig1.predict(case)
+            pred2 = krig2.predict(case)
+            self.assertAlmostEqual(pred1.mu, pred2.mu, places=6)
+            self.assertAlmostEqual(pred1.sigma, pred2.sigma, places=6)
 
     def test_get_uncertain_value(self):
         x = array([[0.05], [.25], [0.61], [0.95]])
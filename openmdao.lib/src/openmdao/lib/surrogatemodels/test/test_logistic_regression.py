@@ -39,6 +39,18 @@ class LogisticRegressionTest(unittest.TestCase):
         
         self.assertTrue(residual<1e-5)
         
+    def test_train_incremental(self):
+        a= 0
+  
+        lr = LogisticRegression(self.X_train[:20], self.Y_train[:20], alpha=a)
+        lr.train_incremental(self.X_train[20:], self.Y_train[20:])
+        
+        self.assertEqual(lr.n, 26)
+        training_reconstruction = [lr.predict(x) for x in self.X_train]
+        residual = sum([ x-y for x,y in zip(training_reconstruction,self.Y_train)])
+        
+        self.assertTrue(residual<1e-5)
+        
     def test_uncertain_value(self): 
         lr = LogisticRegression()
         
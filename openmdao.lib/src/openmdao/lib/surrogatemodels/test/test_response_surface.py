@@ -35,4 +35,15 @@ class ResponseSurfaceTest(unittest.TestCase):
         residual = sum([ x-y for x,y in zip(training_reconstruction,self.Y_train)])
         
         self.assertTrue(residual<1e-5)
+
+    def test_train_incremental(self):
+
+        X = self.X_train[:, :3]
+        rs1 = ResponseSurface(X[:20], self.Y_train[:20])
+        rs1.train_incremental(X[20:], self.Y_train[20:])
+        rs2 = ResponseSurface(X, self.Y_train)
+
+        self.assertEqual(rs1.m, 26)
+        for x in X:
+            self.assertAlmostEqual(rs1.predict(x), rs2.predict(x), places=6)
         
@@ -35,7 +35,7 @@ from openmdao.main.problem_formulation import ArchitectureAssembly, OptProblem
 
 from openmdao.util.eggsaver import SAVE_PICKLE, SAVE_CPICKLE #, SAVE_YAML, SAVE_LIBYAML
 
-from openmdao.units import convert_units
+from openmdao.units import convert_units, convert_array
 
 
 # TODO: This probably shouldn't be here. Removing it will require edits to some
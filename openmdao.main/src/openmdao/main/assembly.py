@@ -174,6 +174,11 @@ class Assembly(Component):
         # are collapsed into single nodes
         self._reduced_graph = None
 
+        # If True, serial workflows skip any component whose inputs are
+        # unchanged since it last ran. Only safe for components whose
+        # outputs depend on nothing but their inputs.
+        self.skip_clean = False
+
         # default Driver executes its workflow once
         self.add('driver', Driver())
 
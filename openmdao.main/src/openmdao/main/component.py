@@ -165,6 +165,16 @@ class Component(Container):
         # Flags and caching used by the derivatives calculation
         self._provideJ_bounds = None
 
+        # If True, whole float Array variables are bound to views of the
+        # System vectors when those are set up, so data is passed to and from
+        # them without copies. The component must then update those arrays
+        # in place. Assigning a new array just falls back to copying.
+        self.bind_arrays = False
+
+        # Optional ExecCache used by run to skip execute when the inputs
+        # have been seen before.
+        self.exec_cache = None
+
         self._case_id = ''
         self._case_uuid = ''
 
@@ -518,6 +528,12 @@ class Component(Container):
             self._pre_execute()
             self._set_exec_state('RUNNING')
 
+            cache = self.exec_cache
+            if cache is not None and cache.restore(self):
+                # Outputs for these inputs were restored from the cache.
+                self._post_run()
+                return
+
             #print '  execute: %s' % self.get_pathname()
             # Component executes as normal
             self.exec_count += 1
@@ -528,6 +544,8 @@ class Component(Container):
 
             self.execute()
             self._post_execute()
+            if cache is not None:
+                cache.store(self)
             self._post_run()
         except Exception:
             info = sys.exc_info()
@@ -657,6 +675,17 @@ class Component(Container):
 
         return self._output_names[:]
 
+    def _get_cache_inputs(self):
+        """Return a list of (name, value) for everything that determines
+        the outputs of this component, used as the key of its exec_cache.
+        """
+        return [(name, self.get(name)) for name in sorted(self.list_inputs())]
+
+    def _get_cache_outputs(self):
+        """Return a list of names of the outputs saved in exec_cache."""
+        return [name for name in self.list_outputs()
+                     if not self.get_metadata(name, 'framework_var')]
+
     def list_containers(self):
         """Return a list of names of child Containers."""
         if self._container_names is None:
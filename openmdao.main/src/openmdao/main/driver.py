@@ -52,6 +52,21 @@ class GradientOptions(VariableTree):
                         'or scaled to the bounds (high-low) step sizes',
                         framework_var=True)
 
+    fd_processes = Int(1, low=1, desc="Number of processes used to run the "
+                                    "finite difference points concurrently. "
+                                    "Each process runs its own forked copy "
+                                    "of the model. (Not supported in MPI or "
+                                    "for complex_step)",
+                       framework_var=True)
+
+    fd_coloring = Bool(False, desc="Set to True to perturb groups of "
+                                   "structurally independent inputs "
+                                   "together. The first finite difference "
+                                   "perturbs one input at a time, at the "
+                                   "current point and a few random nearby "
+                                   "points, to find the sparsity pattern.",
+                       framework_var=True)
+
     force_fd = Bool(False, desc="Set to True to force finite difference "
                                 "of this driver's entire workflow in a"
                                 "single block.",
@@ -80,10 +95,19 @@ class GradientOptions(VariableTree):
     #                          framework_var=True)
 
     # Linear Solver settings
-    lin_solver = Enum('scipy_gmres', ['scipy_gmres', 'petsc_ksp', 'linear_gs'],
+    lin_solver = Enum('scipy_gmres', ['scipy_gmres', 'petsc_ksp', 'linear_gs',
+                                      'direct_lu'],
                       desc='Method to use for gradient calculation',
                       framework_var=True)
 
+    block_solve = Bool(False, desc="Set to True to solve for all columns "
+                                   "of the gradient together by factoring "
+                                   "the linear system assembled from "
+                                   "provideJ once instead of running one "
+                                   "linear solve per column. "
+                                   "(Not supported by petsc_ksp)",
+                                   framework_var=True)
+
     atol = Float(1.0e-9, desc='Absolute tolerance for the linear solver.',
                  framework_var=True)
     rtol = Float(1.0e-9, desc='Relative tolerance for the linear solver. '
@@ -143,6 +167,7 @@ class Driver(Component):
         self._reduced_graph = None
         self._iter_set = None
         self._full_iter_set = None
+        self._fd_sparsity = None
 
         # clean up unwanted trait from Component
         self.remove_trait('missing_deriv_policy')
@@ -703,6 +728,7 @@ class Driver(Component):
         self._depgraph = None
         self._iter_set = None
         self._full_iter_set = None
+        self._fd_sparsity = None
         if self.workflow is not None:
             self.workflow.config_changed()
 
@@ -0,0 +1,136 @@
+"""
+Fused evaluation of a driver's constraints, objectives and responses.
+
+The value of each of those expressions is the output of a pseudocomponent,
+and after a run it's already sitting in the System vectors.  An
+:class:`EvalPlan` works out where, once per setup, and then pulls all of the
+values out with a single indexing operation per vector.
+"""
+
+import numpy
+
+from openmdao.main.mpiwrap import MPI
+
+
+def _offset(view, base):
+    """Return the index of the first entry of view within the array base,
+    or None if view isn't a contiguous piece of base.
+    """
+    if view.ndim != 1 or view.dtype != base.dtype or \
+       (view.size > 1 and view.strides[0] != base.itemsize):
+        return None
+    start = view.__array_interface__['data'][0]
+    lo = base.__array_interface__['data'][0]
+    if start < lo or start + view.nbytes > lo + base.nbytes:
+        return None
+    return (start - lo) // base.itemsize
+
+
+class EvalPlan(object):
+    """Gathers the `out0` values of a list of pseudocomponents straight
+    from the 'u' vector (or, for residuals mapped to states, from the 'f'
+    vector) of the System of their scope.
+    """
+
+    def __init__(self):
+        self._items = None
+        self._u = None
+        self._valid = False
+
+    def __getstate__(self):
+        # arrays from the vectors of the System aren't worth saving
+        return {'_items': None, '_u': None, '_valid': False}
+
+    def evaluate(self, scope, items):
+        """Return a flat array of the values of the pseudocomponents of the
+        given constraints, objectives or responses (each having a
+        `pcomp_name`), or None if they can't all be found in the vectors.
+        """
+        try:
+            vec = scope._system.vec
+            u = vec['u'].array
+        except (AttributeError, KeyError):
+            return None
+
+        if u is not self._u or items != self._items:
+            self._build(scope, items, u, vec.get('f'))
+        if not self._valid:
+            return None
+
+        out = u[self._uidx]
+        if self._fidx is not None:
+            out[self._fpos] = -self._f[self._fidx]
+        return out
+
+    def split(self, values, shaped=True):
+        """Split the array from :meth:`evaluate` into the values of the
+        individual items, as floats for scalars and arrays otherwise. The
+        arrays have their original shape if `shaped` is True, else they're
+        flat.
+        """
+        result = []
+        for start, end, shape in self._bounds:
+            if shape is None:
+                result.append(float(values[start]))
+            elif shaped:
+                result.append(values[start:end].reshape(shape))
+            else:
+                result.append(values[start:end])
+        return result
+
+    def _build(self, scope, items, u, fvec):
+        """Find the locations of the outputs of the given items."""
+        self._items = items
+        self._u = u
+        self._f = None if fvec is None else fvec.array
+        self._valid = False
+
+        if MPI:
+            return
+
+        uidx = []
+        fidx = []
+        fpos = []
+        bounds = []
+        for item in items:
+            vname = item.pcomp_name + '.out0'
+            try:
+                system = getattr(scope, item.pcomp_name)._system
+                name = scope.name2collapsed[vname]
+                info = system.vec['u']._info[name]
+            except (AttributeError, KeyError):
+                return
+
+            meta = scope._var_meta.get(vname, {})
+            if info.hide:
+                # a residual mapped to a state, so the value is in 'f'
+                if self._f is None:
+                    return
+                view = system.vec['f'][name]
+                start = _offset(view, self._f)
+                if start is None:
+                    return
+                fpos.extend(range(len(uidx), len(uidx) + view.size))
+                fidx.extend(range(start, start + view.size))
+                uidx.extend([0] * view.size)
+            else:
+                view = info.view[info.idxs]
+                start = _offset(view, u)
+                if start is None:
+                    return
+                uidx.extend(range(start, start + view.size))
+
+            if meta.get('scalar') and view.size == 1:
+                shape = None
+            else:
+                shape = meta.get('shape', (view.size,))
+            bounds.append((len(uidx) - view.size, len(uidx), shape))
+
+        self._uidx = numpy.array(uidx, dtype=int)
+        if fidx:
+            self._fidx = numpy.array(fidx, dtype=int)
+            self._fpos = numpy.array(fpos, dtype=int)
+        else:
+            self._fidx = self._fpos = None
+        self._bounds = bounds
+        self._valid = True
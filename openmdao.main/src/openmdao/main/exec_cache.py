@@ -0,0 +1,161 @@
+"""
+Memoization of component executions. An :class:`ExecCache` assigned to
+a component's `exec_cache` attribute stores the component's outputs keyed
+by a hash of its inputs, so a rerun with inputs that have been seen before
+restores the outputs instead of calling `execute`.
+"""
+import cPickle
+import hashlib
+import os
+from collections import OrderedDict
+
+from numpy import ndarray, ascontiguousarray
+
+from openmdao.main.interfaces import IVariableTree
+from openmdao.main.mp_support import has_interface
+
+__all__ = ('ExecCache',)
+
+
+def _hash_value(sha, value):
+    """Add a representation of value to the hash object sha."""
+    if isinstance(value, ndarray):
+        sha.update('%s%s' % (value.dtype, value.shape))
+        sha.update(ascontiguousarray(value).tostring())
+    elif isinstance(value, (list, tuple)):
+        sha.update('%s%d' % (type(value).__name__, len(value)))
+        for item in value:
+            _hash_value(sha, item)
+    elif isinstance(value, dict):
+        sha.update('dict%d' % len(value))
+        for key in sorted(value):
+            _hash_value(sha, key)
+            _hash_value(sha, value[key])
+    elif has_interface(value, IVariableTree):
+        for name, val in sorted(value.items()):
+            _hash_value(sha, name)
+            _hash_value(sha, val)
+    elif value is None or isinstance(value, (basestring, bool, int, long,
+                                              float, complex)):
+        sha.update(repr(value))
+    else:
+        sha.update(cPickle.dumps(value, cPickle.HIGHEST_PROTOCOL))
+
+
+class ExecCache(object):
+    """
+    A least recently used cache of component outputs, keyed by a hash of
+    the component's inputs.
+
+    max_entries: int
+        Maximum number of sets of outputs kept.
+
+    max_bytes: int (optional)
+        Maximum total size of the pickled outputs kept.
+
+    filename: str (optional)
+        If given, the cache is loaded from this file if it exists, and
+        saved to it whenever a new entry is added.
+
+    The number of cache hits and misses are kept in `hits` and `misses`.
+    """
+
+    def __init__(self, max_entries=100, max_bytes=None, filename=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.filename = filename
+
+        self.hits = 0
+        self.misses = 0
+
+        self._entries = OrderedDict()  # key -> pickled outputs
+        self._nbytes = 0
+        self._key = None  # key of the last miss
+
+        if filename and os.path.exists(filename):
+            self.load()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def key(self, comp):
+        """Return the hash of the inputs of the given component."""
+        sha = hashlib.sha1()
+        for name, value in comp._get_cache_inputs():
+            _hash_value(sha, name)
+            _hash_value(sha, value)
+        return sha.hexdigest()
+
+    def restore(self, comp):
+        """Set the outputs of the given component from the cache if its
+        inputs have been seen before. Returns True on a hit.
+        """
+        key = self.key(comp)
+        data = self._entries.pop(key, None)
+        if data is None:
+            self.misses += 1
+            self._key = key
+            return False
+
+        self._entries[key] = data  # now the most recently used
+        self.hits += 1
+        for name, value in cPickle.loads(data):
+            setattr(comp, name, value)
+        return True
+
+    def store(self, comp):
+        """Save the outputs of the given component after a miss."""
+        key = self._key
+        self._key = None
+        if key is None:
+            key = self.key(comp)
+
+        outputs = [(name, comp.get(name)) for name in comp._get_cache_outputs()]
+        data = cPickle.dumps(outputs, cPickle.HIGHEST_PROTOCOL)
+
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._nbytes -= len(old)
+        self._entries[key] = data
+        self._nbytes += len(data)
+        self._evict()
+
+        if self.filename:
+            self.save()
+
+    def discard_key(self):
+        """Make the next :meth:`store` recompute the key, for a component
+        whose key inputs changed while it executed."""
+        self._key = None
+
+    def clear(self):
+        """Remove all entries and reset the counters."""
+        self._entries.clear()
+        self._nbytes = 0
+        self._key = None
+        self.hits = self.misses = 0
+
+    def save(self, filename=None):
+        """Write the entries to the given file, or to `filename`."""
+        filename = filename or self.filename
+        tmpname = filename + '.tmp'
+        with open(tmpname, 'wb') as out:
+            cPickle.dump(self._entries.items(), out, cPickle.HIGHEST_PROTOCOL)
+        if os.path.exists(filename):
+            os.remove(filename)  # rename won't replace on Windows
+        os.rename(tmpname, filename)
+
+    def load(self, filename=None):
+        """Read entries from the given file, or from `filename`."""
+        with open(filename or self.filename, 'rb') as inp:
+            self._entries = OrderedDict(cPickle.load(inp))
+        self._nbytes = sum([len(data) for data in self._entries.values()])
+        self._evict()
+
+    def _evict(self):
+        """Drop least recently used entries until within the limits."""
+        while self._entries and \
+              (len(self._entries) > self.max_entries or
+               (self.max_bytes is not None and self._nbytes > self.max_bytes)):
+            key, data = self._entries.popitem(last=False)
+            self._nbytes -= len(data)
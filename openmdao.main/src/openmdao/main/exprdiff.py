@@ -0,0 +1,385 @@
+"""
+Symbolic forward differentiation of the expressions used by ExprEvaluator.
+
+An expression whose variables have been replaced by ``var_dict['<name>']``
+entries is translated into nested calls to the helper functions below, each
+of which returns a (value, derivative) pair.  The translated expression is
+compiled once and can then be evaluated with respect to any one of the
+variables.
+
+A derivative is None if the value doesn't depend on the variable, a _Diag if
+the value is an elementwise function of an array variable of the same shape,
+or otherwise an array shaped like the value with an extra trailing axis that
+runs over the flattened entries of the variable.
+"""
+
+import ast
+import math
+
+import numpy
+from numpy import ndarray, zeros, ones, newaxis
+
+__all__ = ['deriv_code', 'eval_deriv', 'deriv_helpers']
+
+
+class _Diag(object):
+    """Diagonal Jacobian of an elementwise function of an array variable.
+    The entries are in `d`, which is shaped like the variable.
+    """
+
+    __slots__ = ('d',)
+
+    def __init__(self, d):
+        self.d = d
+
+
+def _dense(der):
+    """Return der as a full array."""
+    if isinstance(der, _Diag):
+        d = der.d
+        n = d.size
+        full = zeros(d.shape + (n,))
+        full.reshape(n, n)[numpy.arange(n), numpy.arange(n)] = d.ravel()
+        return full
+    return der
+
+
+def _fit(der, shape):
+    """Return der in a form that is consistent with a value of the
+    given shape.
+    """
+    if der is None:
+        return None
+    if isinstance(der, _Diag):
+        if der.d.shape == shape:
+            return der
+        der = _dense(der)
+    if der.shape[:-1] != shape:
+        der = der + zeros(shape + der.shape[-1:])
+    return der
+
+
+def _scale(der, factor, shape):
+    """Return der multiplied elementwise by factor, for a value of the
+    given shape.
+    """
+    if der is None:
+        return None
+    if isinstance(der, _Diag):
+        if der.d.shape == shape:
+            return _Diag(der.d * factor)
+        der = _dense(der)
+    if numpy.ndim(factor):
+        der = der * numpy.asarray(factor)[..., newaxis]
+    else:
+        der = der * factor
+    return _fit(der, shape)
+
+
+def _add(da, db, shape):
+    """Return the sum of two derivatives, for a value of the given shape."""
+    da = _fit(da, shape)
+    db = _fit(db, shape)
+    if da is None:
+        return db
+    if db is None:
+        return da
+    if isinstance(da, _Diag) and isinstance(db, _Diag):
+        return _Diag(da.d + db.d)
+    return _dense(da) + _dense(db)
+
+
+def _d_const(value):
+    return (value, None)
+
+
+def _d_var(value, name, wrt):
+    if name != wrt:
+        return (value, None)
+    if isinstance(value, ndarray):
+        return (value, _Diag(ones(value.shape)))
+    return (value, ones(1))
+
+
+def _d_pos(a):
+    return a
+
+
+def _d_neg(a):
+    val, der = a
+    return (-val, _scale(der, -1.0, numpy.shape(val)))
+
+
+def _d_add(a, b):
+    val = a[0] + b[0]
+    return (val, _add(a[1], b[1], numpy.shape(val)))
+
+
+def _d_sub(a, b):
+    val = a[0] - b[0]
+    shape = numpy.shape(val)
+    return (val, _add(a[1], _scale(b[1], -1.0, shape), shape))
+
+
+def _d_mul(a, b):
+    val = a[0] * b[0]
+    shape = numpy.shape(val)
+    return (val, _add(_scale(a[1], b[0], shape),
+                      _scale(b[1], a[0], shape), shape))
+
+
+def _d_div(a, b):
+    val = a[0] / b[0]
+    shape = numpy.shape(val)
+    return (val, _add(_scale(a[1], 1.0 / b[0], shape),
+                      _scale(b[1], -val / b[0], shape), shape))
+
+
+def _d_pow(a, b):
+    val = numpy.power(a[0], b[0])
+    shape = numpy.shape(val)
+    da = db = None
+    if a[1] is not None:
+        da = _scale(a[1], b[0] * numpy.power(a[0], b[0] - 1), shape)
+    if b[1] is not None:
+        db = _scale(b[1], numpy.log(a[0]) * val, shape)
+    return (val, _add(da, db, shape))
+
+
+def _d_atan2(func, y, x):
+    val = func(y[0], x[0])
+    shape = numpy.shape(val)
+    r2 = x[0] ** 2 + y[0] ** 2
+    return (val, _add(_scale(y[1], x[0] / r2, shape),
+                      _scale(x[1], -y[0] / r2, shape), shape))
+
+
+def _d_hypot(func, a, b):
+    val = func(a[0], b[0])
+    shape = numpy.shape(val)
+    return (val, _add(_scale(a[1], a[0] / val, shape),
+                      _scale(b[1], b[0] / val, shape), shape))
+
+
+def _d_index(a, index):
+    val, der = a
+    if der is not None:
+        der = _dense(der)[index]
+    return (val[index], der)
+
+
+# derivatives of the supported functions of one argument, given the
+# argument and the function value
+_derivs = {
+    'sin': lambda x, f: numpy.cos(x),
+    'cos': lambda x, f: -numpy.sin(x),
+    'tan': lambda x, f: 1.0 + f ** 2,
+    'sinh': lambda x, f: numpy.cosh(x),
+    'cosh': lambda x, f: numpy.sinh(x),
+    'tanh': lambda x, f: 1.0 - f ** 2,
+    'asin': lambda x, f: 1.0 / numpy.sqrt(1.0 - x ** 2),
+    'acos': lambda x, f: -1.0 / numpy.sqrt(1.0 - x ** 2),
+    'atan': lambda x, f: 1.0 / (1.0 + x ** 2),
+    'asinh': lambda x, f: 1.0 / numpy.sqrt(x ** 2 + 1.0),
+    'acosh': lambda x, f: 1.0 / numpy.sqrt(x ** 2 - 1.0),
+    'atanh': lambda x, f: 1.0 / (1.0 - x ** 2),
+    'exp': lambda x, f: f,
+    'expm1': lambda x, f: f + 1.0,
+    'log': lambda x, f: 1.0 / x,
+    'log10': lambda x, f: 1.0 / (x * math.log(10.0)),
+    'log1p': lambda x, f: 1.0 / (1.0 + x),
+    'sqrt': lambda x, f: 0.5 / f,
+    'abs': lambda x, f: numpy.sign(x),
+    'fabs': lambda x, f: numpy.sign(x),
+    'degrees': lambda x, f: 180.0 / math.pi,
+    'radians': lambda x, f: math.pi / 180.0,
+    'erf': lambda x, f: 2.0 / math.sqrt(math.pi) * numpy.exp(-x ** 2),
+    'erfc': lambda x, f: -2.0 / math.sqrt(math.pi) * numpy.exp(-x ** 2),
+}
+_derivs['arcsin'] = _derivs['asin']
+_derivs['arccos'] = _derivs['acos']
+_derivs['arctan'] = _derivs['atan']
+_derivs['arcsinh'] = _derivs['asinh']
+_derivs['arccosh'] = _derivs['acosh']
+_derivs['arctanh'] = _derivs['atanh']
+_derivs['absolute'] = _derivs['abs']
+
+_binary_funcs = {
+    'pow': '_d_pow',
+    'power': '_d_pow',
+    'atan2': '_d_atan2',
+    'arctan2': '_d_atan2',
+    'hypot': '_d_hypot',
+}
+
+
+def _d_call(func, name, a):
+    val = func(a[0])
+    return (val, _scale(a[1], _derivs[name](a[0], val), numpy.shape(val)))
+
+
+def _d_pow_call(func, a, b):
+    return _d_pow(a, b)
+
+
+deriv_helpers = {
+    '_d_const': _d_const,
+    '_d_var': _d_var,
+    '_d_pos': _d_pos,
+    '_d_neg': _d_neg,
+    '_d_add': _d_add,
+    '_d_sub': _d_sub,
+    '_d_mul': _d_mul,
+    '_d_div': _d_div,
+    '_d_pow': _d_pow_call,
+    '_d_atan2': _d_atan2,
+    '_d_hypot': _d_hypot,
+    '_d_index': _d_index,
+    '_d_call': _d_call,
+}
+
+_binops = {
+    ast.Add: '_d_add',
+    ast.Sub: '_d_sub',
+    ast.Mult: '_d_mul',
+    ast.Div: '_d_div',
+    ast.Pow: '_d_pow',
+}
+
+_unaryops = {
+    ast.UAdd: '_d_pos',
+    ast.USub: '_d_neg',
+}
+
+
+def _call(fname, args):
+    return ast.Call(func=ast.Name(id=fname, ctx=ast.Load()), args=args,
+                    keywords=[], starargs=None, kwargs=None)
+
+
+def _func_name(node):
+    """Return the name of the called function if it's one we can
+    differentiate.
+    """
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute) and \
+       isinstance(node.value, ast.Name) and \
+       node.value.id in ('math', 'numpy'):
+        return node.attr
+    return None
+
+
+def _index_node(node):
+    """Return an expression node for the index object of a subscript."""
+    if isinstance(node, ast.Index):
+        return node.value
+    if isinstance(node, ast.Slice):
+        args = [n if n is not None else ast.Name(id='None', ctx=ast.Load())
+                for n in (node.lower, node.upper, node.step)]
+        return _call('slice', args)
+    if isinstance(node, ast.ExtSlice):
+        return ast.Tuple(elts=[_index_node(d) for d in node.dims],
+                         ctx=ast.Load())
+    if isinstance(node, ast.Ellipsis):
+        return ast.Name(id='Ellipsis', ctx=ast.Load())
+    raise NotImplementedError("can't differentiate index %s" % ast.dump(node))
+
+
+class _DerivTransformer(ast.NodeTransformer):
+    """Rewrites an expression AST into calls to the derivative helpers.
+    Raises NotImplementedError for anything outside the supported subset.
+    """
+
+    def generic_visit(self, node):
+        raise NotImplementedError("can't differentiate %s"
+                                  % node.__class__.__name__)
+
+    def visit_Expression(self, node):
+        node.body = self.visit(node.body)
+        return node
+
+    def visit_Num(self, node):
+        return _call('_d_const', [node])
+
+    def visit_Name(self, node):
+        return _call('_d_const', [node])
+
+    def visit_Attribute(self, node):
+        return _call('_d_const', [node])
+
+    def visit_Subscript(self, node):
+        if isinstance(node.value, ast.Name) and node.value.id == 'var_dict':
+            return _call('_d_var', [node, node.slice.value,
+                                    ast.Name(id='wrt', ctx=ast.Load())])
+        return _call('_d_index', [self.visit(node.value),
+                                  _index_node(node.slice)])
+
+    def visit_BinOp(self, node):
+        fname = _binops.get(type(node.op))
+        if fname is None:
+            raise NotImplementedError("can't differentiate operator %s"
+                                      % node.op.__class__.__name__)
+        if fname == '_d_pow':
+            return _call(fname, [ast.Name(id='None', ctx=ast.Load()),
+                                 self.visit(node.left),
+                                 self.visit(node.right)])
+        return _call(fname, [self.visit(node.left), self.visit(node.right)])
+
+    def visit_UnaryOp(self, node):
+        fname = _unaryops.get(type(node.op))
+        if fname is None:
+            raise NotImplementedError("can't differentiate operator %s"
+                                      % node.op.__class__.__name__)
+        return _call(fname, [self.visit(node.operand)])
+
+    def visit_Call(self, node):
+        name = _func_name(node.func)
+        if node.keywords or node.starargs or node.kwargs or name is None:
+            raise NotImplementedError("can't differentiate call")
+
+        args = [self.visit(arg) for arg in node.args]
+        if len(args) == 1 and name in _derivs:
+            return _call('_d_call', [node.func, ast.Str(s=name), args[0]])
+        if len(args) == 2 and name in _binary_funcs:
+            return _call(_binary_funcs[name], [node.func] + args)
+        raise NotImplementedError("can't differentiate function '%s'" % name)
+
+
+def deriv_code(text):
+    """Return compiled code that evaluates the given expression, in which
+    the variables appear as ``var_dict['<name>']``, as a (value, derivative)
+    pair. Raises NotImplementedError if the expression can't be
+    differentiated symbolically.
+    """
+    root = _DerivTransformer().visit(ast.parse(text, mode='eval'))
+    ast.fix_missing_locations(root)
+    return compile(root, '<string>', 'eval')
+
+
+def eval_deriv(code, namespace, var_dict, wrt):
+    """Evaluate code from :func:`deriv_code` with respect to the variable
+    named `wrt` and return the derivative as a Jacobian block, shaped the
+    same way as by ExprEvaluator.evaluate_gradient.
+
+    namespace: dict
+        Globals for the evaluation, which must include `deriv_helpers`.
+    """
+    val, der = eval(code, namespace, {'var_dict': var_dict, 'wrt': wrt})
+
+    wrt_val = var_dict[wrt]
+    n = numpy.size(wrt_val)
+    if isinstance(val, ndarray):
+        if der is None:
+            return zeros((val.size, n))
+        der = _fit(der, val.shape)
+        if isinstance(der, _Diag):
+            return numpy.diag(der.d.ravel())
+        return der.reshape(val.size, n)
+
+    if der is None:
+        return zeros((1, n)) if isinstance(wrt_val, ndarray) else 0.0
+    der = _dense(der)
+    if isinstance(wrt_val, ndarray):
+        return der.reshape(1, n)
+    return float(der[0])
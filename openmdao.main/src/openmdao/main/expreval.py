@@ -13,6 +13,7 @@ from openmdao.main.printexpr import _get_attr_node, _get_long_name, \
                                     print_node
 from openmdao.main.array_helpers import flattened_value
 from openmdao.main.printexpr import transform_expression
+from openmdao.main.exprdiff import deriv_code, eval_deriv, deriv_helpers
 
 def _import_functs(mod, dct, names=None):
     if names is None:
@@ -53,6 +54,10 @@ except ImportError:
 else:
     _import_functs(scipy.special, _expr_dict, names=['gamma', 'polygamma'])
 
+# globals for evaluating symbolic derivatives
+_deriv_dict = _expr_dict.copy()
+_deriv_dict.update(deriv_helpers)
+
 
 from numpy import ndarray, ndindex, zeros, complex, imag, issubdtype
 from openmdao.main.interfaces import IComponent
@@ -354,6 +359,7 @@ class ExprEvaluator(object):
         self.getter = getter
         self.var_names = set()
         self.cached_grad_eq = None
+        self.cached_grad_deriv = None
 
     @property
     def text(self):
@@ -364,6 +370,7 @@ class ExprEvaluator(object):
     def text(self, value):
         self._code = self._assignment_code = None
         self._examiner = self.cached_grad_eq = None
+        self.cached_grad_deriv = None
         self._text = value
 
     @property
@@ -383,6 +390,7 @@ class ExprEvaluator(object):
         if scp is None or value is not scp:
             self._code = self._assignment_code = None
             self._examiner = self.cached_grad_eq = None
+            self.cached_grad_deriv = None
             if value is not None:
                 self._scope = weakref.ref(value)
             else:
@@ -456,6 +464,7 @@ class ExprEvaluator(object):
         state['_scope'] = self.scope
         state['_code'] = None  # <type 'code'> won't pickle either.
         state['cached_grad_eq'] = None
+        state['cached_grad_deriv'] = None
         if state.get('_assignment_code'):
             state['_assignment_code'] = None # more unpicklable <type 'code'>
         return state
@@ -601,8 +610,10 @@ class ExprEvaluator(object):
 
     def evaluate_gradient(self, stepsize=1.0e-6, wrt=None, scope=None):
         """Return a dict containing the gradient of the expression with respect
-        to each of the referenced varpaths. The gradient is calculated by 1st
-        order central difference for now.
+        to each of the referenced varpaths. Expressions made up of arithmetic,
+        supported math functions and indexing are differentiated symbolically.
+        Anything else is differentiated by complex step, falling back to
+        central difference.
 
         stepsize: float
             Step size for finite difference.
@@ -628,7 +639,7 @@ class ExprEvaluator(object):
                 replace_val = scope.get(name)
 
             if isinstance(replace_val, ndarray):
-                replace_val = replace_val.astype(numpy.complex)
+                replace_val = replace_val.astype(numpy.float)
             else:
                 replace_val = float(replace_val)
 
@@ -644,6 +655,30 @@ class ExprEvaluator(object):
             grad_root = ast.parse(grad_text, mode='eval')
             self.cached_grad_eq = compile(grad_root, '<string>', 'eval')
 
+            try:
+                self.cached_grad_deriv = deriv_code(grad_text)
+            except NotImplementedError:
+                self.cached_grad_deriv = False
+
+        if self.cached_grad_deriv:
+            gradient = {}
+            try:
+                for var in wrt:
+                    if var in inputs:
+                        gradient[var] = eval_deriv(self.cached_grad_deriv,
+                                                   _deriv_dict, var_dict, var)
+                    else:
+                        gradient[var] = 0.0
+            except Exception:
+                # e.g., a math function applied to an array
+                self.cached_grad_deriv = False
+            else:
+                return gradient
+
+        for name, val in var_dict.items():
+            if isinstance(val, ndarray):
+                var_dict[name] = val.astype(numpy.complex)
+
         grad_code = self.cached_grad_eq
 
         gradient = {}
@@ -2,6 +2,8 @@
 """
 
 # pylint: disable=E0611,F0401
+import os
+from multiprocessing import Pool
 from sys import float_info
 
 from openmdao.main.array_helpers import flattened_size
@@ -11,6 +13,23 @@ from openmdao.main.mpiwrap import MPI
 from openmdao.util.graph import base_var
 
 from numpy import ndarray, zeros, ones, unravel_index, complex128
+from numpy.random import RandomState
+
+# FiniteDifference object, outputs, and iterbase that the forked worker
+# processes of a parallel finite difference operate on.
+_FD_WORKER = None
+
+# Number of random points near the current one whose Jacobians are added to
+# the sparsity pattern found for a colored finite difference.
+_SPARSITY_PROBES = 2
+
+
+def _run_fd_point(point):
+    """Runs the model with a perturbed set of input entries and returns the
+    flattened outputs. Called in a forked worker process."""
+
+    fd, outputs, iterbase = _FD_WORKER
+    return fd._run_point(point, outputs, iterbase)
 
 
 class FiniteDifference(object):
@@ -36,6 +55,18 @@ class FiniteDifference(object):
         self.high = [None] * len(self.inputs)
 
         self.form = options.fd_form
+        self.num_procs = options.fd_processes
+        self.coloring = options.fd_coloring
+        self.sparsity = None
+
+        # Our system (and so this object) is regenerated by every public
+        # calc_gradient, so the sparsity pattern is kept by the driver.
+        if self.coloring:
+            if getattr(driver, '_fd_sparsity', None) is None:
+                driver._fd_sparsity = {}
+            self._patterns = driver._fd_sparsity
+        else:
+            self._patterns = {}
         self.form_custom = {}
         self.step_type = options.fd_step_type
         self.step_type_custom = {}
@@ -184,6 +215,7 @@ class FiniteDifference(object):
 
         uvec.set_to_array(self.y_base, outputs)
 
+        columns = []
         for j, src, in enumerate(self.inputs):
 
             # Users can customize relative/absolute step type per variable.
@@ -232,105 +264,304 @@ class FiniteDifference(object):
                     if current_val + fd_step > bound_val:
                         form = 'backward'
 
-                #--------------------
-                # Forward difference
-                #--------------------
-                if form == 'forward':
+                columns.append((src, i, i1, form, fd_step))
 
-                    # Step
-                    self.set_value(src, fd_step, i-i1)
+        parallel = self.num_procs > 1 and MPI is None and hasattr(os, 'fork')
 
-                    self.system.run(iterbase)
-                    self.get_outputs(self.y, outputs)
+        if self.coloring:
+            key = (self.system.name,
+                   tuple([src if isinstance(src, basestring) else tuple(src)
+                          for src in self.inputs]),
+                   tuple(outputs), len(columns), self.y_base.size)
+            self.sparsity = self._patterns.get(key)
 
-                    # Forward difference
-                    Jfd = (self.y - self.y_base)/fd_step
+        if self.coloring and self.sparsity is not None:
+            groups = self._color(columns)
+        else:
+            groups = [[k] for k in range(len(columns))]
 
-                    # Undo step
-                    self.set_value(src, -fd_step, i-i1)
+        if parallel or len(groups) < len(columns):
+            jacs = self._solve_groups(columns, groups, outputs, iterbase,
+                                      parallel)
+        else:
+            jacs = [self._solve_column(src, i-i1, form, fd_step, outputs,
+                                       iterbase)
+                    for src, i, i1, form, fd_step in columns]
+
+        # The first pass of a colored finite difference perturbs one column
+        # at a time to find the sparsity pattern.
+        if self.coloring and self.sparsity is None:
+            self.sparsity = self._find_sparsity(columns, jacs, outputs,
+                                                iterbase)
+            self._patterns[key] = self.sparsity
+
+        for (src, i, i1, form, fd_step), Jfd in zip(columns, jacs):
+
+            # Pack Jacobian in either an array or a dictionary.
+            if self.return_format == 'dict':
+                start = end = 0
+                for okey in outputs:
+
+                    sz = uvec[okey].size
+                    end += sz
+                    #print Jfd, start, end, i, self.J
+                    self.J[okey][src][:, i-i1] = Jfd[start:end]
+                    start += sz
+            else:
+                self.J[:, i] = Jfd
 
-                #--------------------
-                # Backward difference
-                #--------------------
-                elif form == 'backward':
+        # Restore final inputs/outputs.
+        uvec.set_from_array(self.y_base, outputs)
+        uvec.set_to_scope(self.scope)
+
+        #print 'after FD', self.J
+        return self.J
 
-                    # Step
-                    self.set_value(src, -fd_step, i-i1)
+    def _solve_column(self, src, index, form, fd_step, outputs, iterbase):
+        """Return one column of the Jacobian, found by perturbing entry
+        index of src with the given form and stepsize."""
+
+        #--------------------
+        # Forward difference
+        #--------------------
+        if form == 'forward':
+
+            # Step
+            self.set_value(src, fd_step, index)
+
+            self.system.run(iterbase)
+            self.get_outputs(self.y, outputs)
+
+            # Forward difference
+            Jfd = (self.y - self.y_base)/fd_step
+
+            # Undo step
+            self.set_value(src, -fd_step, index)
+
+        #--------------------
+        # Backward difference
+        #--------------------
+        elif form == 'backward':
+
+            # Step
+            self.set_value(src, -fd_step, index)
+
+            self.system.run(iterbase)
+            self.get_outputs(self.y, outputs)
 
-                    self.system.run(iterbase)
-                    self.get_outputs(self.y, outputs)
+            # Backward difference
+            Jfd = (self.y_base - self.y)/fd_step
 
-                    # Backward difference
-                    Jfd = (self.y_base - self.y)/fd_step
+            # Undo step
+            self.set_value(src, fd_step, index)
 
-                    # Undo step
-                    self.set_value(src, fd_step, i-i1)
+        #--------------------
+        # Central difference
+        #--------------------
+        elif form == 'central':
 
-                #--------------------
-                # Central difference
-                #--------------------
-                elif form == 'central':
+            # Forward Step
+            self.set_value(src, fd_step, index)
 
-                    # Forward Step
-                    self.set_value(src, fd_step, i-i1)
+            self.system.run(iterbase)
+            self.get_outputs(self.y, outputs)
 
-                    self.system.run(iterbase)
-                    self.get_outputs(self.y, outputs)
+            # Backward Step
+            self.set_value(src, -2.0*fd_step, index)
 
-                    # Backward Step
-                    self.set_value(src, -2.0*fd_step, i-i1)
+            self.system.run(iterbase)
+            self.get_outputs(self.y2, outputs)
 
-                    self.system.run(iterbase)
-                    self.get_outputs(self.y2, outputs)
+            # Central difference
+            Jfd = (self.y - self.y2)/(2.0*fd_step)
 
-                    # Central difference
-                    Jfd = (self.y - self.y2)/(2.0*fd_step)
+            # Undo step
+            self.set_value(src, fd_step, index)
 
-                    # Undo step
-                    self.set_value(src, fd_step, i-i1)
+        #--------------------
+        # Complex Step
+        #--------------------
+        elif form == 'complex_step':
 
-                #--------------------
-                # Complex Step
-                #--------------------
-                elif form == 'complex_step':
+            complex_step = fd_step
+            yc = zeros(len(self.y), dtype=complex128)
+            self.system.set_complex_step(True)
 
-                    complex_step = fd_step
-                    yc = zeros(len(self.y), dtype=complex128)
-                    self.system.set_complex_step(True)
+            # Step
+            self.set_value_complex(src, complex_step, index)
 
-                    # Step
-                    self.set_value_complex(src, complex_step, i-i1)
+            self.system.run(iterbase)
+            self.get_complex_outputs(yc)
 
-                    self.system.run(iterbase)
-                    self.get_complex_outputs(yc)
+            # Forward difference
+            Jfd = (yc/fd_step).imag
 
-                    # Forward difference
-                    Jfd = (yc/fd_step).imag
+            # Undo step
+            self.set_value_complex(src, complex_step, index,
+                                   undo_complex=True)
+            self.system.set_complex_step(False)
 
-                    # Undo step
-                    self.set_value_complex(src, complex_step, i-i1,
-                                           undo_complex=True)
-                    self.system.set_complex_step(False)
+        return Jfd
+
+    def _find_sparsity(self, columns, jacs, outputs, iterbase):
+        """Return the rows of each column that are nonzero in jacs, or in
+        the Jacobian at any of a few random points near the current one.
+        A derivative which just happens to be zero at the current point
+        would otherwise be left out of the pattern for good."""
+
+        masks = [self._nonzero(Jfd) for Jfd in jacs]
+
+        y_base = self.y_base.copy()
+        rand = RandomState(0)
+        for probe in range(_SPARSITY_PROBES):
+
+            # Move away from the current point, towards the side the fd
+            # form was picked for when there is a bound.
+            shifts = []
+            for src, i, i1, form, fd_step in columns:
+                i2 = self.in_bounds[src if isinstance(src, basestring)
+                                    else src[0]][1]
+                scale = max(abs(self.get_value(src, i1, i2, i)), 1.0)
+                shift = 1e-3*scale*rand.uniform(0.5, 1.0)
+                if form == 'backward' or \
+                   (form != 'forward' and rand.uniform() < 0.5):
+                    shift = -shift
+                shifts.append((src, i-i1, shift))
+                self.set_value(src, shift, i-i1)
 
-                # Pack Jacobian in either an array or a dictionary.
-                if self.return_format == 'dict':
-                    start = end = 0
-                    for okey in outputs:
+            self.system.run(iterbase)
+            self.get_outputs(self.y_base, outputs)
+
+            for k, (src, i, i1, form, fd_step) in enumerate(columns):
+                Jfd = self._solve_column(src, i-i1, form, fd_step, outputs,
+                                         iterbase)
+                masks[k] |= self._nonzero(Jfd)
+
+            for src, index, shift in shifts:
+                self.set_value(src, -shift, index)
+
+        self.y_base[:] = y_base
+        return [mask.nonzero()[0] for mask in masks]
+
+    @staticmethod
+    def _nonzero(Jfd):
+        """Return mask of the nonzero entries of a Jacobian column. Entries
+        far below the largest one are roundoff from restoring the previous
+        perturbation, and are below what fd can resolve anyway."""
+
+        mag = abs(Jfd)
+        return mag > 1e-8*mag.max()
+
+    def _color(self, columns):
+        """Return a list of groups of column numbers. No two columns in a
+        group have a nonzero in the same row of the sparsity pattern, and
+        all columns in a group use the same fd form, so each group can be
+        perturbed at once. Complex step columns are always alone."""
+
+        groups = []
+        masks = []
+
+        # Place the densest columns first.
+        order = sorted(range(len(columns)),
+                       key=lambda k: len(self.sparsity[k]), reverse=True)
+
+        for k in order:
+            form = columns[k][3]
+            rows = self.sparsity[k]
+
+            for group, mask in zip(groups, masks):
+                if form != 'complex_step' and \
+                   columns[group[0]][3] == form and not mask[rows].any():
+                    group.append(k)
+                    mask[rows] = True
+                    break
+            else:
+                mask = zeros(self.y_base.shape, dtype=bool)
+                mask[rows] = True
+                groups.append([k])
+                masks.append(mask)
+
+        return groups
+
+    def _solve_groups(self, columns, groups, outputs, iterbase, parallel):
+        """Return the Jacobian columns for the given list of columns,
+        perturbing every column in a group together. If parallel is True,
+        the perturbed points are run in a pool of forked processes, each
+        of which works on its own copy of the model at the current point.
+        Complex step columns are always run in this process."""
+
+        global _FD_WORKER
+
+        points = []
+        for group in groups:
+            form = columns[group[0]][3]
+            if form in ('forward', 'central'):
+                points.append([(columns[k][0], columns[k][1]-columns[k][2],
+                                columns[k][4]) for k in group])
+            if form in ('backward', 'central'):
+                points.append([(columns[k][0], columns[k][1]-columns[k][2],
+                                -columns[k][4]) for k in group])
+
+        if parallel and points:
+            # The pool must be created after this is set so that the forked
+            # workers see it.
+            _FD_WORKER = (self, outputs, iterbase)
+            pool = Pool(min(self.num_procs, len(points)))
+            try:
+                results = pool.map(_run_fd_point, points, chunksize=1)
+            finally:
+                pool.close()
+                pool.join()
+                _FD_WORKER = None
+        else:
+            results = [self._run_point(point, outputs, iterbase)
+                       for point in points]
+
+        jacs = [None] * len(columns)
+        results = iter(results)
+        for group in groups:
+
+            form = columns[group[0]][3]
+            if form == 'forward':
+                diff = results.next() - self.y_base
+            elif form == 'backward':
+                diff = self.y_base - results.next()
+            elif form == 'central':
+                diff = 0.5*(results.next() - results.next())
+            else:
+                for k in group:
+                    src, i, i1, form, fd_step = columns[k]
+                    jacs[k] = self._solve_column(src, i-i1, form, fd_step,
+                                                 outputs, iterbase)
+                continue
 
-                        sz = uvec[okey].size
-                        end += sz
-                        #print Jfd, start, end, i, self.J
-                        self.J[okey][src][:, i-i1] = Jfd[start:end]
-                        start += sz
+            # Unpack each column's rows from the combined difference.
+            for k in group:
+                fd_step = columns[k][4]
+                if self.sparsity is None:
+                    jacs[k] = diff/fd_step
                 else:
-                    self.J[:, i] = Jfd
+                    rows = self.sparsity[k]
+                    jacs[k] = zeros(diff.shape)
+                    jacs[k][rows] = diff[rows]/fd_step
 
-        # Restore final inputs/outputs.
-        uvec.set_from_array(self.y_base, outputs)
-        uvec.set_to_scope(self.scope)
+        return jacs
 
-        #print 'after FD', self.J
-        return self.J
+    def _run_point(self, point, outputs, iterbase):
+        """Runs the model with every (src, index, step) perturbation in
+        point applied, and returns a copy of the flattened outputs."""
+
+        for src, index, step in point:
+            self.set_value(src, step, index)
+
+        self.system.run(iterbase)
+        y = zeros(self.y.shape)
+        self.get_outputs(y, outputs)
+
+        for src, index, step in point:
+            self.set_value(src, -step, index)
+
+        return y
 
     def get_outputs(self, x, outputs):
         """Return matrix of flattened values from output edges."""
@@ -10,6 +10,7 @@ import weakref
 
 from numpy import ndarray
 
+from openmdao.main.evalplan import EvalPlan
 from openmdao.main.expreval import ExprEvaluator
 from openmdao.main.interfaces import IHas2SidedConstraints, IDriver
 from openmdao.main.pseudocomp import PseudoComponent, \
@@ -420,6 +421,7 @@ class _HasConstraintsBase(object):
     def __init__(self, parent, allowed_types=None):
         self._constraints = OrderedDict()
         self._parent = None if parent is None else weakref.ref(parent)
+        self._plan = EvalPlan()
 
     def __getstate__(self):
         state = self.__dict__.copy()
@@ -597,6 +599,24 @@ class _HasConstraintsBase(object):
         """
         return len(self._constraints)
 
+    def _eval_constraints(self, scope=None):
+        """Returns a list of the values of all of our constraints, gathered
+        from the System vectors in one go if possible.
+        """
+        scope = _get_scope(self, scope)
+        constraints = self._constraints.values()
+        if not constraints:
+            return []
+
+        values = self._plan.evaluate(scope, constraints)
+        if values is not None:
+            return values.tolist()
+
+        result = []
+        for constraint in constraints:
+            result.extend(constraint.evaluate(scope))
+        return result
+
 
 class HasEqConstraints(_HasConstraintsBase):
     """Add this class as a delegate if your Driver supports equality
@@ -727,11 +747,7 @@ class HasEqConstraints(_HasConstraintsBase):
 
     def eval_eq_constraints(self, scope=None):
         """Returns a list of constraint values."""
-        scope = _get_scope(self, scope)
-        result = []
-        for constraint in self._constraints.values():
-            result.extend(constraint.evaluate(scope))
-        return result
+        return self._eval_constraints(scope)
 
     def list_eq_constraint_targets(self):
         """Returns a list of outputs suitable for calc_gradient()."""
@@ -874,11 +890,7 @@ class HasIneqConstraints(_HasConstraintsBase):
 
     def eval_ineq_constraints(self, scope=None):
         """Returns a list of constraint values."""
-        scope = _get_scope(self, scope)
-        result = []
-        for constraint in self._constraints.values():
-            result.extend(constraint.evaluate(scope))
-        return result
+        return self._eval_constraints(scope)
 
     def list_ineq_constraint_targets(self):
         """Returns a list of outputs suitable for calc_gradient()."""
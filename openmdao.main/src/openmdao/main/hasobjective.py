@@ -2,6 +2,7 @@
 from collections import OrderedDict
 import weakref
 
+from openmdao.main.evalplan import EvalPlan
 from openmdao.main.expreval import ConnectedExprEvaluator
 from openmdao.main.pseudocomp import PseudoComponent, _remove_spaces
 from openmdao.main.interfaces import IDriver
@@ -69,6 +70,7 @@ class HasObjectives(object):
         # max_objectives of 0 means unlimited objectives
         self._max_objectives = max_objectives
         self._parent = None if parent is None else weakref.ref(parent)
+        self._plan = EvalPlan()
 
     def __getstate__(self):
         state = self.__dict__.copy()
@@ -239,7 +241,12 @@ class HasObjectives(object):
     def eval_objectives(self):
         """Returns a list of values of the evaluated objectives."""
         scope = self._get_scope()
-        return [obj.evaluate(scope) for obj in self._objectives.values()]
+        objectives = self._objectives.values()
+        if objectives:
+            values = self._plan.evaluate(scope, objectives)
+            if values is not None:
+                return self._plan.split(values, shaped=False)
+        return [obj.evaluate(scope) for obj in objectives]
 
     def eval_named_objective(self, name):
         """Returns the value of objective `name`."""
@@ -3,6 +3,7 @@ from collections import OrderedDict
 
 from openmdao.main.vartree import VariableTree
 from openmdao.main.datatypes.api import List, VarTree
+from openmdao.main.evalplan import EvalPlan
 from openmdao.main.expreval import ConnectedExprEvaluator
 from openmdao.main.pseudocomp import PseudoComponent, _remove_spaces
 from openmdao.main.variable import make_legal_path
@@ -45,6 +46,7 @@ class HasResponses(object):
     def __init__(self, parent):
         self._responses = OrderedDict()
         self._parent = None if parent is None else weakref.ref(parent)
+        self._plan = EvalPlan()
 
     def __getstate__(self):
         state = self.__dict__.copy()
@@ -194,8 +196,14 @@ class HasResponses(object):
     def eval_responses(self):
         """Returns a list of values of the evaluated responses."""
         scope = self._get_scope()
+        items = self._responses.values()
+        if items:
+            values = self._plan.evaluate(scope, items)
+            if values is not None:
+                return self._plan.split(values)
+
         responses = []
-        for response in self._responses.values():
+        for response in items:
             pcomp = getattr(scope, response.pcomp_name)
             responses.append(pcomp.out0)
         return responses
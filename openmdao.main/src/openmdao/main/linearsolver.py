@@ -7,10 +7,14 @@ import traceback
 
 # pylint: disable=E0611, F0401
 import numpy as np
-from scipy.sparse.linalg import gmres, LinearOperator
+from scipy.linalg import lu_factor, lu_solve
+from scipy.sparse import coo_matrix
+from scipy.sparse.linalg import gmres, splu, LinearOperator
 
+from openmdao.main.derivatives import get_bounds, reduce_jacobian
+from openmdao.main.interfaces import IAssembly, IDriver, IImplicitComponent
 from openmdao.main.mpiwrap import MPI, PETSc, get_norm
-from openmdao.util.graph import fix_single_tuple
+from openmdao.util.graph import fix_single_tuple, list_deriv_vars
 from openmdao.util.log import logger
 
 
@@ -97,6 +101,336 @@ class LinearSolver(object):
                 csize = self._system.get_size(con)
                 J[con][param] = np.zeros((csize, psize))
 
+    def mult(self, arg):
+        """ Applies the Jacobian matrix of the system to arg. Mode is
+        determined by the system. This is also the GMRES callback."""
+
+        system = self._system
+        system.sol_vec.array[:] = arg[:]
+
+        # Start with a clean slate
+        system.rhs_vec.array[:] = 0.0
+        system.clear_dp()
+
+        if system._parent_system:
+            vnames = system._parent_system._relevant_vars
+        else:
+            vnames = system.flat_vars.keys()
+        system.applyJ(vnames)
+
+        #print system.name, 'mult: arg, result', arg, system.rhs_vec.array[:]
+        #print system.rhs_vec.keys()
+        return system.rhs_vec.array[:]
+
+    def assemble(self):
+        """ Assembles the linear operator of the system column by column
+        and returns it as a dense 2D array. The operator stays valid until
+        the system is linearized again.
+        """
+
+        system = self._system
+        n_edge = system.rhs_buf.size
+
+        A = np.zeros((n_edge, n_edge))
+        arg = np.zeros((n_edge, ))
+        for icol in xrange(n_edge):
+            arg[icol] = 1.0
+            A[:, icol] = self.mult(arg)
+            arg[icol] = 0.0
+
+        system.sol_vec.array[:] = 0.0
+        system.rhs_vec.array[:] = 0.0
+        system.clear_dp()
+
+        return A
+
+    def assemble_sparse(self):
+        """ Assembles the linear operator from the Jacobians that the
+        components returned from provideJ, and returns it as a sparse
+        matrix. Returns None if any subsystem can't be expressed that way
+        (e.g., drivers, assemblies, implicit components, components that
+        only provide apply_deriv, or variables that can't be located in our
+        u vector).
+        """
+
+        # Import here to avoid a circular import.
+        from openmdao.main.systems import SimpleSystem, VarSystem
+
+        system = self._system
+        n_edge = system.rhs_buf.size
+
+        if system._parent_system:
+            variables = system._parent_system._relevant_vars
+        else:
+            variables = system.flat_vars.keys()
+
+        # Outputs and params are all on the diagonal.
+        rows = [np.arange(n_edge)]
+        cols = [np.arange(n_edge)]
+        data = [np.ones(n_edge)]
+
+        for sub in system.simple_subsystems():
+
+            if isinstance(sub, VarSystem):
+                continue
+
+            comp = sub._comp
+            if type(sub) is not SimpleSystem or sub._mapped_resids or \
+               sub.J is None or IImplicitComponent.providedBy(comp) or \
+               IAssembly.providedBy(comp) or IDriver.providedBy(comp) or \
+               not self._add_blocks(sub, variables, rows, cols, data):
+                logger.debug("%s: can't assemble the Jacobian of '%s' "
+                             "from provideJ.", system.name, sub.name)
+                return None
+
+        rows = np.hstack(rows)
+        cols = np.hstack(cols)
+        data = np.hstack(data)
+
+        A = coo_matrix((data, (rows, cols)), shape=(n_edge, n_edge))
+        if system.mode == 'adjoint':
+            A = A.T
+
+        return A
+
+    def _add_blocks(self, sub, variables, rows, cols, data):
+        """ Adds the negated provideJ Jacobian of the component in the
+        given SimpleSystem to the coordinate lists, mapping each input and
+        output onto its location in our u vector. Returns False if some
+        block can't be placed, in which case nothing is added."""
+
+        comp = sub._comp
+        J = sub.J
+        name2collapsed = self._system.scope.name2collapsed
+        strict = comp.missing_deriv_policy == 'error'
+
+        if comp._provideJ_bounds is None:
+            input_keys, output_keys = list_deriv_vars(comp)
+            comp._provideJ_bounds = get_bounds(comp, input_keys, output_keys, J)
+        ibounds, obounds = comp._provideJ_bounds
+
+        inputs = []
+        for item in sub.list_inputs():
+            collapsed = name2collapsed.get(item)
+            if collapsed not in variables:
+                continue
+
+            in_idx = self._u_indices(collapsed)
+            if in_idx is None:
+                return False
+            inputs.append((item.partition('.')[-1], in_idx))
+
+        new_rows = []
+        new_cols = []
+        new_data = []
+        out_rows = set()
+        for item in sub.list_outputs():
+            collapsed = name2collapsed.get(item)
+            if collapsed not in variables:
+                continue
+
+            out_idx = self._u_indices(collapsed)
+            if out_idx is None:
+                return False
+
+            # A subvar of an output that is already in our u vector must not
+            # be added a second time.
+            if out_rows.intersection(out_idx):
+                continue
+            out_rows.update(out_idx)
+
+            okey = item.partition('.')[-1]
+            odx = None
+            if okey in obounds:
+                o1, o2, osh = obounds[okey]
+            else:
+                basekey, _, odx = okey.partition('[')
+                try:
+                    o1, o2, osh = obounds[basekey]
+                except KeyError:
+                    if strict:
+                        return False
+                    continue
+
+            used = set()
+            for ikey, in_idx in inputs:
+
+                idx = None
+                if ikey in ibounds:
+                    i1, i2, ish = ibounds[ikey]
+                    if (i1, i2) in used:
+                        continue
+                    used.add((i1, i2))
+                else:
+                    basekey, _, idx = ikey.partition('[')
+                    try:
+                        i1, i2, ish = ibounds[basekey]
+                    except KeyError:
+                        if strict:
+                            return False
+                        continue
+
+                    if (i1, i2, idx) in used or (i1, i2) in used:
+                        continue
+                    used.add((i1, i2, idx))
+
+                Jsub = reduce_jacobian(J, i1, i2, idx, ish, o1, o2, odx, osh)
+                Jsub = np.atleast_2d(Jsub)
+                if Jsub.size != len(out_idx)*len(in_idx):
+                    return False
+                Jsub = Jsub.reshape((len(out_idx), len(in_idx)))
+
+                new_rows.append(np.repeat(out_idx, len(in_idx)))
+                new_cols.append(np.tile(in_idx, len(out_idx)))
+                new_data.append(-Jsub.flatten())
+
+        rows.extend(new_rows)
+        cols.extend(new_cols)
+        data.extend(new_data)
+        return True
+
+    def _u_indices(self, name):
+        """ Returns the indices of the given collapsed variable node in our
+        u vector, or None if the variable is not part of it."""
+
+        system = self._system
+        uvec = system.vec['u']
+        if name in uvec:
+            return uvec.indices(system, name)
+
+        # A subvar whose base variable is in the vector.
+        meta = system.scope._var_meta.get(name, {})
+        base = meta.get('basevar')
+        if base is None:
+            return None
+
+        base = system.scope.name2collapsed[base]
+        if base not in uvec:
+            return None
+        return uvec.indices(system, base)[meta['flat_idx']]
+
+    def linearized(self):
+        """ Called after the system has been linearized. Solvers that cache
+        anything derived from the local Jacobians should drop it here."""
+        pass
+
+    def solve_block(self, RHS):
+        """ Solves the system for every column of the 2D array RHS and
+        returns the solutions as columns of a 2D array. If the components
+        provide explicit Jacobians, the sparse operator is factored once and
+        all columns are back-substituted together. Otherwise the operator
+        can only be assembled with one matrix vector product per unknown, so
+        that is only done when there are at least as many columns as
+        unknowns, and each column is solved separately when there aren't.
+        """
+
+        A = self.assemble_sparse()
+        if A is not None:
+            return splu(A.tocsc()).solve(RHS)
+
+        n_edge, n_rhs = RHS.shape
+        if n_edge <= n_rhs:
+            return lu_solve(lu_factor(self.assemble()), RHS)
+
+        system = self._system
+        dx = np.zeros(RHS.shape)
+        for icol in xrange(n_rhs):
+            system.clear_dp()
+            system.sol_vec.array[:] = 0.0
+            system.rhs_vec.array[:] = RHS[:, icol]
+            dx[:, icol] = self.solve(RHS[:, icol].copy())
+        return dx
+
+    def calc_gradient_block(self, inputs, outputs, return_format='array'):
+        """ Returns a Jacobian of outputs with respect to inputs. All
+        right-hand sides are gathered into a single 2D array and handed
+        to solve_block instead of running one linear solve per column.
+        """
+
+        system = self._system
+
+        if return_format == 'dict':
+            J = {}
+            for okey in outputs:
+                J[okey] = {}
+                for ikey in inputs:
+                    if isinstance(ikey, tuple):
+                        ikey = ikey[0]
+                    J[okey][ikey] = None
+        else:
+            num_input = system.get_size(inputs)
+            num_output = system.get_size(outputs)
+            J = np.zeros((num_output, num_input))
+
+        if system.mode == 'adjoint':
+            outputs, inputs = inputs, outputs
+
+        # Gather the unit right-hand sides for every param.
+        params = []
+        num_rhs = 0
+        for param in inputs:
+
+            if isinstance(param, tuple):
+                param = param[0]
+
+            in_indices = system.vec['u'].indices(system, param)
+
+            # Did the user define a custom Jacobian for a constraint?
+            if system.mode == 'adjoint' and param in self.custom_jacs:
+                self.user_defined_jacobian(param, outputs, J)
+                params.append((param, in_indices, None))
+                continue
+
+            params.append((param, in_indices, num_rhs))
+            num_rhs += len(in_indices)
+
+        out_indices = []
+        for item in outputs:
+            if isinstance(item, tuple):
+                item = item[0]
+            out_indices.append((item, system.vec['u'].indices(system, item)))
+
+        if num_rhs == 0:
+            return J
+
+        RHS = np.zeros((system.rhs_buf.size, num_rhs))
+        for param, in_indices, col in params:
+            if col is not None:
+                RHS[in_indices, np.arange(col, col+len(in_indices))] = 1.0
+
+        dx = self.solve_block(RHS)
+
+        j = 0
+        for param, in_indices, col in params:
+
+            nj = len(in_indices)
+            if col is None:
+                j += nj
+                continue
+
+            i = 0
+            for item, indices in out_indices:
+
+                nk = len(indices)
+                block = dx[indices, col:col+nj]
+
+                if return_format == 'dict':
+                    if system.mode == 'forward':
+                        J[item][param] = block.copy()
+                    else:
+                        J[param][item] = block.T.copy()
+
+                else:
+                    if system.mode == 'forward':
+                        J[i:i+nk, j:j+nj] = block
+                    else:
+                        J[j:j+nj, i:i+nk] = block.T
+                    i += nk
+
+            j += nj
+
+        return J
+
 
 class ScipyGMRES(LinearSolver):
     """ Scipy's GMRES Solver. This is a serial solver, so
@@ -122,6 +456,9 @@ class ScipyGMRES(LinearSolver):
         with respect to inputs.
         """
 
+        if self.options.block_solve:
+            return self.calc_gradient_block(inputs, outputs, return_format)
+
         system = self._system
         RHS = system.rhs_buf
         A = self.A
@@ -225,27 +562,6 @@ class ScipyGMRES(LinearSolver):
         return dx
 
 
-    def mult(self, arg):
-        """ GMRES Callback: applies Jacobian matrix. Mode is determined by the
-        system."""
-
-        system = self._system
-        system.sol_vec.array[:] = arg[:]
-
-        # Start with a clean slate
-        system.rhs_vec.array[:] = 0.0
-        system.clear_dp()
-
-        if system._parent_system:
-            vnames = system._parent_system._relevant_vars
-        else:
-            vnames = system.flat_vars.keys()
-        system.applyJ(vnames)
-
-        #print system.name, 'mult: arg, result', arg, system.rhs_vec.array[:]
-        #print system.rhs_vec.keys()
-        return system.rhs_vec.array[:]
-
 
 class PETSc_KSP(LinearSolver):
     """ PETSc's KSP solver with preconditioning. MPI is supported."""
@@ -464,6 +780,9 @@ class LinearGS(LinearSolver):
         with respect to inputs.
         """
 
+        if self.options.block_solve:
+            return self.calc_gradient_block(inputs, outputs, return_format)
+
         system = self._system
 
         # Size the problem
@@ -629,3 +948,77 @@ class LinearGS(LinearSolver):
             #print "pZZ", psys.vec['du'].array, psys.vec['dp'].array, psys.vec['df'].array; sys.stdout.flush()
 
         return system.sol_vec.array
+
+
+class DirectSparseLU(LinearSolver):
+    """ Direct solver that assembles the Jacobian of the whole System into a
+    sparse matrix, factors it once per linearization, and reuses that
+    factorization for every right-hand side. This is a serial solver, so
+    it should never be used in an MPI setting.
+    """
+
+    ln_string = 'LU'
+
+    def __init__(self, system):
+        """ Set up DirectSparseLU object """
+        super(DirectSparseLU, self).__init__(system)
+
+        n_edge = system.vec['f'].array.size
+
+        system.rhs_buf = np.zeros((n_edge, ))
+        system.sol_buf = np.zeros((n_edge, ))
+        self._lu = None
+
+    def linearized(self):
+        """ The local Jacobians changed, so our factorization is stale."""
+        self._lu = None
+
+    def calc_gradient(self, inputs, outputs, return_format='array'):
+        """ Returns a Jacobian of outputs with respect to inputs, solving
+        for all right-hand sides with a single factorization.
+        """
+
+        return self.calc_gradient_block(inputs, outputs, return_format)
+
+    def solve(self, arg):
+        """ Solve the coupled equations for a new state vector that nulls the
+        residual. Used by the Newton solvers."""
+
+        return self.solve_block(arg)
+
+    def solve_block(self, RHS):
+        """ Back-substitutes a 1D or 2D right-hand side through the cached
+        factorization, factoring first if needed."""
+
+        system = self._system
+        if self._lu is None or self._lu[0] != system.mode:
+
+            # We may be factoring in the middle of a solve_linear of a
+            # parent system, so leave its vectors the way we found them.
+            vecs = (system.sol_vec, system.rhs_vec, system.vec['dp'])
+            saved = [vec.array.copy() for vec in vecs]
+            try:
+                self._lu = (system.mode, self.factor())
+            finally:
+                for vec, array in zip(vecs, saved):
+                    vec.array[:] = array
+
+        return self._lu[1].solve(RHS)
+
+    def factor(self):
+        """ Returns the sparse LU factorization of the assembled linear
+        operator."""
+
+        return splu(self.assemble().tocsc())
+
+    def assemble(self):
+        """ Assembles the linear operator from the Jacobians that the
+        components returned from provideJ, and returns it as a sparse
+        matrix. If that isn't possible, every column is instead found with
+        a matrix vector product.
+        """
+
+        A = self.assemble_sparse()
+        if A is None:
+            A = coo_matrix(super(DirectSparseLU, self).assemble())
+        return A
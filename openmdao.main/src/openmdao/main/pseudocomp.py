@@ -15,7 +15,8 @@ from openmdao.main.mp_support import has_interface
 from openmdao.main.mpiwrap import MPI_info
 from openmdao.main.index import deep_getattr
 
-from openmdao.units.units import PhysicalQuantity, UnitsOnlyPQ
+from openmdao.units.units import PhysicalQuantity, UnitsOnlyPQ, \
+                                 get_conversion
 from openmdao.util.typegroups import int_types, complex_or_real_types
 
 
@@ -52,14 +53,19 @@ def unit_xform(node, in_units, out_units):
     """Transforms an ast into expr*scaler+adder where scaler
     and adder are from units conversion.
     """
-    inpq = PhysicalQuantity(1.0, in_units)
-    outpq = PhysicalQuantity(1.0, out_units)
+    scaler, adder = _get_conversion(in_units, out_units)
+    return scaler_adder_xform(node, scaler, adder)
+
+
+def _get_conversion(in_units, out_units):
+    """Returns the (scaler, adder) for a units conversion."""
     try:
-        scaler, adder = inpq.unit.conversion_tuple_to(outpq.unit)
+        return get_conversion(in_units, out_units)
     except TypeError:
+        inpq = PhysicalQuantity(1.0, in_units)
+        outpq = PhysicalQuantity(1.0, out_units)
         raise TypeError("units '%s' are incompatible with assigning units of"
                         " '%s'" % (inpq.get_unit_name(), outpq.get_unit_name()))
-    return scaler_adder_xform(node, scaler, adder)
 
 
 class DummyExpr(object):
@@ -150,6 +156,7 @@ class PseudoComponent(object):
 
         out_units = self._meta['out0'].get('units')
         pq = None
+        self._conversion = None
         if out_units is not None:
             # evaluate the src expression using UnitsOnlyPQ objects
 
@@ -168,10 +175,14 @@ class PseudoComponent(object):
 
             unitnode = ast.parse(xformed_src)
             try:
-                unitxform = unit_xform(unitnode, self._srcunits, out_units)
+                scaler, adder = _get_conversion(self._srcunits, out_units)
             except Exception as err:
                 raise TypeError("Incompatible units for '%s' and '%s': %s"
                                 % (srcexpr.text, destexpr.text, err))
+            if xformed_src.strip() in self._inputs:
+                # A plain connection, so evaluate just does the conversion.
+                self._conversion = (xformed_src.strip(), scaler, adder)
+            unitxform = scaler_adder_xform(unitnode, scaler, adder)
             unit_src = print_node(unitxform)
             xformed_src = unit_src
         else:
@@ -203,6 +214,7 @@ class PseudoComponent(object):
         return state
 
     def __setstate__(self, state):
+        state.setdefault('_conversion', None)
         self.__dict__.update(state)
         self.parent = state['_parent']
 
@@ -298,16 +310,23 @@ class PseudoComponent(object):
                                              self.name+'.out0')
 
     def run(self, case_uuid=''):
-        if self._negate:
-            setattr(self, 'out0', -self._srcexpr.evaluate())
-        else:
-            setattr(self, 'out0', self._srcexpr.evaluate())
+        self.evaluate()
 
     def evaluate(self):
+        if self._conversion is None:
+            value = self._srcexpr.evaluate()
+        else:
+            name, scaler, adder = self._conversion
+            value = getattr(self, name)
+            # same operations as the expression from scaler_adder_xform
+            if adder != 0.0:
+                value = value + adder
+            if scaler != 1.0:
+                value = value * scaler
         if self._negate:
-            setattr(self, 'out0', -self._srcexpr.evaluate())
+            setattr(self, 'out0', -value)
         else:
-            setattr(self, 'out0', self._srcexpr.evaluate())
+            setattr(self, 'out0', value)
 
     def get(self, name):
         return getattr(self, name)
@@ -573,10 +592,8 @@ class UnitConversionPComp(PseudoComponent):
         """
         super(UnitConversionPComp, self).ensure_init()
 
-        src    = PhysicalQuantity(1.0, self._srcunits)
         target = self._meta['out0'].get('units')
-        src.convert_to_unit(target)
-        self.grad = src.get_value()
+        self.grad = get_conversion(self._srcunits, target)[0]
 
     def provideJ(self):
         """No need to pre-calculate."""
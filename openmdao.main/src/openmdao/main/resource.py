@@ -117,6 +117,13 @@ class ResourceAllocationManager(object):
         self._allocations = 0
         self._allocators = []
         self._deployed_servers = {}
+        self._host_times = {}  # Smoothed execution times keyed by host.
+        self._pool = {}        # Idle (server, info, time) lists keyed by key.
+        self._pool_keys = {}   # Pool keys of pooled servers keyed by id.
+        self.pool_timeout = 300.  # Seconds before idle servers are released.
+        self.pool_max_idle = 0    # Max idle servers per key, 0 => no limit.
+        self._reaper = None    # Thread releasing expired pooled servers.
+        self._reaper_wakeup = threading.Event()
         self._allocators.append(LocalAllocator('LocalHost',
                                                authkey='PublicKey',
                                                allow_shell=True))
@@ -381,6 +388,39 @@ class ResourceAllocationManager(object):
             else:  #pragma no cover
                 time.sleep(1)  # Wait a bit between retries.
 
+    @staticmethod
+    def record_time(hostname, seconds, smoothing=0.5):
+        """
+        Record the time taken by a typical job on `hostname`.
+        Allocators which don't provide their own estimate will then report
+        the smoothed recorded time for their hosts, so that faster hosts
+        are preferred.
+
+        hostname: string
+            Host the job ran on.
+
+        seconds: float
+            Execution time of the job.
+
+        smoothing: float
+            Weight given to previously recorded times.
+        """
+        ram = ResourceAllocationManager._get_instance()
+        with ResourceAllocationManager._lock:
+            old = ram._host_times.get(hostname)
+            if old is not None:
+                seconds = smoothing * old + (1. - smoothing) * seconds
+            ram._host_times[hostname] = seconds
+
+    def _host_estimate(self, criteria):
+        """ Return estimate from recorded times for hosts in `criteria`. """
+        times = [self._host_times[name]
+                 for name in criteria.get('hostnames', ())
+                 if name in self._host_times]
+        if times:
+            return sum(times) / len(times)
+        return 0
+
     @staticmethod
     def get_hostnames(resource_desc):
         """
@@ -420,6 +460,8 @@ class ResourceAllocationManager(object):
 
         for allocator in self._allocators:
             estimate, criteria = allocator.time_estimate(resource_desc)
+            if estimate == 0 and self._host_times:
+                estimate = self._host_estimate(criteria)
             if estimate == -2:
                 key = criteria.keys()[0]
                 info = criteria[key]
@@ -431,7 +473,7 @@ class ResourceAllocationManager(object):
 
             if (best_estimate == -2 and estimate >= -1) or \
                (best_estimate == 0  and estimate >  0) or \
-               (best_estimate >  0  and estimate < best_estimate):
+               (best_estimate >  0  and 0 < estimate < best_estimate):
                 # All current allocators support 'hostnames'.
                 if estimate >= 0 and need_hostnames \
                    and not 'hostnames' in criteria:  #pragma no cover
@@ -476,6 +518,158 @@ class ResourceAllocationManager(object):
             self._logger.error("Can't release %r: %r", server_info['name'], exc)
         server._close.cancel()
 
+    @staticmethod
+    def allocate_pooled(resource_desc, key=None):
+        """
+        Like :meth:`allocate`, but first tries to reuse an idle server which
+        was returned with :meth:`release_pooled` under the same `key`.
+        The server-dict stays with the server while it's pooled, so callers
+        may use it to remember state such as which model is loaded.
+        Returns ``(proxy-object, server-dict)``.
+
+        resource_desc: dict
+            Description of required resources.
+
+        key: string
+            Identifies servers which may be shared. By default the key is
+            derived from `resource_desc`.
+        """
+        ResourceAllocationManager.validate_resources(resource_desc)
+        if key is None:
+            key = repr(sorted(resource_desc.items()))
+        ram = ResourceAllocationManager._get_instance()
+        server = None
+        with ResourceAllocationManager._lock:
+            expired = ram._expire_pooled()
+            idle = ram._pool.get(key)
+            if idle:
+                server, server_info, released = idle.pop()
+        for old in expired:
+            ram._release(old)
+
+        if server is None:
+            server, server_info = ResourceAllocationManager.allocate(resource_desc)
+            if server is None:
+                return (None, None)
+        else:
+            ram._logger.debug('reusing pooled %r', server_info['name'])
+        with ResourceAllocationManager._lock:
+            ram._pool_keys[id(server)] = key
+        return (server, server_info)
+
+    @staticmethod
+    def release_pooled(server):
+        """
+        Return a server obtained from :meth:`allocate_pooled` to the pool.
+        It is released once idle for longer than `pool_timeout` seconds
+        or if there are more than `pool_max_idle` idle servers for its key.
+
+        server: :class:`OpenMDAO_Proxy`
+            Server to be returned.
+        """
+        ram = ResourceAllocationManager._get_instance()
+        with ResourceAllocationManager._lock:
+            key = ram._pool_keys.pop(id(server), None)
+            if key is None or id(server) not in ram._deployed_servers:
+                expired = [server]
+            else:
+                server_info = ram._deployed_servers[id(server)][2]
+                idle = ram._pool.setdefault(key, [])
+                idle.append((server, server_info, time.time()))
+                expired = ram._expire_pooled()
+                ram._start_reaper()
+        for old in expired:
+            ram._release(old)
+
+    @staticmethod
+    def configure_pool(timeout=None, max_idle=None):
+        """
+        Set the idle `timeout` (seconds) and the maximum number of idle
+        servers per key (0 for no limit) for pooled servers.
+        """
+        ram = ResourceAllocationManager._get_instance()
+        with ResourceAllocationManager._lock:
+            if timeout is not None:
+                ram.pool_timeout = timeout
+            if max_idle is not None:
+                ram.pool_max_idle = max_idle
+            expired = ram._expire_pooled()
+            ram._reaper_wakeup.set()
+        for old in expired:
+            ram._release(old)
+
+    @staticmethod
+    def drain_pool():
+        """ Release all idle pooled servers. """
+        ram = ResourceAllocationManager._get_instance()
+        with ResourceAllocationManager._lock:
+            servers = []
+            for idle in ram._pool.values():
+                servers.extend(server for server, info, released in idle)
+            ram._pool = {}
+            ram._reaper_wakeup.set()
+        for server in servers:
+            ram._release(server)
+
+    @staticmethod
+    def pooled_servers():
+        """ Return the number of idle pooled servers. """
+        ram = ResourceAllocationManager._get_instance()
+        with ResourceAllocationManager._lock:
+            return sum(len(idle) for idle in ram._pool.values())
+
+    def _expire_pooled(self):
+        """
+        Remove servers idle for too long, or in excess of `pool_max_idle`,
+        from the pool and return them. Called with the lock held.
+        """
+        expired = []
+        now = time.time()
+        for key, idle in self._pool.items():
+            keep = [entry for entry in idle
+                    if now - entry[2] < self.pool_timeout]
+            if self.pool_max_idle:
+                keep = keep[-self.pool_max_idle:]
+            kept = set(id(entry) for entry in keep)
+            expired.extend(entry[0] for entry in idle if id(entry) not in kept)
+            if keep:
+                self._pool[key] = keep
+            else:
+                del self._pool[key]
+        return expired
+
+    def _start_reaper(self):
+        """
+        Start a thread to release idle servers once they expire, so they
+        don't wait for the next pool access. Called with the lock held.
+        """
+        if self._reaper is None or not self._reaper.is_alive():
+            self._reaper = threading.Thread(target=self._reap,
+                                            args=(get_credentials(),),
+                                            name='PoolReaper')
+            self._reaper.daemon = True
+            self._reaper.start()
+
+    def _reap(self, credentials):
+        """ Release expired pooled servers until the pool is empty. """
+        set_credentials(credentials)
+        while True:
+            with ResourceAllocationManager._lock:
+                self._reaper_wakeup.clear()
+                expired = self._expire_pooled()
+                if self._pool:
+                    oldest = min(entry[2] for idle in self._pool.values()
+                                          for entry in idle)
+                    delay = oldest + self.pool_timeout - time.time()
+                else:
+                    self._reaper = None
+                    delay = None
+            for server in expired:
+                self._release(server)
+            if delay is None:
+                return
+            self._reaper_wakeup.wait(max(delay, 0.1))
+
     @staticmethod
     def add_remotes(server, prefix=''):
         """
@@ -1,6 +1,7 @@
 import sys
 from StringIO import StringIO
 from collections import OrderedDict
+from copy import deepcopy
 from itertools import chain
 
 import numpy
@@ -11,7 +12,8 @@ from zope.interface import implements
 from openmdao.main.mpiwrap import MPI, MPI_info, PETSc, get_norm
 from openmdao.main.exceptions import RunStopped
 from openmdao.main.finite_difference import FiniteDifference, DirectionalFD
-from openmdao.main.linearsolver import ScipyGMRES, PETSc_KSP, LinearGS
+from openmdao.main.linearsolver import ScipyGMRES, PETSc_KSP, LinearGS, \
+                                      DirectSparseLU
 from openmdao.main.mp_support import has_interface
 from openmdao.main.interfaces import IDriver, IAssembly, IImplicitComponent, \
                                      ISolver, IPseudoComp, IComponent, ISystem
@@ -24,6 +26,7 @@ from openmdao.main.derivatives import applyJ, applyJT
 from openmdao.util.graph import base_var
 from openmdao.main.pseudocomp import PseudoComponent
 from openmdao.main.variable import Variable
+import openmdao.util.log as tracing
 
 
 class System(object):
@@ -529,6 +532,8 @@ class System(object):
             self.vec[name] = InputVecWrapper(self, numpy.zeros(insize),
                                              name='.'.join((self.name, name)))
 
+        self.vec['p'].bind_to_scope(self.scope)
+
         start, end = 0, 0
         for sub in self.local_subsystems():
             sz = numpy.sum(sub.local_var_sizes[sub.mpi.rank, :])
@@ -746,10 +751,10 @@ class System(object):
 
             # scipy_gmres not supported in MPI, so swap with
             # petsc KSP.
-            if MPI and solver_choice=='scipy_gmres':
-                solver_choice = 'petsc_ksp'
-                msg = "scipy_gmres optimizer not supported in MPI. " + \
+            if MPI and solver_choice in ('scipy_gmres', 'direct_lu'):
+                msg = "%s optimizer not supported in MPI. " % solver_choice + \
                       "Using petsc_ksp instead."
+                solver_choice = 'petsc_ksp'
                 self.options.parent._logger.warning(msg)
 
             if solver_choice == 'scipy_gmres':
@@ -758,6 +763,8 @@ class System(object):
                 self.ln_solver = PETSc_KSP(self)
             elif solver_choice == 'linear_gs':
                 self.ln_solver = LinearGS(self)
+            elif solver_choice == 'direct_lu':
+                self.ln_solver = DirectSparseLU(self)
 
     def linearize(self):
         """ Linearize local subsystems. """
@@ -765,6 +772,9 @@ class System(object):
         for subsystem in self.local_subsystems():
             subsystem.linearize()
 
+        if self.ln_solver is not None:
+            self.ln_solver.linearized()
+
     def set_complex_step(self, complex_step=False):
         """ Toggles complex_step plumbing for this system and all
         local subsystems.
@@ -1034,6 +1044,12 @@ class SimpleSystem(System):
     def setup_scatters(self):
         pass
 
+    def setup_vectors(self, arrays=None, state_resid_map=None):
+        vec = super(SimpleSystem, self).setup_vectors(arrays, state_resid_map)
+        if vec is not None:
+            vec['u'].bind_to_scope(self.scope)
+        return vec
+
     def run(self, iterbase, case_label='', case_uuid=None):
 
         if self.is_active():
@@ -1631,8 +1647,45 @@ def _get_counts(names):
 
     return counts
 
+
+_NOT_COPIED = object()
+
+
+def _copy_value(value):
+    """Return a copy of an input value that later values can be compared
+    with, or _NOT_COPIED if it can't be copied.
+    """
+    if isinstance(value, numpy.ndarray):
+        return value.copy()
+    try:
+        return deepcopy(value)
+    except Exception:
+        return _NOT_COPIED
+
+
+def _same_value(value, old):
+    """Return True if value is known to equal the copied value old."""
+    if isinstance(value, numpy.ndarray) or isinstance(old, numpy.ndarray):
+        return numpy.array_equal(value, old)
+    try:
+        return bool(value == old)
+    except Exception:
+        return False
+
+
 class SerialSystem(CompoundSystem):
 
+    def __init__(self, scope, graph, subg, name=None):
+        super(SerialSystem, self).__init__(scope, graph, subg, name)
+
+        # subsystem name -> (p vector values, unconnected input values,
+        # output values) as of the last time that subsystem ran
+        self._clean_state = {}
+
+        # number of subsystems skipped during the last run, and in total
+        self.num_skipped = 0
+        self.total_skipped = 0
+
     def all_subsystems(self):
         return [self.graph.node[node]['system'] for node in self._ordering]
 
@@ -1682,6 +1735,8 @@ class SerialSystem(CompoundSystem):
         if self.is_active():
             #print "    runsys", str(self.name)
             self._stop = False
+            skip = self.scope.skip_clean and not self.complex_step
+            self.num_skipped = 0
 
             for sub in self.local_subsystems():
                 #print "PRE - scatter for %s" % self.name
@@ -1690,10 +1745,92 @@ class SerialSystem(CompoundSystem):
                 #print "POST - scatter for %s" % self.name
                 #self.dump_vars()
 
+                if skip:
+                    if self._is_clean(sub):
+                        self.num_skipped += 1
+                        continue
+                    self._clean_state.pop(sub.name, None)
+
                 sub.run(iterbase, case_label=case_label, case_uuid=case_uuid)
                 if self._stop:
                     raise RunStopped('Stop requested')
 
+                if skip:
+                    self._save_clean_state(sub)
+
+            if skip:
+                self.total_skipped += self.num_skipped
+                if tracing.TRACER is not None:
+                    tracing.TRACER.debug('%s: skipped %d of %d' %
+                                         (self.name, self.num_skipped,
+                                          len(self.local_subsystems())))
+
+    def _is_clean(self, sub):
+        """Return True if the inputs of the given subsystem, both the ones
+        in our p vector and the unconnected ones, and the outputs it placed
+        in our u vector, are the same as after it last ran.
+        """
+        state = self._clean_state.get(sub.name)
+        if state is None:
+            return False
+
+        ins, unconnected, outs = state
+
+        pvec = self.vec['p']
+        for name, value in ins:
+            if not numpy.array_equal(pvec[name], value):
+                return False
+
+        comp = sub._comp
+        for name, value in unconnected:
+            if not _same_value(comp.get(name), value):
+                return False
+
+        uvec = sub.vec['u']
+        for name, value in outs:
+            if not numpy.array_equal(uvec[name], value):
+                return False
+
+        return True
+
+    def _save_clean_state(self, sub):
+        """Record the inputs and outputs of the given subsystem after
+        running it, if it's one that may be skipped later.
+        """
+        if not isinstance(sub, SimpleSystem) or \
+           isinstance(sub, (VarSystem, EqConstraintSystem, AssemblySystem,
+                            OpaqueSystem, DriverSystem)):
+            return
+
+        # any input that isn't part of our p vector (e.g., a noflat
+        # variable) can't be checked, so the subsystem always runs
+        pvec = self.vec['p']
+        if [n for n in sub._in_nodes if n not in pvec]:
+            return
+
+        # inputs that are only partly connected are also compared by value
+        comp = sub._comp
+        prefix = comp.name + '.'
+        connected = set()
+        for node in sub._in_nodes:
+            dests = node[1] if isinstance(node, tuple) else (node,)
+            for dest in dests:
+                if dest.startswith(prefix):
+                    connected.add(dest[len(prefix):])
+
+        unconnected = []
+        for name in comp.list_inputs():
+            if name not in connected:
+                value = _copy_value(comp.get(name))
+                if value is _NOT_COPIED:
+                    return
+                unconnected.append((name, value))
+
+        ins = [(n, pvec[n].copy()) for n in sub._in_nodes]
+        uvec = sub.vec['u']
+        outs = [(n, uvec[n].copy()) for n in uvec.keys()]
+        self._clean_state[sub.name] = (ins, unconnected, outs)
+
     def evaluate(self, iterbase, case_label='', case_uuid=None):
         """ Evalutes a component's residuals without invoking its
         internal solve (for implicit comps.)
@@ -2222,6 +2359,9 @@ class TransparentDriverSystem(DriverSystem):
         for subsystem in self.local_subsystems():
             subsystem.linearize()
 
+        if self.ln_solver is not None:
+            self.ln_solver.linearized()
+
     def solve_linear(self, options=None):
         """ Single linear solve solution applied to whatever input is sitting
         in the RHS vector."""
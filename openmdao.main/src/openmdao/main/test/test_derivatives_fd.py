@@ -78,6 +78,26 @@ class ArrayParaboloid(Component):
         x = self.x
         self.f_x = (x[0][0]-3.0)**2 + x[0][0]*x[0][1] + (x[0][1]+4.0)**2 - 3.0
 
+class DiagonalComp(Component):
+
+    x = Array(np.ones(6), iotype='in')
+    y = Array(np.zeros(6), iotype='out')
+
+    def execute(self):
+        """ Each output only depends on one input """
+
+        self.y = self.x**2
+
+class ProductComp(Component):
+
+    x = Array(np.ones(2), iotype='in')
+    y = Array(np.zeros(2), iotype='out')
+
+    def execute(self):
+        """ dy0/dx0 is zero whenever x1 is """
+
+        self.y = np.array([self.x[0]*self.x[1], self.x[1]])
+
 class TestFiniteDifference(unittest.TestCase):
 
     def test_fd_step(self):
@@ -138,6 +158,73 @@ class TestFiniteDifference(unittest.TestCase):
         # Central gets this right even with a bad step
         assert_rel_error(self, J[0, 1], 4.0, 0.0001)
 
+    def test_parallel(self):
+
+        model = set_as_top(Assembly())
+        model.add('comp', MyComp())
+        model.driver.workflow.add(['comp'])
+        model.driver.gradient_options.fd_processes = 2
+
+        model.run()
+
+        J = model.driver.calc_gradient(inputs=['comp.x1', 'comp.x2',
+                                               'comp.x3'],
+                                       outputs=['comp.y'])
+
+        assert_rel_error(self, J[0, 0], 4.0, 0.0001)
+        assert_rel_error(self, J[0, 1], 4.2, 0.0001)
+        # x3 has a custom central form
+        assert_rel_error(self, J[0, 2], 4.0, 0.0001)
+
+        # Parent model is left at the base point.
+        self.assertEqual(model.comp.x1, 1.0)
+        self.assertEqual(model.comp.x2, 1.0)
+
+    def test_coloring(self):
+
+        model = set_as_top(Assembly())
+        model.add('comp', DiagonalComp())
+        model.driver.workflow.add(['comp'])
+        model.driver.gradient_options.fd_coloring = True
+        model.comp.x = np.arange(1.0, 7.0)
+
+        model.run()
+
+        # First pass finds the sparsity pattern.
+        J = model.driver.calc_gradient(inputs=['comp.x'], outputs=['comp.y'])
+        assert_rel_error(self, np.linalg.norm(J - np.diag(2.0*model.comp.x)),
+                         0.0, 0.0001)
+
+        count = model.comp.exec_count
+        J = model.driver.calc_gradient(inputs=['comp.x'], outputs=['comp.y'])
+        self.assertEqual(model.comp.exec_count - count, 1)
+        assert_rel_error(self, np.linalg.norm(J - np.diag(2.0*model.comp.x)),
+                         0.0, 0.0001)
+
+    def test_coloring_coincidental_zero(self):
+
+        model = set_as_top(Assembly())
+        model.add('comp', ProductComp())
+        model.driver.workflow.add(['comp'])
+        model.driver.gradient_options.fd_coloring = True
+        model.comp.x = np.array([1.0, 0.0])
+
+        model.run()
+
+        # dy0/dx0 is zero here, but not structurally.
+        J = model.driver.calc_gradient(inputs=['comp.x'], outputs=['comp.y'])
+        assert_rel_error(self, np.linalg.norm(J - np.array([[0., 1.],
+                                                            [0., 1.]])),
+                         0.0, 0.0001)
+
+        model.comp.x = np.array([1.0, 2.0])
+        model.run()
+
+        J = model.driver.calc_gradient(inputs=['comp.x'], outputs=['comp.y'])
+        assert_rel_error(self, np.linalg.norm(J - np.array([[2., 1.],
+                                                            [0., 1.]])),
+                         0.0, 0.0001)
+
     def test_fd_step_type_relative(self):
 
         model = set_as_top(Assembly())
@@ -2,6 +2,7 @@ import unittest
 import math
 import ast
 
+import numpy as np
 from numpy import array, eye, arange, roll, tile
 from openmdao.main.datatypes.array import Array
 from openmdao.main.expreval import ExprEvaluator, ConnectedExprEvaluator, \
@@ -655,6 +656,38 @@ class ExprEvalTestCase(unittest.TestCase):
         assert_rel_error(self, c2d_grad[2,2], 4.0, 0.00001)
         assert_rel_error(self, c2d_grad[3,3], 6.0, 0.00001)
 
+    def test_eval_gradient_symbolic(self):
+        top = set_as_top(Assembly())
+        top.add('comp1', A())
+        top.comp1.f = 0.5
+        top.run()
+
+        exp = ExprEvaluator('sin(comp1.c1d)*comp1.f + comp1.a1d/comp1.f',
+                            top.driver)
+        grad = exp.evaluate_gradient(scope=top)
+        self.assertNotEqual(exp.cached_grad_deriv, False)
+        assert_rel_error(self, grad['comp1.c1d'].ravel(),
+                         np.diag(np.cos(top.comp1.c1d)*0.5).ravel(), 0.00001)
+        assert_rel_error(self, grad['comp1.a1d'].ravel(),
+                         np.eye(4).ravel()*2.0, 0.00001)
+        assert_rel_error(self, grad['comp1.f'].ravel(),
+                         np.sin(top.comp1.c1d) - top.comp1.a1d/0.25, 0.00001)
+
+        # array broadcast against a different shape
+        exp = ExprEvaluator('comp1.a2d*comp1.c1d[0:2]', top.driver)
+        grad = exp.evaluate_gradient(scope=top)
+        self.assertEqual(grad['comp1.c1d[0:2:]'].shape, (4, 2))
+        assert_rel_error(self, grad['comp1.c1d[0:2:]'].ravel(),
+                         [1., 0., 0., 1., 2., 0., 0., 3.], 0.00001)
+
+        # not supported symbolically, so falls back to complex step
+        exp = ExprEvaluator('gamma(comp1.f)', top.driver)
+        grad = exp.evaluate_gradient(scope=top)
+        self.assertEqual(exp.cached_grad_deriv, False)
+        from scipy.special import polygamma
+        assert_rel_error(self, grad['comp1.f'],
+                         gamma(0.5)*polygamma(0, 0.5), 0.001)
+
     def test_eval_gradient_lots_of_vars(self):
         top = set_as_top(Assembly())
         top.add('comp1', B())
@@ -0,0 +1,106 @@
+"""
+Test of ExecCache.
+"""
+
+import os.path
+import shutil
+import tempfile
+import unittest
+
+from numpy import array, zeros
+
+from openmdao.main.api import Component, set_as_top
+from openmdao.main.datatypes.api import Float, Array
+from openmdao.main.exec_cache import ExecCache
+
+
+class Doubler(Component):
+    x = Float(1., iotype='in')
+    v = Array(zeros(3), iotype='in')
+    y = Float(0., iotype='out')
+    w = Array(zeros(3), iotype='out')
+
+    def execute(self):
+        self.y = self.x * 2.
+        self.w = self.v * 2.
+
+
+class ExecCacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp(prefix='test_exec_cache-')
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir, ignore_errors=True)
+
+    def test_hit_miss(self):
+        comp = set_as_top(Doubler())
+        comp.exec_cache = ExecCache()
+
+        comp.x = 3.
+        comp.v = array([1., 2., 3.])
+        comp.run()
+        comp.run()
+        self.assertEqual(comp.exec_count, 1)
+        self.assertEqual(comp.exec_cache.hits, 1)
+        self.assertEqual(comp.exec_cache.misses, 1)
+
+        comp.x = 4.
+        comp.run()
+        self.assertEqual(comp.y, 8.)
+        self.assertEqual(comp.exec_count, 2)
+
+        # Back to an earlier point, so the outputs come from the cache.
+        comp.x = 3.
+        comp.y = 0.
+        comp.w = zeros(3)
+        comp.run()
+        self.assertEqual(comp.exec_count, 2)
+        self.assertEqual(comp.y, 6.)
+        self.assertEqual(list(comp.w), [2., 4., 6.])
+
+        comp.v[1] = 5.
+        comp.run()
+        self.assertEqual(comp.exec_count, 3)
+        self.assertEqual(list(comp.w), [2., 10., 6.])
+
+    def test_lru(self):
+        comp = set_as_top(Doubler())
+        comp.exec_cache = ExecCache(max_entries=2)
+
+        for x in (1., 2., 1., 3.):
+            comp.x = x
+            comp.run()
+        self.assertEqual(comp.exec_count, 3)
+        self.assertEqual(len(comp.exec_cache), 2)
+
+        # 2. was least recently used, so it was dropped.
+        comp.x = 2.
+        comp.run()
+        self.assertEqual(comp.exec_count, 4)
+        comp.x = 3.
+        comp.run()
+        self.assertEqual(comp.exec_count, 4)
+
+        comp.exec_cache = ExecCache(max_bytes=1)
+        comp.run()
+        self.assertEqual(len(comp.exec_cache), 0)
+
+    def test_persistence(self):
+        filename = os.path.join(self.tempdir, 'doubler.cache')
+        comp = set_as_top(Doubler())
+        comp.exec_cache = ExecCache(filename=filename)
+        comp.x = 5.
+        comp.run()
+        self.assertTrue(os.path.exists(filename))
+
+        comp = set_as_top(Doubler())
+        comp.exec_cache = ExecCache(filename=filename)
+        comp.x = 5.
+        comp.run()
+        self.assertEqual(comp.exec_count, 0)
+        self.assertEqual(comp.y, 10.)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -347,6 +347,30 @@ class HasConstraintsTestCase(unittest.TestCase):
     def test_eval_ineq_constraint(self):
         self._check_ineq_eval_constraints(MyInEqDriver())
 
+    def test_eval_plan(self):
+        drv = self.asm.add('driver', MyDriver())
+        drv.add_constraint('comp1.a > comp1.b')
+        drv.add_constraint('comp1.c < 2*comp1.d')
+        drv.add_constraint('comp2.a = 3.')
+        self.asm.comp1.a = 4
+        self.asm.comp1.b = 5
+        self.asm.comp2.a = 1
+        self.asm.run()
+
+        expected = []
+        for con in drv.get_ineq_constraints().values():
+            expected.extend(con.evaluate(self.asm))
+        self.assertEqual(drv.eval_ineq_constraints(), expected)
+        delegate = drv._delegates_['_hasconstraints']
+        self.assertTrue(delegate._ineq._plan._valid)
+        self.assertEqual(drv.eval_ineq_constraints()[0], 1.)
+
+        self.assertEqual(drv.eval_constraints(),
+                         [-2.] + drv.eval_ineq_constraints())
+
+        drv.remove_constraint('comp1.a > comp1.b')
+        self.assertEqual(len(drv.eval_ineq_constraints()), 1)
+
     def test_pseudocomps(self):
         self.asm.add('driver', MyDriver())
         self.asm.driver.workflow.add(['comp1','comp2'])
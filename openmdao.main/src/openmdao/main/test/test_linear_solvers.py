@@ -12,7 +12,7 @@ from openmdao.lib.optproblems.sellar import Discipline1_WithDerivatives, \
 from openmdao.main.api import Component, Assembly, set_as_top, Driver
 from openmdao.main.datatypes.api import Float
 from openmdao.main.test.simpledriver import SimpleDriver
-from openmdao.main.test.test_derivatives import ArrayComp2D
+from openmdao.main.test.test_derivatives import ArrayComp2D, ArrayComp2D_der
 from openmdao.util.testutil import assert_rel_error
 
 class Paraboloid(Component):
@@ -165,6 +165,55 @@ class Testcase_Scipy_Gmres(unittest.TestCase):
         assert_rel_error(self, J[0, 0], 5.0, 0.0001)
         assert_rel_error(self, J[0, 1], 21.0, 0.0001)
 
+    def test_scipy_gmres_block_solve(self):
+
+        top = set_as_top(Sellar_MDA_subbed_connected())
+        top.driver.gradient_options.lin_solver = 'scipy_gmres'
+        top.run()
+        J_ref = top.driver.calc_gradient(mode='forward')
+
+        top.driver.gradient_options.block_solve = True
+        J = top.driver.calc_gradient(mode='forward')
+        assert_rel_error(self, J[0, 0], J_ref[0, 0], 0.0001)
+
+        J = top.driver.calc_gradient(mode='adjoint')
+        assert_rel_error(self, J[0, 0], J_ref[0, 0], 0.0001)
+
+        J = top.driver.calc_gradient(inputs=['P1.x'], outputs=['P2.f_xy'],
+                                     mode='forward', return_format='dict')
+        assert_rel_error(self, J['P2.f_xy']['P1.x'][0][0], J_ref[0, 0], 0.0001)
+
+    def test_scipy_gmres_block_solve_apply_deriv(self):
+
+        # apply_deriv components can't be assembled from provideJ, and
+        # there are fewer columns than unknowns, so each column is solved
+        # on its own.
+        top = set_as_top(Assembly())
+        top.add('comp1', ArrayComp2D_der())
+        top.add('comp2', ArrayComp2D_der())
+
+        top.add('driver', SimpleDriver())
+        top.driver.workflow.add(['comp1', 'comp2'])
+        top.connect('comp1.y', 'comp2.x')
+        top.driver.add_parameter('comp1.x', low=-10, high=10)
+        top.driver.add_objective('comp1.y[0][0]')
+        top.driver.add_constraint('comp2.y[0][1] < 0')
+        top.driver.gradient_options.lin_solver = 'scipy_gmres'
+
+        top.run()
+
+        J_ref = top.driver.calc_gradient(mode='forward')
+
+        top.driver.gradient_options.block_solve = True
+        J = top.driver.calc_gradient(mode='forward')
+        assert_rel_error(self, np.linalg.norm(J - J_ref), 0.0, .000001)
+
+        solver = top.driver.workflow._system.ln_solver
+        self.assertEqual(solver.assemble_sparse(), None)
+
+        J = top.driver.calc_gradient(mode='adjoint')
+        assert_rel_error(self, np.linalg.norm(J - J_ref), 0.0, .000001)
+
 
 class Testcase_Linear_GS(unittest.TestCase):
     """ Test Linear Gauss Siedel linear solver. """
@@ -263,6 +312,111 @@ class Testcase_Linear_GS(unittest.TestCase):
         assert_rel_error(self, J[0, 0], 2.0, .000001)
         assert_rel_error(self, J[1, 0], 39.0, .000001)
 
+    def test_linearGS_block_solve(self):
+
+        top = set_as_top(Assembly())
+        top.add('comp1', ArrayComp2D())
+        top.add('comp2', ArrayComp2D())
+
+        top.add('driver', SimpleDriver())
+        top.driver.workflow.add(['comp1', 'comp2'])
+        top.connect('comp1.y', 'comp2.x')
+        top.driver.add_parameter('comp1.x', low=-10, high=10)
+        top.driver.add_objective('comp1.y[0][0]')
+        top.driver.add_constraint('comp2.y[0][1] < 0')
+        top.driver.gradient_options.lin_solver = 'linear_gs'
+        top.driver.gradient_options.maxiter = 1
+
+        top.run()
+
+        J_ref = top.driver.calc_gradient(mode='forward')
+
+        top.driver.gradient_options.block_solve = True
+        J = top.driver.calc_gradient(mode='forward')
+        assert_rel_error(self, np.linalg.norm(J - J_ref), 0.0, .000001)
+
+        J = top.driver.calc_gradient(mode='adjoint')
+        assert_rel_error(self, np.linalg.norm(J - J_ref), 0.0, .000001)
+
+
+class Testcase_DirectSparseLU(unittest.TestCase):
+    """ Test the direct sparse LU linear solver. """
+
+    def test_direct_lu_single_comp(self):
+
+        top = set_as_top(Assembly())
+        top.add('comp', Paraboloid())
+        top.add('driver', SimpleDriver())
+        top.driver.workflow.add(['comp'])
+        top.driver.add_parameter('comp.x', low=-1000, high=1000)
+        top.driver.add_parameter('comp.y', low=-1000, high=1000)
+        top.driver.add_objective('comp.f_xy')
+
+        top.driver.gradient_options.lin_solver = 'direct_lu'
+
+        top.comp.x = 3
+        top.comp.y = 5
+        top.run()
+
+        J = top.driver.calc_gradient(inputs=['comp.x', 'comp.y'],
+                                     outputs=['comp.f_xy'],
+                                     mode='forward')
+
+        assert_rel_error(self, J[0, 0], 5.0, 0.0001)
+        assert_rel_error(self, J[0, 1], 21.0, 0.0001)
+
+        J = top.driver.calc_gradient(inputs=['comp.x', 'comp.y'],
+                                     mode='adjoint')
+
+        assert_rel_error(self, J[0, 0], 5.0, 0.0001)
+        assert_rel_error(self, J[0, 1], 21.0, 0.0001)
+
+        # Make sure a new linearization gets a new factorization.
+        top.comp.x = 4
+        top.run()
+        J = top.driver.calc_gradient(inputs=['comp.x', 'comp.y'],
+                                     outputs=['comp.f_xy'],
+                                     mode='forward')
+
+        assert_rel_error(self, J[0, 0], 7.0, 0.0001)
+        assert_rel_error(self, J[0, 1], 22.0, 0.0001)
+
+    def test_direct_lu_array_chain(self):
+
+        top = set_as_top(Assembly())
+        top.add('comp1', ArrayComp2D())
+        top.add('comp2', ArrayComp2D())
+
+        top.add('driver', SimpleDriver())
+        top.driver.workflow.add(['comp1', 'comp2'])
+        top.connect('comp1.y', 'comp2.x')
+        top.driver.add_parameter('comp1.x', low=-10, high=10)
+        top.driver.add_objective('comp1.y[0][0]')
+        top.driver.add_constraint('comp2.y[0][1] < 0')
+
+        top.run()
+
+        J_ref = top.driver.calc_gradient(mode='forward')
+
+        top.driver.gradient_options.lin_solver = 'direct_lu'
+        J = top.driver.calc_gradient(mode='forward')
+        assert_rel_error(self, np.linalg.norm(J - J_ref), 0.0, .000001)
+
+        J = top.driver.calc_gradient(mode='adjoint')
+        assert_rel_error(self, np.linalg.norm(J - J_ref), 0.0, .000001)
+
+    def test_direct_lu_Sellar_subbed_connected(self):
+
+        top = set_as_top(Sellar_MDA_subbed_connected())
+        top.driver.gradient_options.lin_solver = 'direct_lu'
+        top.subdriver.gradient_options.lin_solver = 'direct_lu'
+        top.run()
+        J = top.driver.calc_gradient(mode='forward')
+        assert_rel_error(self, J[0, 0], -628.543, 0.01)
+
+        J = top.driver.calc_gradient(mode='adjoint')
+        assert_rel_error(self, J[0, 0], -628.543, 0.01)
+
 
 if __name__ == '__main__':
     import nose
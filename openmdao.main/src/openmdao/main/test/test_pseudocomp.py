@@ -106,6 +106,10 @@ class PseudoCompTestCase(unittest.TestCase):
         self.assertAlmostEqual(top.comp1.c, 3.)
         self.assertAlmostEqual(top.comp2.a, 36.)
 
+        # A plain connection uses the conversion directly.
+        self.assertEqual(top._pseudo_0._conversion[0], 'in0')
+        assert_rel_error(self, top._pseudo_0._conversion[1], 12., 1e-12)
+
     def test_multi_src(self):
         top = _simple_model()  # comp1.c --> comp2.a
         top.connect('comp1.dist/comp1.time', 'comp2.speed')
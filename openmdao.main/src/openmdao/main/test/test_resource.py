@@ -14,6 +14,7 @@ import shutil
 import socket
 import sys
 import tempfile
+import time
 import unittest
 
 from openmdao.main.api import Assembly, Component
@@ -144,6 +145,58 @@ class TestCase(unittest.TestCase):
                                        'localhost': False})
         self.assertEqual(hostnames, None)
 
+    def test_record_time(self):
+        logging.debug('')
+        logging.debug('test_record_time')
+
+        ram = RAM._get_instance()
+        estimate, criteria, allocator = ram._get_estimates({'min_cpus': 1})
+        self.assertEqual(estimate, 0)
+
+        RAM.record_time(socket.gethostname(), 4.)
+        RAM.record_time(socket.gethostname(), 2.)
+        estimate, criteria, allocator = ram._get_estimates({'min_cpus': 1})
+        self.assertEqual(estimate, 3.)
+        self.assertEqual(allocator.name, 'LocalHost')
+
+    def test_pool(self):
+        logging.debug('')
+        logging.debug('test_pool')
+
+        resources = {'min_cpus': 1}
+        server, info = RAM.allocate_pooled(resources)
+        self.assertEqual(RAM.pooled_servers(), 0)
+        info['model'] = 'loaded'
+        RAM.release_pooled(server)
+        self.assertEqual(RAM.pooled_servers(), 1)
+
+        # Same key gets the same server and info back.
+        server2, info2 = RAM.allocate_pooled(resources)
+        self.assertTrue(server2 is server)
+        self.assertEqual(info2['model'], 'loaded')
+        RAM.release_pooled(server2)
+
+        # Idle servers are released after the timeout.
+        RAM.configure_pool(timeout=0)
+        self.assertEqual(RAM.pooled_servers(), 0)
+
+        # Expiry doesn't wait for another pool access.
+        RAM.configure_pool(timeout=0.5)
+        server, info = RAM.allocate_pooled(resources)
+        RAM.release_pooled(server)
+        self.assertEqual(RAM.pooled_servers(), 1)
+        for retry in range(50):
+            time.sleep(0.1)
+            if RAM.pooled_servers() == 0:
+                break
+        self.assertEqual(RAM.pooled_servers(), 0)
+
+        RAM.configure_pool(timeout=300)
+        server, info = RAM.allocate_pooled(resources)
+        RAM.release_pooled(server)
+        RAM.drain_pool()
+        self.assertEqual(RAM.pooled_servers(), 0)
+
     def test_resources(self):
         logging.debug('')
         logging.debug('test_resources')
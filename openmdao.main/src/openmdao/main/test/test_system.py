@@ -375,5 +375,37 @@ class TestArrayConnectErrors(unittest.TestCase):
 
         t.run() # should run without error
 
+class TestSkipClean(unittest.TestCase):
+
+    def test_skip_clean(self):
+        t = set_as_top(ArrayAsmb())
+        t.source.out = np.zeros((5,))
+        t.run()
+        t.run()
+        self.assertEqual(t.source.exec_count, 2)
+        self.assertEqual(t.sink.exec_count, 2)
+
+        t.skip_clean = True
+        t.run()
+        t.run()
+        system = t.driver.workflow._system
+        self.assertEqual(t.source.exec_count, 3)
+        self.assertEqual(t.sink.exec_count, 3)
+        self.assertEqual(system.num_skipped, 2)
+
+        # setting an unconnected input reruns its component and,
+        # since the output changes, everything downstream
+        t.source.s = 3.
+        t.run()
+        self.assertEqual(t.source.exec_count, 4)
+        self.assertEqual(t.sink.exec_count, 4)
+        self.assertEqual(system.num_skipped, 0)
+        self.assertEqual(t.sink.out, 15.)
+
+        t.source.s = 3.
+        t.run()
+        self.assertEqual(t.source.exec_count, 4)
+        self.assertEqual(system.total_skipped, 4)
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,7 +1,10 @@
 
 import unittest
+
+from numpy import array, zeros, may_share_memory
+
 from openmdao.main.api import set_as_top, Assembly, Component
-from openmdao.main.datatypes.api import Float
+from openmdao.main.datatypes.api import Float, Array
 
 class Simple(Component):
 
@@ -18,6 +21,42 @@ class Simple(Component):
         self.d = self.a - self.b
 
 
+class ArraySource(Component):
+
+    x = Float(1.0, iotype='in')
+    y = Array(zeros(4), iotype='out')
+
+    def __init__(self, in_place=True):
+        super(ArraySource, self).__init__()
+        self.in_place = in_place
+
+    def execute(self):
+        if self.in_place:
+            self.y[:] = self.x*array([1., 2., 3., 4.])
+        else:
+            self.y = self.x*array([1., 2., 3., 4.])
+
+
+class ArraySink(Component):
+
+    y = Array(zeros(4), iotype='in')
+    z = Float(0.0, iotype='out')
+
+    def execute(self):
+        self.z = sum(self.y)
+
+
+def _array_model(in_place=True):
+    top = set_as_top(Assembly())
+    top.add('src', ArraySource(in_place))
+    top.add('sink', ArraySink())
+    top.driver.workflow.add(['src', 'sink'])
+    top.connect('src.y', 'sink.y')
+    top.src.bind_arrays = True
+    top.sink.bind_arrays = True
+    return top
+
+
 def _nested_model():
     top = set_as_top(Assembly())
     top.add('sub', Assembly())
@@ -83,7 +122,31 @@ class VecWrapperTestCase(unittest.TestCase):
                               ('comp4.d', ('comp6.a',))]))
                 
         self.assertEqual(top.sub._system.vec['u'].array.size, 15)
- 
+
+    def test_bind_arrays(self):
+        top = _array_model()
+        top.run()
+        self.assertEqual(top.sink.z, 10.)
+
+        # The output lives in the u vector, so nothing is copied out of it.
+        u = top._system.vec['u']
+        self.assertTrue(may_share_memory(top.src.y, u.array))
+
+        top.src.x = 2.
+        top.run()
+        self.assertEqual(top.sink.z, 20.)
+        self.assertEqual(list(top.sink.y), [2., 4., 6., 8.])
+
+    def test_bind_arrays_replaced(self):
+        # Assigning a new array breaks the binding, so values are copied.
+        top = _array_model(in_place=False)
+        top.run()
+        self.assertEqual(top.sink.z, 10.)
+
+        top.src.x = 3.
+        top.run()
+        self.assertEqual(top.sink.z, 30.)
+
 
 if __name__ == "__main__":
     unittest.main()
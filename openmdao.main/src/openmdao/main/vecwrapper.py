@@ -8,6 +8,7 @@ from openmdao.main.array_helpers import offset_flat_index, \
                                         get_flat_index_start, get_val_and_index, get_shape, \
                                         get_flattened_index, to_slice, to_indices
 from openmdao.main.interfaces import IImplicitComponent
+from openmdao.main.mp_support import OpenMDAO_Proxy
 from openmdao.util.typegroups import int_types
 from openmdao.util.graph import base_var
 
@@ -22,6 +23,7 @@ class VecWrapperBase(object):
         self.array = array
         self.name = name
         self._info = OrderedDict() # dict of ViewInfos
+        self._bound = {} # var path -> (comp, name, view) for bound arrays
 
         # create the PETSc vector
         self.petsc_vec = create_petsc_vec(system.mpi.comm,
@@ -135,6 +137,56 @@ class VecWrapperBase(object):
         _, start, _, size, _ = self._info[name]
         return petsc_linspace(start, start+size)
 
+    def bind_to_scope(self, scope, vnames=None):
+        """Replace whole float Array variables of components that have
+        *bind_arrays* set with views into our array, so their values no
+        longer need to be copied to and from the vector.
+        """
+        if vnames is None:
+            vnames = self.keys()
+
+        for name in vnames:
+            if isinstance(name, tuple) and self._info[name].idxs == slice(None):
+                for path in self._scope_paths(name):
+                    self._bind(scope, name, path)
+
+    def _bind(self, scope, name, path):
+        cname, _, vname = path.partition('.')
+        if not vname or '.' in vname or '[' in vname:
+            return
+
+        comp = getattr(scope, cname, None)
+        # A remote component can't share our memory.
+        if isinstance(comp, OpenMDAO_Proxy) or \
+           not getattr(comp, 'bind_arrays', False):
+            return
+
+        val = getattr(comp, vname, None)
+        if not isinstance(val, ndarray) or val.dtype != float or \
+           val.size != self._info[name].size:
+            return
+
+        view = self[name].reshape(val.shape)
+        view[...] = val
+        setattr(comp, vname, view)
+
+        # the trait may have stored a copy
+        if getattr(comp, vname) is view:
+            self._bound[path] = (comp, vname, view)
+
+    def _is_bound(self, path):
+        """Return True if the variable at path is still bound to a view
+        into our array, i.e., its component hasn't replaced the array.
+        """
+        try:
+            comp, vname, view = self._bound[path]
+        except KeyError:
+            return False
+        return getattr(comp, vname) is view
+
+    def _scope_paths(self, name):
+        return ()
+
     def set_to_array(self, arr, vnames=None):
         """Pull values for the given set of names out of our array
         and set them into the given array.
@@ -285,6 +337,9 @@ class VecWrapper(VecWrapperBase):
             if resid not in self._info:
                 self._add_aliasview(resid, state)
 
+    def _scope_paths(self, name):
+        return (name[0],)
+
     def set_from_scope(self, scope, vnames=None):
         """Get the named values from the given scope and set flattened
         versions of them in our array.
@@ -296,6 +351,8 @@ class VecWrapper(VecWrapperBase):
 
         for name in vnames:
             if isinstance(name, tuple):
+                if self._bound and self._is_bound(name[0]):
+                    continue  # the value already lives in our array
                 self[name] = scope.get_flattened_value(name[0]).real
             else:
                 self[name] = scope.get_flattened_value(name).real
@@ -327,7 +384,8 @@ class VecWrapper(VecWrapperBase):
         for name in vnames:
             if isinstance(name, tuple):
                 array_val = self[name]
-                scope.set_flattened_value(name[0], array_val)
+                if not (self._bound and self._is_bound(name[0])):
+                    scope.set_flattened_value(name[0], array_val)
                 for dest in name[1]:
                     if dest != name[0]:
                         scope.set_flattened_value(dest, array_val)
@@ -381,6 +439,9 @@ class InputVecWrapper(VecWrapperBase):
     def _map_resids_to_states(self, system):
         pass
 
+    def _scope_paths(self, name):
+        return name[1]
+
     def get_dests_by_comp(self):
         """Return a dict of comp name keyed to a list of input nodes, with
         any subvars removed that have basevars in the vector.
@@ -413,6 +474,8 @@ class InputVecWrapper(VecWrapperBase):
             array_val = self[name]
             if isinstance(name, tuple):
                 for dest in name[1]:
+                    if self._bound and self._is_bound(dest):
+                        continue  # the scatter already updated it
                     scope.set_flattened_value(dest, array_val)
                     #print "scope set", dest, array_val
             else:
@@ -806,5 +806,43 @@ class test__moduleFunctions(unittest.TestCase):
         else:
             self.fail("Expecting Key Error")            
 
+    def test_get_conversion(self):
+        factor, offset = units.get_conversion('ft', 'inch')
+        self.assertAlmostEqual(factor, 12.)
+        self.assertEqual(offset, 0.)
+        factor, offset = units.get_conversion('degC', 'degF')
+        self.assertAlmostEqual(factor, 1.8)
+        self.assertAlmostEqual(offset, 17.7777777778)
+        self.assertAlmostEqual(units.convert_units(100., 'degC', 'degF'), 212.)
+        self.assertAlmostEqual(units.convert_units(2, 'ft', 'inch'), 24.)
+
+        # Conversions are cached.
+        self.assertTrue(units.get_conversion('ft', 'inch') is
+                        units.get_conversion('ft', 'inch'))
+
+        try:
+            units.get_conversion('ft', 's')
+        except TypeError, err:
+            self.assertEqual(str(err), 'Incompatible units')
+        else:
+            self.fail("Expecting TypeError")
+
+    def test_convert_array(self):
+        import numpy
+        values = numpy.array([0., 100.])
+        result = units.convert_array(values, 'degC', 'degF')
+        self.assertAlmostEqual(result[0], 32.)
+        self.assertAlmostEqual(result[1], 212.)
+        self.assertEqual(values[1], 100.)
+
+        # In place.
+        result = units.convert_array(values, 'm', 'cm', out=values)
+        self.assertTrue(result is values)
+        self.assertAlmostEqual(values[1], 10000.)
+
+        result = units.convert_array([[1, 2]], 'ft', 'inch')
+        self.assertEqual(result.shape, (1, 2))
+        self.assertAlmostEqual(result[0, 1], 24.)
+
 if __name__ == "__main__":
     unittest.main()
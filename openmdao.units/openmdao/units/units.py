@@ -27,6 +27,11 @@ try:
 except ImportError:
     pass
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 #Class definitions
 
 class NumberDict(dict):
@@ -577,6 +582,13 @@ class PhysicalUnit(object):
 
 _UNIT_CACHE = {}
 
+# (factor, offset) tuples keyed by (from units, to units) strings.
+_CONVERSION_CACHE = {}
+
+# First character of a unit is always alphabet or $.
+# Remaining characters may include numbers.
+_UNIT_NAME = re.compile('[A-Z,a-z]{1}[A-Z,a-z,0-9]*')
+
 def _find_unit(unit):
     """Find unit helper function."""
     if isinstance(unit, str):
@@ -591,12 +603,7 @@ def _find_unit(unit):
                 # This unit might include prefixed units that aren't in the
                 # unit_table. We must parse them ALL and add them to the
                 # unit_table.
-
-                # First character of a unit is always alphabet or $.
-                # Remaining characters may include numbers.
-                regex = re.compile('[A-Z,a-z]{1}[A-Z,a-z,0-9]*')
-
-                for item in regex.findall(name):
+                for item in _UNIT_NAME.findall(name):
                     #check if this was a compound unit, so each substring might
                     # be a unit
                     try:
@@ -685,6 +692,7 @@ def import_library(libfilepointer):
     global _UNIT_LIB
     global _UNIT_CACHE
     _UNIT_CACHE = {}
+    _CONVERSION_CACHE.clear()
     _UNIT_LIB = ConfigParser.ConfigParser()
     _UNIT_LIB.optionxform = _do_nothing
     _UNIT_LIB.readfp(libfilepointer)
@@ -794,13 +802,50 @@ def _update_library(cfg):
                          ' defined units:%s' % [x[0] for x in retry1])
 
 
+def get_conversion(units, convunits):
+    """Return the ``(factor, offset)`` tuple which converts a value
+    in units to convunits as ``(value + offset) * factor``.
+    Tuples for unit strings are cached.
+
+    @raise TypeError: if the units are incompatible.
+    """
+    if isinstance(units, str) and isinstance(convunits, str):
+        key = (units, convunits)
+        try:
+            return _CONVERSION_CACHE[key]
+        except KeyError:
+            conversion = _find_unit(units).conversion_tuple_to(
+                                                    _find_unit(convunits))
+            _CONVERSION_CACHE[key] = conversion
+            return conversion
+    return _find_unit(units).conversion_tuple_to(_find_unit(convunits))
+
+
 def convert_units(value, units, convunits):
     """Return the given value (given in units) converted
     to convunits.
     """
-    pq = PhysicalQuantity(value, units)
-    pq.convert_to_unit(convunits)
-    return pq.value
+    factor, offset = get_conversion(units, convunits)
+    return (value + offset) * factor
+
+
+def convert_array(values, units, convunits, out=None):
+    """Return an array of values (given in units) converted to convunits.
+    If out is given, the result is stored there, which may be values
+    itself.
+    """
+    factor, offset = get_conversion(units, convunits)
+    values = numpy.asarray(values)
+    if values.dtype.kind not in 'fc':
+        values = values.astype(float)
+    if out is None:
+        out = numpy.empty(values.shape, dtype=values.dtype)
+    if offset:
+        numpy.add(values, offset, out)
+        numpy.multiply(out, factor, out)
+    else:
+        numpy.multiply(values, factor, out)
+    return out
 
 
 try:
@@ -229,6 +229,33 @@ class Stream(object):
 
         return data.reshape(shape, order=order) if reshape else data
 
+    def map_floats(self, shape, order='C'):
+        """
+        Returns floats as a read-only :class:`numpy.memmap` of `shape`.
+        The data is mapped from the file rather than read, and is only
+        loaded from disk when accessed. The stream is positioned after
+        the mapped data. Requires a binary stream on a real file.
+
+        shape: tuple(int)
+            Dimensions of returned array.
+
+        order: string
+            If 'C', the data is in row-major order.
+            If 'Fortran', the data is in column-major order.
+        """
+        if not self.binary:
+            raise ValueError('only binary data can be mapped')
+
+        dtype = numpy.dtype(numpy.float32 if self.single_precision
+                                         else numpy.float64)
+        dtype = dtype.newbyteorder('>' if self.big_endian else '<')
+        offset = self.file.tell()
+        data = numpy.memmap(self.file, dtype=dtype, mode='r', offset=offset,
+                            shape=shape, order='F' if order == 'Fortran'
+                                                  else 'C')
+        self.file.seek(offset + data.nbytes)
+        return data
+
     def read_recordmark(self):
         """ Returns value of next recordmark. """
         fmt = '>' if self.big_endian else '<'